@@ -0,0 +1,149 @@
+"""Per-process cache of MCP tool results.
+
+An agent asks the same things over and over within a session — the beta
+groups, the latest builds, one build's beta status — and each call is
+otherwise a full round of App Store Connect requests. :class:`ToolCache`
+keeps each read tool's result for that tool's TTL, keyed by the tool and its
+arguments, and shares one in-flight call between identical concurrent calls
+(single-flight), so two tools fired together don't both pay for the same read.
+
+Invalidation is by tag. A read tool declares tags, which may name its
+arguments — ``get_build_beta_status`` is tagged ``"build:{build_id}"`` — and
+a mutating tool declares the tags it makes stale, filled in from its own
+arguments: ``add_build_to_beta_group(build_id, group_id)`` drops
+``"build:{build_id}"``, and nothing else. A tag naming an argument that is
+``None`` is left out. Where that isn't enough — a tag only for the unfiltered
+call, one tag per email in a list — a tag can instead be a function of the
+call's arguments returning tags. A result still in flight when anything is
+invalidated is returned but not kept.
+
+Changes made outside this process (the App Store Connect web UI, release.py)
+show up when the TTL runs out, or after the ``clear_cache`` tool.
+``ASC_MCP_CACHE=0`` turns the cache off.
+
+This sits above ``asc.cache.ResponseCache`` (``ASC_CACHE_PATH``), which caches
+raw GET responses on disk; this one caches the tool's finished answer.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import time
+from string import Formatter
+from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar, Union
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+# A template like "build:{build_id}", or a function of the call's arguments.
+Tag = Union[str, Callable[[dict[str, Any]], Iterable[str]]]
+
+
+def _fill(templates: Iterable[Tag], arguments: dict[str, Any]) -> set[str]:
+    """``templates`` formatted with the call's arguments, skipping any that
+    name an argument that wasn't given."""
+    tags = set()
+    for template in templates:
+        if callable(template):
+            tags.update(template(arguments))
+            continue
+        names = [name for _, name, _, _ in Formatter().parse(template) if name]
+        if all(arguments.get(name) not in (None, "") for name in names):
+            tags.add(template.format_map(arguments))
+    return tags
+
+
+def _arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> dict[str, Any]:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return bound.arguments
+
+
+class ToolCache:
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.enabled = os.environ.get("ASC_MCP_CACHE") != "0" if enabled is None else enabled
+        self._clock = clock
+        # key -> (expires, result, tags)
+        self._entries: dict[str, tuple[float, Any, set[str]]] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Bumped by every invalidation; a call that started under an older
+        # generation may have read what was just changed.
+        self._generation = 0
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidated": 0}
+
+    def cached(self, ttl: float, *tags: Tag) -> Callable[[F], F]:
+        """Cache a read tool's result for ``ttl`` seconds under ``tags``."""
+        def decorate(fn: F) -> F:
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return await fn(*args, **kwargs)
+                arguments = _arguments(signature, args, kwargs)
+                key = f"{fn.__name__}:{json.dumps(arguments, sort_keys=True, default=str)}"
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > self._clock():
+                    self.stats["hits"] += 1
+                    return entry[1]
+                task = self._inflight.get(key)
+                if task is None:
+                    self.stats["misses"] += 1
+                    task = asyncio.ensure_future(fn(*args, **kwargs))
+                    self._inflight[key] = task
+                    task.add_done_callback(functools.partial(
+                        self._settle, key, ttl, _fill(tags, arguments), self._generation
+                    ))
+                else:
+                    self.stats["coalesced"] += 1
+                # Shielded: one caller going away doesn't cancel the others' call.
+                return await asyncio.shield(task)
+
+            return wrapper  # type: ignore[return-value]
+        return decorate
+
+    def invalidates(self, *tags: Tag) -> Callable[[F], F]:
+        """Drop cached results sharing a tag with ``tags`` once a mutating
+        tool returns — or fails, since it may have got partway."""
+        def decorate(fn: F) -> F:
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                arguments = _arguments(signature, args, kwargs)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self.invalidate(*_fill(tags, arguments))
+
+            return wrapper  # type: ignore[return-value]
+        return decorate
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every result carrying any of ``tags``; returns how many."""
+        self._generation += 1
+        wanted = set(tags)
+        stale = [key for key, (_, _, entry_tags) in self._entries.items() if entry_tags & wanted]
+        for key in stale:
+            del self._entries[key]
+        self.stats["invalidated"] += len(stale)
+        return len(stale)
+
+    def clear(self) -> int:
+        self._generation += 1
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+    def _settle(
+        self, key: str, ttl: float, tags: set[str], generation: int, task: asyncio.Future
+    ) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if generation == self._generation:
+            self._entries[key] = (self._clock() + ttl, task.result(), tags)
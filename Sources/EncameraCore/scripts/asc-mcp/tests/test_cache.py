@@ -0,0 +1,177 @@
+"""Unit tests for asc_mcp.cache.
+
+Run with: PYTHONPATH=asc-mcp/src python3 -m unittest discover -s asc-mcp/tests
+
+The tools under test are plain coroutines counting their calls; an
+``asyncio.Event`` holds one in flight where a test needs to act while it is
+still running.
+"""
+
+import asyncio
+import unittest
+
+from asc_mcp.cache import ToolCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ToolCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = ToolCache(enabled=True, clock=self.clock)
+        self.calls = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+        @self.cache.cached(60, "build:{build_id}", "builds")
+        async def build_status(build_id, verbose=False):
+            self.calls.append(build_id)
+            await self.release.wait()
+            return {"id": build_id, "calls": len(self.calls)}
+
+        @self.cache.invalidates("build:{build_id}")
+        async def expire_build(build_id):
+            return "expired"
+
+        @self.cache.invalidates("build:{build_id}")
+        async def failing_update(build_id):
+            raise RuntimeError("partway")
+
+        self.build_status = build_status
+        self.expire_build = expire_build
+        self.failing_update = failing_update
+
+    async def test_repeat_call_is_a_hit(self):
+        first = await self.build_status("b1")
+        second = await self.build_status(build_id="b1")
+        self.assertIs(second, first)
+        self.assertEqual(self.calls, ["b1"])
+        self.assertEqual(self.cache.stats["hits"], 1)
+
+    async def test_arguments_are_part_of_the_key(self):
+        await self.build_status("b1")
+        await self.build_status("b1", verbose=True)
+        await self.build_status("b2")
+        self.assertEqual(self.calls, ["b1", "b1", "b2"])
+
+    async def test_entry_expires_after_ttl(self):
+        await self.build_status("b1")
+        self.clock.now = 61
+        await self.build_status("b1")
+        self.assertEqual(self.calls, ["b1", "b1"])
+
+    async def test_concurrent_calls_share_one_flight(self):
+        self.release.clear()
+        pending = [asyncio.ensure_future(self.build_status("b1")) for _ in range(5)]
+        await asyncio.sleep(0)
+        self.release.set()
+        results = await asyncio.gather(*pending)
+        self.assertEqual(self.calls, ["b1"])
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self.cache.stats["misses"], 1)
+        self.assertEqual(self.cache.stats["coalesced"], 4)
+
+    async def test_cancelled_caller_does_not_cancel_the_others(self):
+        self.release.clear()
+        first = asyncio.ensure_future(self.build_status("b1"))
+        second = asyncio.ensure_future(self.build_status("b1"))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.release.set()
+        self.assertEqual((await second)["id"], "b1")
+        self.assertEqual(self.calls, ["b1"])
+
+    async def test_mutation_drops_only_matching_tags(self):
+        await self.build_status("b1")
+        await self.build_status("b2")
+        self.assertEqual(await self.expire_build("b1"), "expired")
+        self.assertEqual(self.cache.stats["invalidated"], 1)
+        await self.build_status("b1")
+        await self.build_status("b2")
+        self.assertEqual(self.calls, ["b1", "b2", "b1"])
+
+    async def test_failed_mutation_still_invalidates(self):
+        await self.build_status("b1")
+        with self.assertRaises(RuntimeError):
+            await self.failing_update("b1")
+        await self.build_status("b1")
+        self.assertEqual(self.calls, ["b1", "b1"])
+
+    async def test_result_in_flight_during_invalidation_is_not_kept(self):
+        # The read may have fetched the state the mutation just changed: it is
+        # returned to its caller, but the next call reads again.
+        self.release.clear()
+        pending = asyncio.ensure_future(self.build_status("b1"))
+        await asyncio.sleep(0)
+        self.cache.invalidate("unrelated")
+        self.release.set()
+        self.assertEqual((await pending)["id"], "b1")
+        await self.build_status("b1")
+        self.assertEqual(self.calls, ["b1", "b1"])
+
+    async def test_result_started_after_invalidation_is_kept(self):
+        self.cache.invalidate("builds")
+        await self.build_status("b1")
+        await self.build_status("b1")
+        self.assertEqual(self.calls, ["b1"])
+
+    async def test_failures_are_not_cached(self):
+        attempts = []
+
+        @self.cache.cached(60)
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("transient")
+            return "ok"
+
+        with self.assertRaises(RuntimeError):
+            await flaky()
+        self.assertEqual(await flaky(), "ok")
+        self.assertEqual(len(attempts), 2)
+
+    async def test_callable_tags(self):
+        @self.cache.cached(60, lambda args: [f"tester:{email}" for email in args["emails"]])
+        async def testers(emails):
+            self.calls.append(tuple(emails))
+            return len(emails)
+
+        await testers(["a@example.com", "b@example.com"])
+        await testers(["c@example.com"])
+        self.assertEqual(self.cache.invalidate("tester:b@example.com"), 1)
+        await testers(["a@example.com", "b@example.com"])
+        await testers(["c@example.com"])
+        self.assertEqual(len(self.calls), 3)
+
+    async def test_tag_for_missing_argument_is_skipped(self):
+        @self.cache.cached(60, "group:{group_id}", "groups")
+        async def groups(group_id=None):
+            self.calls.append(group_id)
+            return []
+
+        await groups()
+        self.assertEqual(self.cache.invalidate("group:None"), 0)
+        self.assertEqual(self.cache.invalidate("groups"), 1)
+
+    async def test_clear(self):
+        await self.build_status("b1")
+        self.assertEqual(self.cache.clear(), 1)
+        await self.build_status("b1")
+        self.assertEqual(self.calls, ["b1", "b1"])
+
+    async def test_disabled_cache_always_calls(self):
+        self.cache.enabled = False
+        await self.build_status("b1")
+        await self.build_status("b1")
+        self.assertEqual(self.calls, ["b1", "b1"])
+        self.assertEqual(self.cache.stats["misses"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
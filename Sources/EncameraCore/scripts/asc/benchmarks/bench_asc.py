@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Benchmark the asc library's hot paths
+Serves a synthetic account from ``asc.fake`` on localhost and times the flows
+the release and TestFlight scripts actually run against it:
+
+    builds       list_builds_with_versions over every build of the app
+    groups       get_build_beta_groups for one build, sweeping every group
+    price_points get_iap_price_points across all territories
+    testers      list_app_testers (include=betaGroups)
+    preflight    release.py's ASC preflights: editable version, build
+                 snapshot, target version, pending builds, Xcode Cloud runs
+
+Each flow gets a fresh client with no response cache and an unthrottled rate
+limiter, so every run pays for every request. Reported per flow (median of
+--repeat runs):
+
+    wall_s     end to end
+    http_s     inside the HTTP round trip, fake server included
+    decode_s   JSON decoding of the response bodies
+    parse_s    everything else: models, tables, indexes, the flow's own logic
+    requests   HTTP requests the flow made
+    bytes      response bytes the server sent
+
+Request and byte counts are deterministic for a given preset and are the
+numbers to watch in review; times vary by machine.
+
+    python3 asc/benchmarks/bench_asc.py -o bench-asc.json
+    python3 asc/benchmarks/bench_asc.py --compare asc/benchmarks/baseline.json
+    python3 asc/benchmarks/bench_asc.py --latency 0.05 --flows builds groups
+
+baseline.json beside this file is the committed reference for the quick
+preset; regenerate it with ``-o asc/benchmarks/baseline.json`` when a change
+is meant to move the numbers.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from asc.auth import Credentials
+from asc.client import ASCClient
+from asc.fake import FakeASCServer, synthetic
+from asc.pricing.iap import get_iap_price_points
+from asc.releases import find_editable_version
+from asc.testflight import (
+    BuildSnapshot,
+    get_build_beta_groups,
+    list_app_testers,
+    list_builds_with_versions,
+)
+from asc.transport import TokenBucket
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(BENCH_DIR))
+BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+APP_ID = "6446000001"
+BUNDLE_ID = "com.example.app"
+IAP_ID = "6446100001"
+WORKFLOW_ID = "ci-workflow-0"
+
+PRESETS = {
+    "quick": {"builds": 2000, "groups": 30, "testers": 400, "territories": 175,
+              "price_tiers": 20},
+    "full": {"builds": 10000, "groups": 30, "testers": 4000, "territories": 175,
+             "price_tiers": 100},
+}
+
+FLOWS = ("builds", "groups", "price_points", "testers", "preflight")
+
+# Wall-time changes within this fraction, or under TIME_FLOOR seconds, are
+# noise on a shared machine.
+TIME_TOLERANCE = 0.25
+TIME_FLOOR = 0.01
+
+
+class TimedClient(ASCClient):
+    """ASCClient that accumulates time spent in HTTP and in JSON decoding."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.http_seconds = 0.0
+        self.fetch_seconds = 0.0
+
+    def _request(self, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super()._request(method, url, **kwargs)
+        finally:
+            self.http_seconds += time.perf_counter() - start
+
+    def _fetch_json(self, url, params, cache_key):
+        start = time.perf_counter()
+        try:
+            return super()._fetch_json(url, params, cache_key)
+        finally:
+            self.fetch_seconds += time.perf_counter() - start
+
+
+def fake_credentials():
+    key = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return Credentials("BENCH", "bench-issuer", key, bundle_id=BUNDLE_ID, app_id=APP_ID)
+
+
+def load_release():
+    """release.py lives in the scripts directory, outside the asc package."""
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    import release
+    return release
+
+
+def flow_builds(client, fixtures):
+    return len(list_builds_with_versions(client, APP_ID))
+
+
+def flow_groups(client, fixtures):
+    build_id = fixtures.of_type("builds")[0]["id"]
+    return len(get_build_beta_groups(client, build_id, APP_ID))
+
+
+def flow_price_points(client, fixtures):
+    return len(get_iap_price_points(client, IAP_ID))
+
+
+def flow_testers(client, fixtures):
+    return len(list_app_testers(client, APP_ID))
+
+
+def flow_preflight(client, fixtures):
+    release = load_release()
+    app_id = client.resolve_app_id()
+    version = find_editable_version(client, app_id)
+    builds = BuildSnapshot(client, app_id)
+    with contextlib.redirect_stdout(io.StringIO()):
+        checks = [
+            release.preflight_target_version_matches(
+                builds, version.version_string, version.version_string
+            ),
+            release.preflight_no_pending_builds(builds, version.version_string),
+            release.preflight_no_active_xcode_cloud_builds(client, WORKFLOW_ID),
+        ]
+    if not all(checks):
+        raise RuntimeError(f"preflight failed against the fake server: {checks}")
+    return len(builds.builds)
+
+
+FLOW_FUNCTIONS = {
+    "builds": flow_builds,
+    "groups": flow_groups,
+    "price_points": flow_price_points,
+    "testers": flow_testers,
+    "preflight": flow_preflight,
+}
+
+
+def measure_flow(flow, server, fixtures, credentials, repeat):
+    runs = []
+    for _ in range(repeat):
+        client = TimedClient(
+            credentials,
+            base_url=server.url,
+            limiter=TokenBucket(rate=1e9, capacity=1e9),
+        )
+        server.app.reset_stats()
+        start = time.perf_counter()
+        items = FLOW_FUNCTIONS[flow](client, fixtures)
+        wall = time.perf_counter() - start
+        runs.append({
+            "wall": wall,
+            "http": client.http_seconds,
+            "decode": client.fetch_seconds - client.http_seconds,
+            "parse": wall - client.fetch_seconds,
+            "items": items,
+            "stats": dict(server.stats),
+        })
+    last = runs[-1]
+    return {
+        "flow": flow,
+        "items": last["items"],
+        "requests": last["stats"]["requests"],
+        "bytes": last["stats"]["bytes_out"],
+        "wall_s": round(statistics.median(r["wall"] for r in runs), 4),
+        "http_s": round(statistics.median(r["http"] for r in runs), 4),
+        "decode_s": round(statistics.median(r["decode"] for r in runs), 4),
+        "parse_s": round(statistics.median(r["parse"] for r in runs), 4),
+    }
+
+
+def compare(results, baseline_path):
+    """Print changes against ``baseline_path``; returns the flows that regressed.
+
+    A regression is more requests or more bytes — those are deterministic.
+    Wall time is only flagged ``slower`` past :data:`TIME_TOLERANCE` and
+    :data:`TIME_FLOOR`, since it moves with the machine.
+    """
+    with open(baseline_path) as f:
+        baseline = {r["flow"]: r for r in json.load(f)["results"]}
+    regressed = []
+    for result in results:
+        before = baseline.get(result["flow"])
+        if not before:
+            continue
+        change = (result["wall_s"] - before["wall_s"]) / before["wall_s"] * 100
+        slower = (change > TIME_TOLERANCE * 100
+                  and result["wall_s"] - before["wall_s"] > TIME_FLOOR)
+        worse = result["requests"] > before["requests"] or result["bytes"] > before["bytes"]
+        if worse:
+            regressed.append(result["flow"])
+        flag = "  REGRESSION" if worse else "  slower" if slower else ""
+        print(f"{result['flow']:<13} {before['wall_s']:>8.3f} -> {result['wall_s']:>8.3f} s "
+              f"({change:+.1f}%)  requests {before['requests']} -> {result['requests']}  "
+              f"bytes {before['bytes']} -> {result['bytes']}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark asc against a local fake ASC server.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick",
+                        help="Dataset size preset (default: quick)")
+    parser.add_argument("--builds", type=int, help="Number of builds (overrides the preset)")
+    parser.add_argument("--groups", type=int, help="Number of beta groups")
+    parser.add_argument("--testers", type=int, help="Number of beta testers")
+    parser.add_argument("--territories", type=int, help="Number of territories")
+    parser.add_argument("--price-tiers", type=int, help="IAP price tiers per territory")
+    parser.add_argument("--flows", nargs="+", choices=FLOWS, default=list(FLOWS),
+                        help="Flows to run (default: all)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds the fake server adds to every request (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per flow; the median is reported (default: 3)")
+    parser.add_argument("--output", "-o", default="bench-asc.json",
+                        help="Results file (default: bench-asc.json)")
+    parser.add_argument("--compare", metavar="BASELINE", nargs="?", const=BASELINE,
+                        help="Print changes against an earlier results file "
+                             "(default: the committed baseline.json)")
+    parser.add_argument("--strict", action="store_true",
+                        help="With --compare, exit 1 if any flow made more requests or bytes")
+    args = parser.parse_args()
+
+    spec = dict(PRESETS[args.preset])
+    for field in spec:
+        if getattr(args, field) is not None:
+            spec[field] = getattr(args, field)
+
+    # Every request should reach the server; an on-disk cache would hide them.
+    os.environ.pop("ASC_CACHE_PATH", None)
+
+    start = time.perf_counter()
+    fixtures = synthetic(app_id=APP_ID, bundle_id=BUNDLE_ID, **spec)
+    print(f"Fixtures: {len(fixtures)} resources "
+          f"(ready in {time.perf_counter() - start:.1f}s)", file=sys.stderr)
+    credentials = fake_credentials()
+
+    results = []
+    with FakeASCServer(fixtures, latency=args.latency) as server:
+        for flow in args.flows:
+            result = measure_flow(flow, server, fixtures, credentials, args.repeat)
+            print(f"{flow:<13} {result['wall_s']:>8.3f} s  http {result['http_s']:.3f}  "
+                  f"decode {result['decode_s']:.3f}  parse {result['parse_s']:.3f}  "
+                  f"{result['requests']:>4} requests {result['bytes'] / 1e6:>7.2f} MB  "
+                  f"{result['items']} items", file=sys.stderr)
+            results.append(result)
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "fixtures": {**spec, "resources": len(fixtures)},
+        "latency_s": args.latency,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    if args.compare:
+        regressed = compare(results, args.compare)
+        if regressed and args.strict:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,25 @@ from asc.models import CrashSubmission
 _LIST_PATH = "/v1/apps/{app_id}/betaFeedbackCrashSubmissions"
 
 
+def _list_params(
+    build_ids: Optional[list[str]],
+    device_model: Optional[str],
+    os_version: Optional[str],
+) -> dict[str, Any]:
+    params: dict[str, Any] = {
+        "sort": "-createdDate",
+        "include": "build",
+        "fields[builds]": "version",
+    }
+    if build_ids:
+        params["filter[build]"] = ",".join(build_ids)
+    if device_model:
+        params["filter[deviceModel]"] = device_model
+    if os_version:
+        params["filter[osVersion]"] = os_version
+    return params
+
+
 def list_crash_submissions(
     client: ASCClient,
     app_id: str,
@@ -28,29 +47,38 @@ def list_crash_submissions(
     fetches a single page of at most ``limit`` items; otherwise paginates
     through everything.
     """
-    params: dict[str, Any] = {
-        "sort": "-createdDate",
-        "include": "build",
-        "fields[builds]": "version",
-        "limit": min(limit, 200) if limit else 200,
-    }
-    if build_ids:
-        params["filter[build]"] = ",".join(build_ids)
-    if device_model:
-        params["filter[deviceModel]"] = device_model
-    if os_version:
-        params["filter[osVersion]"] = os_version
-
-    path = _LIST_PATH.format(app_id=app_id)
     if limit is not None:
-        body = client.get(path, params=params)
-        data = body.get("data", [])
-        included = body.get("included", [])
-    else:
-        result = client.get_all_paginated_with_includes(path, params=params)
-        data = result["data"]
-        included = result["included"]
-    return [CrashSubmission.from_api(item, included) for item in data]
+        submissions, _ = list_crash_submissions_page(
+            client, app_id, build_ids, device_model, os_version, limit
+        )
+        return submissions
+    result = client.get_all_paginated_with_includes(
+        _LIST_PATH.format(app_id=app_id), params=_list_params(build_ids, device_model, os_version)
+    )
+    return CrashSubmission.from_api_many(result["data"], result["included"])
+
+
+def list_crash_submissions_page(
+    client: ASCClient,
+    app_id: str,
+    build_ids: Optional[list[str]] = None,
+    device_model: Optional[str] = None,
+    os_version: Optional[str] = None,
+    limit: int = 25,
+    cursor: Optional[str] = None,
+) -> tuple[list[CrashSubmission], Optional[str]]:
+    """One page of :func:`list_crash_submissions` and the cursor of the next
+    page (``None`` on the last)."""
+    page, next_cursor = client.get_page(
+        _LIST_PATH.format(app_id=app_id),
+        _list_params(build_ids, device_model, os_version),
+        limit,
+        cursor,
+    )
+    return (
+        CrashSubmission.from_api_many(page.get("data", []), page.get("included", [])),
+        next_cursor,
+    )
 
 
 def get_crash_submission(client: ASCClient, submission_id: str) -> CrashSubmission:
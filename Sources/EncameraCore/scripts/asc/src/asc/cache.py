@@ -0,0 +1,240 @@
+"""Opt-in on-disk cache for ASC GET responses.
+
+Pass ``ASCClient(creds, cache=ResponseCache(path))``, or set
+``ASC_CACHE_PATH`` to give every client in every tool the same cache — so
+``release.py``, ``testflight_admin.py`` and the MCP server start warm instead
+of re-listing the same builds and groups.
+
+Entries are whole response bodies (one per page for paginated lists), keyed
+by API key, URL and params, in a single SQLite file. Each entry is tagged with
+the resource types it touches: the names in its path, its ``filter[...]`` keys
+and its ``include`` list, each normalized to a collection type by
+:func:`resource_type` — the ``buildBetaDetail`` in
+``/v1/builds/{id}/buildBetaDetail`` and ``include=preReleaseVersion`` are
+``buildBetaDetails`` and ``preReleaseVersions``, as a mutation's path names
+them. A ``post``/``patch``/``delete`` through a client using the cache drops
+every entry sharing a tag with the mutated path — patching
+``/v1/buildBetaDetails/{id}`` drops the build's cached beta detail, and
+``/v1/betaGroups/{id}/relationships/builds`` drops both group and build reads.
+Changes made elsewhere (App Store Connect web UI, another machine) are only
+picked up when the TTL runs out.
+
+TTLs are per resource type — the first collection in the path — with
+:data:`DEFAULT_TTLS` covering the slow-moving ones. Stale-while-revalidate is
+off unless asked for: with ``stale_for`` (or ``ASC_CACHE_STALE_FOR``) set, an
+entry up to that many seconds past its TTL is still served while the client
+refreshes it in the background. Leave it off for anything that polls for a
+state change. The file is kept under ``max_bytes`` by evicting the least
+recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlencode, urlsplit
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+# Seconds. Builds and review state change during a release; the catalogues of
+# Xcode/macOS versions and price points barely change at all.
+DEFAULT_TTLS: dict[str, float] = {
+    "builds": 60,
+    "ciBuildRuns": 30,
+    "betaAppReviewSubmissions": 60,
+    "ciXcodeVersions": 86400,
+    "ciMacOsVersions": 86400,
+    "territories": 86400,
+    "inAppPurchasePricePoints": 86400,
+    "subscriptionPricePoints": 86400,
+}
+DEFAULT_TTL = 300.0
+
+# Path segments that name a resource type, as opposed to ids ("6446…",
+# "3f1c…-…") and the "v1"/"relationships" plumbing.
+_COLLECTION = re.compile(r"^[a-z][A-Za-z]+$")
+_FILTER_KEY = re.compile(r"^filter\[([\w.]+)\]$")
+_NOT_TYPES = {"relationships"}
+# Relationship names that aren't their target's type with an "s".
+_RELATIONSHIP_TYPES = {
+    "individualTesters": "betaTesters",
+    "workflow": "ciWorkflows",
+    "product": "ciProducts",
+    "sourceBranchOrTag": "scmGitReferences",
+    "destinationBranch": "scmGitReferences",
+    "pullRequest": "scmPullRequests",
+}
+
+
+def resource_type(name: str) -> str:
+    """The collection type behind a path segment, relationship, include or
+    filter key: ``buildBetaDetail`` -> ``buildBetaDetails``,
+    ``preReleaseVersion.version`` -> ``preReleaseVersions``."""
+    name = name.split(".")[0]
+    if name in _RELATIONSHIP_TYPES:
+        return _RELATIONSHIP_TYPES[name]
+    if name.endswith("s"):
+        return name
+    if name.endswith("y") and name[-2:-1] not in "aeiou":
+        return f"{name[:-1]}ies"
+    return f"{name}s"
+
+
+def resource_tags(path: str, params: Optional[dict] = None) -> set[str]:
+    """Resource types a request reads or writes, for invalidation. Stored
+    entries and mutations are both tagged here, so the two always agree."""
+    tags = {
+        resource_type(segment) for segment in urlsplit(path).path.split("/")
+        if _COLLECTION.match(segment) and segment not in _NOT_TYPES
+    }
+    for key, value in (params or {}).items():
+        match = _FILTER_KEY.match(key)
+        if match:
+            tags.add(resource_type(match.group(1)))
+        elif key == "include":
+            tags.update(resource_type(name) for name in str(value).split(",") if name)
+    return tags
+
+
+def primary_resource(path: str) -> str:
+    for segment in urlsplit(path).path.split("/"):
+        if _COLLECTION.match(segment):
+            return segment
+    return ""
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: str | Path,
+        ttls: Optional[dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        stale_for: float = 0.0,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.stale_for = stale_for
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                resource TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tags (
+                tag TEXT NOT NULL,
+                key TEXT NOT NULL REFERENCES entries(key) ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS tags_by_tag ON tags(tag);
+            CREATE INDEX IF NOT EXISTS tags_by_key ON tags(key);
+            CREATE INDEX IF NOT EXISTS entries_by_access ON entries(accessed_at);
+            PRAGMA foreign_keys=ON;
+            """
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        path = os.environ.get("ASC_CACHE_PATH")
+        if not path:
+            return None
+        return cls(path, stale_for=float(os.environ.get("ASC_CACHE_STALE_FOR", "0")))
+
+    @staticmethod
+    def key(scope: str, url: str, params: Optional[dict] = None) -> str:
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{scope}\n{url}\n{query}".encode()).hexdigest()
+
+    def ttl_for(self, resource: str) -> float:
+        return self.ttls.get(resource, self.default_ttl)
+
+    def lookup(self, key: str) -> tuple[str, Optional[dict[str, Any]]]:
+        """``(state, body)`` — ``FRESH`` within the TTL, ``STALE`` within the
+        stale window after it (serve, then refresh), else ``MISS``."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT resource, body, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return MISS, None
+            resource, body, stored_at = row
+            age = now - stored_at
+            ttl = self.ttl_for(resource)
+            if age > ttl + self.stale_for:
+                return MISS, None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return (FRESH if age <= ttl else STALE), json.loads(body)
+
+    def store(self, key: str, url: str, params: Optional[dict], body: dict[str, Any]) -> None:
+        encoded = json.dumps(body, separators=(",", ":"))
+        path = urlsplit(url).path
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("DELETE FROM tags WHERE key = ?", (key,))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, primary_resource(path), encoded, len(encoded), now, now),
+                )
+                self._db.executemany(
+                    "INSERT INTO tags VALUES (?, ?)",
+                    [(tag, key) for tag in resource_tags(path, params)],
+                )
+                self._evict()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        # Oldest-accessed first until back under 90% of the bound, so a full
+        # cache doesn't evict on every single store.
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            victims.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def invalidate(self, path: str) -> int:
+        """Drop every entry tagged with a resource type in ``path``. Returns
+        the number of entries removed."""
+        tags = resource_tags(path)
+        if not tags:
+            return 0
+        placeholders = ",".join("?" * len(tags))
+        with self._lock:
+            cursor = self._db.execute(
+                f"DELETE FROM entries WHERE key IN "
+                f"(SELECT key FROM tags WHERE tag IN ({placeholders}))",
+                tuple(tags),
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
@@ -1,19 +1,61 @@
-"""Base HTTP client for App Store Connect API."""
+"""Base HTTP client for App Store Connect API.
 
-from typing import Any, Optional
+Every request goes through :meth:`ASCClient._request`, which waits on the
+per-key rate limiter and retries ``429``/``5xx`` responses with backoff (see
+``asc.transport``) — callers don't need to sleep between calls.
+
+With a ``cache`` (or ``ASC_CACHE_PATH`` set), GETs are served from an on-disk
+``asc.cache.ResponseCache`` and mutations invalidate what they touch.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from asc.auth import Credentials, TokenManager
+from asc.cache import FRESH, STALE, ResponseCache
+from asc.paging import next_cursor, reject_page_size, with_page_size
+from asc.transport import (
+    ASCAPIError,
+    RetryPolicy,
+    TokenBucket,
+    parse_rate_limit_remaining,
+    parse_retry_after,
+    shared_bucket,
+)
 
 
 class ASCClient:
     BASE_URL = "https://api.appstoreconnect.apple.com"
 
-    def __init__(self, credentials: Credentials):
+    def __init__(
+        self,
+        credentials: Credentials,
+        pool_size: int = 16,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+        base_url: Optional[str] = None,
+    ):
         self.credentials = credentials
+        # ASC_BASE_URL points every tool at a local asc.fake server.
+        self.BASE_URL = (base_url or os.environ.get("ASC_BASE_URL") or self.BASE_URL).rstrip("/")
         self._token_manager = TokenManager(credentials)
         self._session = requests.Session()
+        # One host, so one pool; pool_size bounds concurrent connections when
+        # the client is shared between threads.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self.retry = retry or RetryPolicy()
+        self.limiter = limiter or shared_bucket(credentials.key_id)
+        self.cache = cache if cache is not None else ResponseCache.from_env()
+        self._revalidating: set[str] = set()
+        self._revalidating_lock = threading.Lock()
 
     def _headers(self) -> dict[str, str]:
         return {
@@ -36,51 +78,202 @@ class ASCClient:
             error_body = resp.json()
         except Exception:
             error_body = resp.text
-        raise RuntimeError(f"{resp.status_code} {resp.reason} for {url}: {error_body}")
+        raise ASCAPIError(resp.status_code, resp.reason, url, error_body)
 
-    def get(self, path: str, params: Optional[dict] = None) -> dict[str, Any]:
-        url = f"{self.BASE_URL}{path}"
-        resp = self._session.get(url, headers=self._headers(), params=params)
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send one request under the rate limiter, retrying per ``self.retry``.
+
+        Returns the final response, successful or not — ``_check`` still
+        decides what is an error.
+        """
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                resp = self._session.request(method, url, headers=self._headers(), **kwargs)
+            except requests.ConnectionError:
+                if not self.retry.should_retry(method, None, attempt):
+                    raise
+                time.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+
+            remaining = parse_rate_limit_remaining(resp.headers.get("X-Rate-Limit"))
+            if remaining is not None:
+                self.limiter.observe_remaining(remaining)
+            if resp.ok or not self.retry.should_retry(method, resp.status_code, attempt):
+                return resp
+            delay = self.retry.delay(attempt, parse_retry_after(resp.headers.get("Retry-After")))
+            if resp.status_code == 429:
+                self.limiter.pause(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def _fetch_json(self, url: str, params: Optional[dict], cache_key: Optional[str]) -> dict[str, Any]:
+        resp = self._request("GET", url, params=params)
         self._check(resp, url)
-        return resp.json()
+        body = resp.json()
+        if cache_key is not None:
+            self.cache.store(cache_key, url, params, body)
+        return body
+
+    def _revalidate(self, url: str, params: Optional[dict], cache_key: str) -> None:
+        """Refresh a stale entry on a daemon thread, once per key at a time."""
+        with self._revalidating_lock:
+            if cache_key in self._revalidating:
+                return
+            self._revalidating.add(cache_key)
+
+        def run() -> None:
+            try:
+                self._fetch_json(url, params, cache_key)
+            except Exception:
+                pass  # The stale body was already served; the next read retries.
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(cache_key)
+
+        threading.Thread(target=run, daemon=True).start()
 
-    def get_all(self, path: str, params: Optional[dict] = None) -> list[dict[str, Any]]:
-        results = []
+    def _get_json(self, url: str, params: Optional[dict] = None) -> dict[str, Any]:
+        """GET one URL, through the response cache when there is one."""
+        if self.cache is None:
+            return self._fetch_json(url, params, None)
+        cache_key = ResponseCache.key(self.credentials.key_id, url, params)
+        state, body = self.cache.lookup(cache_key)
+        if state == FRESH:
+            return body
+        if state == STALE:
+            self._revalidate(url, params, cache_key)
+            return body
+        return self._fetch_json(url, params, cache_key)
+
+    def _invalidate(self, path: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(path)
+
+    def get(self, path: str, params: Optional[dict] = None) -> dict[str, Any]:
+        return self._get_json(f"{self.BASE_URL}{path}", params)
+
+    def iter_pages(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        max_pages: Optional[int] = None,
+        max_items: Optional[int] = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield each page's response body, following ``links.next`` lazily.
+
+        The next page is only requested when the caller asks for it, so
+        breaking out of the loop stops the pagination. Without a ``limit`` in
+        ``params`` pages are as large as the endpoint allows (``asc.paging``);
+        ``max_items`` keeps the first one from being larger than needed.
+        """
         url = f"{self.BASE_URL}{path}"
-        while url:
-            resp = self._session.get(url, headers=self._headers(), params=params)
-            self._check(resp, url)
-            data = resp.json()
-            results.extend(data.get("data", []))
-            url = data.get("links", {}).get("next")
+        sized = params is None or "limit" not in params
+        params = with_page_size(path, params, max_items)
+        pages = 0
+        while url and (max_pages is None or pages < max_pages):
+            try:
+                body = self._get_json(url, params)
+            except ASCAPIError as error:
+                if not (sized and pages == 0 and params and error.rejects_parameter("limit")):
+                    raise
+                sized = False
+                params = dict(params)
+                size = reject_page_size(path, params.pop("limit"))
+                if size is not None:
+                    params["limit"] = size
+                continue
+            pages += 1
+            yield body
+            url = body.get("links", {}).get("next")
             params = None  # params are embedded in next URL
-        return results
+
+    def get_page(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> tuple[dict[str, Any], Optional[str]]:
+        """One page of a list endpoint and the cursor of the page after it.
+
+        ``limit`` is clamped to the endpoint's maximum page size. Pass the
+        returned cursor back with the same ``params`` to continue; it is
+        ``None`` on the last page.
+        """
+        if cursor:
+            params = {**(params or {}), "cursor": cursor}
+        for body in self.iter_pages(path, params, max_pages=1, max_items=limit):
+            return body, next_cursor(body)
+        return {"data": []}, None
+
+    def paginate(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        stop: Optional[Callable[[dict[str, Any]], bool]] = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield resources across pages, fetching each page only when needed.
+
+        ``params["limit"]`` is the page size, not a cap — use ``max_items``
+        for "the newest N". ``stop`` ends the iteration at the first resource
+        it returns True for, without yielding it; with a sorted endpoint that
+        is "everything newer than X" for the cost of the pages actually read.
+        """
+        if max_items is not None and max_items <= 0:
+            return
+        count = 0
+        for body in self.iter_pages(path, params, max_pages, max_items):
+            for item in body.get("data", []):
+                if stop is not None and stop(item):
+                    return
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+
+    def get_all(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        return list(self.paginate(path, params, max_items=max_items, max_pages=max_pages))
 
     def get_all_paginated_with_includes(
-        self, path: str, params: Optional[dict] = None
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = None,
     ) -> dict[str, list[dict[str, Any]]]:
-        """Paginate through all pages, accumulating both data and included resources."""
+        """Paginate through all pages (or up to ``max_items``/``max_pages``),
+        accumulating both data and included resources."""
         all_data: list[dict[str, Any]] = []
         all_included: list[dict[str, Any]] = []
         seen_included: set[str] = set()
-        url = f"{self.BASE_URL}{path}"
-        while url:
-            resp = self._session.get(url, headers=self._headers(), params=params)
-            self._check(resp, url)
-            body = resp.json()
+        for body in self.iter_pages(path, params, max_pages, max_items):
             all_data.extend(body.get("data", []))
             for inc in body.get("included", []):
                 key = f"{inc['type']}:{inc['id']}"
                 if key not in seen_included:
                     seen_included.add(key)
                     all_included.append(inc)
-            url = body.get("links", {}).get("next")
-            params = None
+            if max_items is not None and len(all_data) >= max_items:
+                del all_data[max_items:]
+                break
         return {"data": all_data, "included": all_included}
 
     def post(self, path: str, data: dict[str, Any]) -> dict[str, Any]:
         url = f"{self.BASE_URL}{path}"
-        resp = self._session.post(url, headers=self._headers(), json=data)
+        resp = self._request("POST", url, json=data)
+        self._invalidate(path)
         self._check(resp, url)
         if resp.status_code == 204:
             return {}
@@ -88,13 +281,15 @@ class ASCClient:
 
     def patch(self, path: str, data: dict[str, Any]) -> dict[str, Any]:
         url = f"{self.BASE_URL}{path}"
-        resp = self._session.patch(url, headers=self._headers(), json=data)
+        resp = self._request("PATCH", url, json=data)
+        self._invalidate(path)
         self._check(resp, url)
         return resp.json()
 
     def delete(self, path: str, data: Optional[dict[str, Any]] = None) -> None:
         url = f"{self.BASE_URL}{path}"
-        resp = self._session.delete(url, headers=self._headers(), json=data)
+        resp = self._request("DELETE", url, json=data)
+        self._invalidate(path)
         self._check(resp, url)
 
     def find_app_by_bundle_id(self, bundle_id: str) -> dict[str, Any]:
@@ -0,0 +1,14 @@
+"""Offline fake of the App Store Connect API, for benchmarks and dry runs.
+
+| Submodule | Covers |
+|---|---|
+| ``fixtures`` | ``Fixtures`` resource store (load/save, recorded listings) and the seeded ``synthetic`` dataset |
+| ``server`` | ``FakeASC`` WSGI app (pagination, includes, filters, latency, 429 and 503 injection, recording) and ``FakeASCServer`` |
+
+Run one from the shell with ``python -m asc.fake``.
+"""
+
+from asc.fake.fixtures import Fixtures, synthetic
+from asc.fake.server import FakeASC, FakeASCServer
+
+__all__ = ["FakeASC", "FakeASCServer", "Fixtures", "synthetic"]
@@ -0,0 +1,66 @@
+"""Run a fake App Store Connect server until interrupted.
+
+    python -m asc.fake                            # synthetic dataset
+    python -m asc.fake --fixtures session.json    # replay a recording
+    python -m asc.fake --record session.json      # proxy the live API, save on exit
+
+Point a tool at it with ``ASC_BASE_URL=http://127.0.0.1:<port>``.
+"""
+
+import argparse
+import time
+
+from asc.auth import Credentials
+from asc.client import ASCClient
+from asc.fake.fixtures import Fixtures, synthetic
+from asc.fake.server import FakeASCServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m asc.fake", description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixtures", help="Serve a fixture file written by --record")
+    source.add_argument("--record", metavar="PATH", help="Record live responses to PATH")
+    parser.add_argument("--credentials", help="ASC credentials YAML for --record")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic dataset")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--throttle-every", type=int, help="Answer every Nth request with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After on 429s")
+    parser.add_argument("--fail-every", type=int, help="Answer every Nth request with 503")
+    args = parser.parse_args()
+
+    upstream = None
+    if args.record:
+        fixtures = Fixtures()
+        # Explicit base_url: ASC_BASE_URL may already point at this server.
+        upstream = ASCClient(Credentials.load(args.credentials), base_url=ASCClient.BASE_URL)
+    elif args.fixtures:
+        fixtures = Fixtures.load(args.fixtures)
+    else:
+        fixtures = synthetic(seed=args.seed)
+
+    server = FakeASCServer(
+        fixtures,
+        port=args.port,
+        latency=args.latency,
+        throttle_every=args.throttle_every,
+        retry_after=args.retry_after,
+        fail_every=args.fail_every,
+        upstream=upstream,
+    )
+    with server:
+        print(f"Serving {len(fixtures)} resources on {server.url} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    print(f"{server.stats['requests']} requests, {server.stats['bytes_out']} bytes")
+    if args.record:
+        fixtures.save(args.record)
+        print(f"Recorded {len(fixtures)} resources to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
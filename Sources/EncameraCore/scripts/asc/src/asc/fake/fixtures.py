@@ -0,0 +1,392 @@
+"""Fixture store for the fake App Store Connect server.
+
+A :class:`Fixtures` holds every resource once, keyed by ``(type, id)``, with
+its relationships fully linked — an app lists all its builds, a beta group
+all its builds and testers. The server derives every endpoint from that:
+``/v1/apps/{id}/builds`` follows the app's ``builds`` linkage, ``/v1/builds``
+is every build, ``include`` resolves linkage against the store.
+
+Recorded sessions add *listings*: the exact resources (in order) that the
+live API returned for one path and query, so filters and sorts the fake
+can't evaluate itself still replay faithfully.
+
+:func:`synthetic` builds a seeded, realistic-sized dataset without a live
+account; :func:`Fixtures.load` reads one written by the recorder.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+# Query params that shape a response rather than select resources — left
+# out of listing keys so one recording serves every page size and fieldset.
+PRESENTATION_PARAMS = frozenset({"limit", "cursor", "include"})
+
+
+def listing_key(path: str, params: Optional[dict[str, Any]] = None) -> str:
+    selecting = sorted(
+        (key, str(value)) for key, value in (params or {}).items()
+        if key not in PRESENTATION_PARAMS
+        and not key.startswith("fields[")
+        and not key.startswith("limit[")
+    )
+    return f"{path}?{urlencode(selecting)}" if selecting else path
+
+
+def linkage(resource: dict[str, Any]) -> dict[str, str]:
+    return {"type": resource["type"], "id": resource["id"]}
+
+
+class Fixtures:
+    def __init__(self) -> None:
+        self.resources: dict[tuple[str, str], dict[str, Any]] = {}
+        self.types: set[str] = set()
+        self.listings: dict[str, list[dict[str, str]]] = {}
+        # Paths of the single-resource reads whose response is recorded.
+        self.documents: dict[str, dict[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.resources)
+
+    def add(self, resource: dict[str, Any]) -> dict[str, Any]:
+        """Store ``resource``, merging into an existing copy — a recording
+        sees the same build as primary data on one page and as an included
+        resource on another, each with a different subset of fields."""
+        key = (resource["type"], resource["id"])
+        existing = self.resources.get(key)
+        if existing is None:
+            self.resources[key] = resource
+            self.types.add(resource["type"])
+            return resource
+        existing.setdefault("attributes", {}).update(resource.get("attributes", {}))
+        for name, rel in resource.get("relationships", {}).items():
+            if "data" in rel:
+                existing.setdefault("relationships", {})[name] = rel
+        return existing
+
+    def get(self, type_: str, id_: str) -> Optional[dict[str, Any]]:
+        return self.resources.get((type_, id_))
+
+    def find(self, collection: str, id_: str) -> Optional[dict[str, Any]]:
+        """The resource a ``/{collection}/{id}`` path names. Falls back to
+        matching the id alone when no resource has type ``collection`` — for
+        paths like ``/v1/apps/{id}/inAppPurchasesV2`` where the segment isn't
+        the type."""
+        if collection in self.types:
+            return self.resources.get((collection, id_))
+        for (_, candidate), resource in self.resources.items():
+            if candidate == id_:
+                return resource
+        return None
+
+    def of_type(self, type_: str) -> list[dict[str, Any]]:
+        return [r for (t, _), r in self.resources.items() if t == type_]
+
+    def link(self, resource: dict[str, Any], name: str, targets: list[dict[str, Any]]) -> None:
+        resource.setdefault("relationships", {})[name] = {
+            "data": [linkage(t) for t in targets]
+        }
+
+    def link_one(
+        self, resource: dict[str, Any], name: str, target: Optional[dict[str, Any]]
+    ) -> None:
+        resource.setdefault("relationships", {})[name] = {
+            "data": linkage(target) if target else None
+        }
+
+    def record_listing(
+        self, path: str, params: Optional[dict[str, Any]], body: dict[str, Any]
+    ) -> None:
+        for resource in body.get("included", []):
+            self.add(resource)
+        data = body.get("data")
+        if isinstance(data, list):
+            self.listings[listing_key(path, params)] = [linkage(self.add(r)) for r in data]
+        elif isinstance(data, dict):
+            self.documents[listing_key(path, params)] = linkage(self.add(data))
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps({
+            "resources": list(self.resources.values()),
+            "listings": self.listings,
+            "documents": self.documents,
+        }, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Fixtures":
+        raw = json.loads(Path(path).read_text())
+        fixtures = cls()
+        for resource in raw.get("resources", []):
+            fixtures.add(resource)
+        fixtures.listings = raw.get("listings", {})
+        fixtures.documents = raw.get("documents", {})
+        return fixtures
+
+
+_TERRITORY_CURRENCIES = [
+    ("USA", "USD"), ("GBR", "GBP"), ("DEU", "EUR"), ("FRA", "EUR"), ("JPN", "JPY"),
+    ("IND", "INR"), ("BRA", "BRL"), ("CAN", "CAD"), ("AUS", "AUD"), ("CHN", "CNY"),
+    ("KOR", "KRW"), ("MEX", "MXN"), ("CHE", "CHF"), ("SWE", "SEK"), ("TUR", "TRY"),
+]
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.000+00:00")
+
+
+def synthetic(
+    seed: int = 0,
+    app_id: str = "6446000001",
+    bundle_id: str = "com.example.app",
+    builds: int = 2000,
+    versions: int = 40,
+    groups: int = 30,
+    builds_per_group: int = 60,
+    testers: int = 400,
+    territories: int = 175,
+    price_tiers: int = 100,
+    build_runs: int = 500,
+    crash_submissions: int = 500,
+) -> Fixtures:
+    """A deterministic dataset shaped like a busy app's account.
+
+    Builds are newest-first by ``uploadedDate`` and spread over ``versions``
+    marketing versions; each beta group holds a random ``builds_per_group``
+    of the recent builds and a quarter of the testers; the IAP and the
+    subscription have a price point per tier per territory.
+    """
+    rng = random.Random(seed)
+    fx = Fixtures()
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    app = fx.add({
+        "type": "apps", "id": app_id,
+        "attributes": {"name": "Example", "bundleId": bundle_id, "sku": "EXAMPLE"},
+    })
+
+    territory_list = []
+    for i in range(territories):
+        code, currency = _TERRITORY_CURRENCIES[i % len(_TERRITORY_CURRENCIES)]
+        if i >= len(_TERRITORY_CURRENCIES):
+            code = f"T{i:02d}"
+        territory_list.append(fx.add({
+            "type": "territories", "id": code, "attributes": {"currency": currency},
+        }))
+
+    version_list = []
+    for i in range(versions):
+        version = fx.add({
+            "type": "preReleaseVersions", "id": f"prv-{i:04d}",
+            "attributes": {"version": f"1.{i}.0", "platform": "IOS"},
+        })
+        fx.link_one(version, "app", app)
+        version_list.append(version)
+
+    build_list = []
+    for i in range(builds):
+        version = version_list[min(versions - 1, (builds - 1 - i) * versions // builds)]
+        build = fx.add({
+            "type": "builds", "id": f"b{i:05d}-0000-4000-8000-{seed:012d}",
+            "attributes": {
+                "version": str(builds - i),
+                "uploadedDate": _iso(now - timedelta(hours=6 * i)),
+                "expirationDate": _iso(now - timedelta(hours=6 * i) + timedelta(days=90)),
+                "expired": i > 120,
+                "minOsVersion": "16.0",
+                "processingState": "VALID",
+                "buildAudienceType": "APP_STORE_ELIGIBLE",
+            },
+        })
+        detail = fx.add({
+            "type": "buildBetaDetails", "id": build["id"],
+            "attributes": {
+                "autoNotifyEnabled": True,
+                "internalBuildState": "IN_BETA_TESTING",
+                "externalBuildState": "IN_BETA_TESTING" if i < 20 else "EXPIRED",
+            },
+        })
+        fx.link_one(build, "app", app)
+        fx.link_one(build, "preReleaseVersion", version)
+        fx.link_one(build, "buildBetaDetail", detail)
+        # Unset, not missing: the API answers {"data": null} and an empty page.
+        fx.link_one(build, "betaAppReviewSubmission", None)
+        fx.link(build, "individualTesters", [])
+        build_list.append(build)
+    fx.link(app, "builds", build_list)
+    for version in version_list:
+        fx.link(version, "builds", [
+            b for b in build_list
+            if b["relationships"]["preReleaseVersion"]["data"]["id"] == version["id"]
+        ])
+
+    store_versions = []
+    for i, state in enumerate(["READY_FOR_SALE", "READY_FOR_SALE", "PREPARE_FOR_SUBMISSION"]):
+        version = version_list[max(0, versions - 3 + i)]
+        store_version = fx.add({
+            "type": "appStoreVersions", "id": f"asv-{i:04d}",
+            "attributes": {
+                "versionString": version["attributes"]["version"],
+                "platform": "IOS",
+                "appStoreState": state,
+                "releaseType": "MANUAL",
+                "createdDate": _iso(now - timedelta(days=30 * (3 - i))),
+            },
+        })
+        version_builds = version["relationships"]["builds"]["data"]
+        build = fx.get("builds", version_builds[0]["id"]) if version_builds else None
+        fx.link_one(store_version, "build", build)
+        store_versions.append(store_version)
+    fx.link(app, "appStoreVersions", list(reversed(store_versions)))
+
+    tester_list = []
+    for i in range(testers):
+        tester_list.append(fx.add({
+            "type": "betaTesters", "id": f"tester-{i:05d}",
+            "attributes": {
+                "email": f"tester{i}@example.com",
+                "firstName": f"Tester{i}",
+                "lastName": "Example",
+                "state": rng.choice(["ACCEPTED", "INSTALLED", "INVITED"]),
+                "inviteType": "EMAIL",
+            },
+        }))
+
+    group_list = []
+    for i in range(groups):
+        group = fx.add({
+            "type": "betaGroups", "id": f"group-{i:04d}",
+            "attributes": {
+                "name": f"Group {i}",
+                "isInternalGroup": i < 2,
+                "hasAccessToAllBuilds": i == 0,
+                "publicLinkEnabled": False,
+                "publicLink": None,
+                "feedbackEnabled": True,
+                "createdDate": _iso(now - timedelta(days=400 - i)),
+            },
+        })
+        recent = min(builds, builds_per_group * 4)
+        sample = sorted(rng.sample(range(recent), min(recent, builds_per_group)))
+        fx.link(group, "builds", [build_list[j] for j in sample])
+        fx.link(group, "betaTesters", rng.sample(tester_list, min(testers, testers // 4)))
+        fx.link_one(group, "app", app)
+        group_list.append(group)
+    fx.link(app, "betaGroups", group_list)
+    for tester in tester_list:
+        fx.link(tester, "betaGroups", [
+            g for g in group_list
+            if any(t["id"] == tester["id"] for t in g["relationships"]["betaTesters"]["data"])
+        ])
+        fx.link(tester, "apps", [app])
+    fx.link(app, "betaTesters", tester_list)
+
+    def price_points(owner: dict[str, Any], type_: str) -> list[dict[str, Any]]:
+        points = []
+        for tier in range(price_tiers):
+            base = 0.99 + tier
+            for territory in territory_list:
+                point = fx.add({
+                    "type": type_, "id": f"{owner['id']}-{territory['id']}-{tier:04d}",
+                    "attributes": {
+                        "customerPrice": f"{base:.2f}",
+                        "proceeds": f"{base * 0.7:.2f}",
+                    },
+                })
+                fx.link_one(point, "territory", territory)
+                points.append(point)
+        return points
+
+    iap = fx.add({
+        "type": "inAppPurchases", "id": "6446100001",
+        "attributes": {
+            "name": "Premium", "productId": f"{bundle_id}.premium",
+            "inAppPurchaseType": "NON_CONSUMABLE", "state": "APPROVED",
+        },
+    })
+    fx.link(iap, "pricePoints", price_points(iap, "inAppPurchasePricePoints"))
+    fx.link(app, "inAppPurchasesV2", [iap])
+
+    subscription_group = fx.add({
+        "type": "subscriptionGroups", "id": "6446200001",
+        "attributes": {"referenceName": "Premium"},
+    })
+    subscription = fx.add({
+        "type": "subscriptions", "id": "6446300001",
+        "attributes": {
+            "name": "Premium Monthly", "productId": f"{bundle_id}.monthly",
+            "state": "APPROVED",
+        },
+    })
+    fx.link_one(subscription, "group", subscription_group)
+    fx.link(subscription, "pricePoints", price_points(subscription, "subscriptionPricePoints"))
+    fx.link(subscription_group, "subscriptions", [subscription])
+    fx.link(app, "subscriptionGroups", [subscription_group])
+
+    product = fx.add({
+        "type": "ciProducts", "id": "ci-product-1",
+        "attributes": {"name": "Example", "productType": "APP", "createdDate": _iso(now)},
+    })
+    fx.link_one(product, "app", app)
+    workflows = []
+    for i in range(3):
+        workflow = fx.add({
+            "type": "ciWorkflows", "id": f"ci-workflow-{i}",
+            "attributes": {"name": f"Workflow {i}", "description": "", "isEnabled": True},
+        })
+        fx.link_one(workflow, "product", product)
+        workflows.append(workflow)
+    fx.link(product, "workflows", workflows)
+    runs = []
+    for i in range(build_runs):
+        workflow = workflows[i % len(workflows)]
+        run = fx.add({
+            "type": "ciBuildRuns", "id": f"ci-run-{i:05d}",
+            "attributes": {
+                "number": build_runs - i,
+                "createdDate": _iso(now - timedelta(hours=i)),
+                "executionProgress": "COMPLETE",
+                "completionStatus": rng.choice(["SUCCEEDED"] * 8 + ["FAILED", "ERRORED"]),
+                "sourceCommit": {"commitSha": f"{i:040x}", "message": f"Commit {i}"},
+                "isPullRequestBuild": False,
+                "issueCounts": {"errors": 0, "warnings": rng.randint(0, 20)},
+            },
+        })
+        fx.link_one(run, "workflow", workflow)
+        fx.link_one(run, "product", product)
+        runs.append(run)
+    fx.link(product, "buildRuns", runs)
+    for workflow in workflows:
+        fx.link(workflow, "buildRuns", [
+            r for r in runs if r["relationships"]["workflow"]["data"]["id"] == workflow["id"]
+        ])
+
+    crashes = []
+    for i in range(crash_submissions):
+        crash = fx.add({
+            "type": "betaFeedbackCrashSubmissions", "id": f"crash-{i:05d}",
+            "attributes": {
+                "createdDate": _iso(now - timedelta(minutes=37 * i)),
+                "comment": None if i % 3 else "It crashed",
+                "deviceModel": rng.choice(["iPhone15,2", "iPhone16,1", "iPad13,4"]),
+                "osVersion": rng.choice(["17.5", "18.0", "18.1"]),
+                "appPlatform": "IOS",
+                "architecture": "arm64e",
+                "locale": "en-US",
+                "appUptimeInMilliseconds": rng.randint(1000, 10_000_000),
+            },
+        })
+        fx.link_one(crash, "build", build_list[i % min(builds, 50)])
+        log = fx.add({
+            "type": "betaCrashLogs", "id": crash["id"],
+            "attributes": {
+                "logText": f"Incident Identifier: {crash['id']}\n"
+                           "Exception Type: EXC_CRASH (SIGABRT)\n",
+            },
+        })
+        fx.link_one(crash, "crashLog", log)
+        crashes.append(crash)
+    fx.link(app, "betaFeedbackCrashSubmissions", crashes)
+    return fx
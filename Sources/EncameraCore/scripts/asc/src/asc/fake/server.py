@@ -0,0 +1,432 @@
+"""A local stand-in for the App Store Connect API.
+
+:class:`FakeASC` is a WSGI app serving a :class:`~asc.fake.fixtures.Fixtures`
+store the way the live API would: cursor pagination with ``links.next``,
+``limit`` checked against ``asc.paging``'s maximums, ``include``,
+``fields[...]``, ``filter[...]`` (attributes, relationships and dotted paths
+like ``filter[preReleaseVersion.version]``) and ``sort``. Relationship
+``POST``/``DELETE``, ``PATCH`` and creates update the store, so a flow that
+writes and then reads back sees its own changes.
+
+Every request can be slowed by ``latency`` seconds, every
+``throttle_every``-th one answered ``429`` with ``Retry-After`` and every
+``fail_every``-th one ``503``, to exercise the client's pacing and retries.
+:attr:`FakeASC.stats` counts requests, bytes, throttles and failures.
+
+With ``upstream`` (an :class:`~asc.client.ASCClient`) it records instead:
+a GET the fixtures can't answer is fetched from the live API — every page of
+it — stored, and then served like any other fixture. Save the store
+afterwards and the session replays offline::
+
+    with FakeASCServer(Fixtures(), upstream=ASCClient(creds)) as server:
+        run_flow(ASCClient(creds, base_url=server.url))
+    server.app.fixtures.save("session.json")
+
+:class:`FakeASCServer` runs the app on a background thread (one thread per
+connection) for the duration of a ``with`` block.
+"""
+
+import itertools
+import json
+import threading
+import time
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from asc.fake.fixtures import Fixtures, linkage, listing_key
+from asc.paging import documented_page_size
+
+# Apple's page size when the request has no ``limit``.
+DEFAULT_LIMIT = 50
+
+_STATUS_TEXT = {
+    200: "200 OK",
+    201: "201 Created",
+    204: "204 No Content",
+    400: "400 Bad Request",
+    401: "401 Unauthorized",
+    404: "404 Not Found",
+    409: "409 Conflict",
+    429: "429 Too Many Requests",
+    503: "503 Service Unavailable",
+}
+
+
+class _Error(Exception):
+    def __init__(self, status: int, detail: str, parameter: Optional[str] = None):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.parameter = parameter
+
+    def body(self) -> dict[str, Any]:
+        error: dict[str, Any] = {
+            "status": str(self.status),
+            "code": "PARAMETER_ERROR.INVALID" if self.parameter else "NOT_FOUND",
+            "title": _STATUS_TEXT[self.status][4:],
+            "detail": self.detail,
+        }
+        if self.parameter:
+            error["source"] = {"parameter": self.parameter}
+        return {"errors": [error]}
+
+
+class FakeASC:
+    def __init__(
+        self,
+        fixtures: Fixtures,
+        latency: float = 0.0,
+        throttle_every: Optional[int] = None,
+        retry_after: float = 0.0,
+        fail_every: Optional[int] = None,
+        upstream: Any = None,
+    ):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.fail_every = fail_every
+        self.upstream = upstream
+        self.stats: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {"requests": 0, "bytes_out": 0, "throttled": 0, "failed": 0, "recorded": 0}
+
+    # --- WSGI -------------------------------------------------------------
+
+    def __call__(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        with self._lock:
+            self.stats["requests"] += 1
+            count = self.stats["requests"]
+        if self.latency:
+            time.sleep(self.latency)
+        headers = [("Content-Type", "application/json")]
+        if self.throttle_every and count % self.throttle_every == 0:
+            with self._lock:
+                self.stats["throttled"] += 1
+            status, body = 429, _Error(429, "Rate limit exceeded").body()
+            headers.append(("Retry-After", f"{self.retry_after:g}"))
+        elif self.fail_every and count % self.fail_every == 0:
+            with self._lock:
+                self.stats["failed"] += 1
+            status, body = 503, _Error(503, "Service unavailable").body()
+        elif not environ.get("HTTP_AUTHORIZATION", "").startswith("Bearer "):
+            status, body = 401, _Error(401, "Missing bearer token").body()
+        else:
+            try:
+                status, body = self.handle(
+                    environ["REQUEST_METHOD"],
+                    environ.get("PATH_INFO", ""),
+                    dict(parse_qsl(environ.get("QUERY_STRING", ""), keep_blank_values=True)),
+                    self._read_body(environ),
+                    f"{environ.get('wsgi.url_scheme', 'http')}://{environ['HTTP_HOST']}",
+                )
+            except _Error as error:
+                status, body = error.status, error.body()
+        payload = b"" if body is None else json.dumps(body, separators=(",", ":")).encode()
+        headers.append(("Content-Length", str(len(payload))))
+        remaining = max(0, 3600 - count)
+        headers.append(("X-Rate-Limit", f"user-hour-lim:3600;user-hour-rem:{remaining};"))
+        with self._lock:
+            self.stats["bytes_out"] += len(payload)
+        start_response(_STATUS_TEXT[status], headers)
+        return [payload]
+
+    @staticmethod
+    def _read_body(environ: dict[str, Any]) -> Optional[dict[str, Any]]:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        if not length:
+            return None
+        return json.loads(environ["wsgi.input"].read(length))
+
+    # --- routing ----------------------------------------------------------
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str],
+        body: Optional[dict[str, Any]],
+        base: str,
+    ) -> tuple[int, Optional[dict[str, Any]]]:
+        segments = [s for s in path.split("/") if s][1:]  # drop "v1"/"v2"
+        if method == "GET":
+            return 200, self._get(path, segments, params, base)
+        if method == "PATCH" and len(segments) == 2:
+            resource = self._resource(segments[0], segments[1])
+            data = (body or {}).get("data", {})
+            resource.setdefault("attributes", {}).update(data.get("attributes", {}))
+            for name, rel in data.get("relationships", {}).items():
+                resource.setdefault("relationships", {})[name] = rel
+            return 200, {"data": resource}
+        if method == "POST" and len(segments) == 1:
+            data = dict((body or {}).get("data", {}))
+            data.setdefault("id", f"fake-{next(self._ids):06d}")
+            return 201, {"data": self.fixtures.add(data)}
+        if method in ("POST", "DELETE") and len(segments) == 4 and segments[2] == "relationships":
+            resource = self._resource(segments[0], segments[1])
+            changed = [linkage(item) for item in (body or {}).get("data", [])]
+            self._relate(resource, segments[3], changed, add=method == "POST")
+            # The API keeps both directions in step: adding a build to a group
+            # from the build side shows up in the group's builds too.
+            for target in self._resolve(changed):
+                self._relate(target, resource["type"], [linkage(resource)], add=method == "POST")
+            return 204, None
+        if method == "DELETE" and len(segments) == 2:
+            resource = self._resource(segments[0], segments[1])
+            del self.fixtures.resources[(resource["type"], resource["id"])]
+            return 204, None
+        raise _Error(404, f"No route for {method} {path}")
+
+    @staticmethod
+    def _relate(
+        resource: dict[str, Any], name: str, links: list[dict[str, str]], add: bool
+    ) -> None:
+        rel = resource.setdefault("relationships", {}).setdefault(name, {"data": []})
+        current = rel.get("data") or []
+        if add:
+            rel["data"] = current + [link for link in links if link not in current]
+        else:
+            rel["data"] = [link for link in current if link not in links]
+
+    def _resource(self, collection: str, id_: str) -> dict[str, Any]:
+        resource = self.fixtures.find(collection, id_)
+        if resource is None:
+            raise _Error(404, f"There is no resource of type '{collection}' with id '{id_}'")
+        return resource
+
+    def _get(
+        self, path: str, segments: list[str], params: dict[str, str], base: str
+    ) -> dict[str, Any]:
+        key = listing_key(path, params)
+        if key in self.fixtures.listings:
+            listing = self._resolve(self.fixtures.listings[key])
+            return self._page(path, listing, params, base, filtered=True)
+        if key in self.fixtures.documents:
+            return self._document(self._resolve([self.fixtures.documents[key]])[0], params)
+        if self.upstream is not None:
+            return self._record(path, params, base)
+
+        if len(segments) == 1:
+            return self._page(path, self.fixtures.of_type(segments[0]), params, base)
+        if len(segments) == 2:
+            return self._document(self._resource(segments[0], segments[1]), params)
+        if len(segments) == 3:
+            parent = self._resource(segments[0], segments[1])
+            rel = parent.get("relationships", {}).get(segments[2])
+            if rel is None or "data" not in rel:
+                raise _Error(404, f"No relationship '{segments[2]}' on {segments[0]}/{segments[1]}")
+            if isinstance(rel["data"], list):
+                return self._page(path, self._resolve(rel["data"]), params, base)
+            if rel["data"] is None:
+                return {"data": None, "links": {"self": f"{base}{path}"}}
+            return self._document(self._resolve([rel["data"]])[0], params)
+        if len(segments) == 4 and segments[2] == "relationships":
+            parent = self._resource(segments[0], segments[1])
+            data = parent.get("relationships", {}).get(segments[3], {}).get("data") or []
+            return self._page(path, data, params, base, linkage_only=True)
+        raise _Error(404, f"No route for GET {path}")
+
+    def _resolve(self, links: Iterable[dict[str, str]]) -> list[dict[str, Any]]:
+        resolved = []
+        for link in links:
+            resource = self.fixtures.get(link["type"], link["id"])
+            if resource is not None:
+                resolved.append(resource)
+        return resolved
+
+    # --- rendering --------------------------------------------------------
+
+    def _matches(self, resource: dict[str, Any], path: list[str], wanted: set[str]) -> bool:
+        name, rest = path[0], path[1:]
+        if name == "id" and not rest:
+            return resource["id"] in wanted
+        if not rest and name in resource.get("attributes", {}):
+            return str(resource["attributes"][name]) in wanted or (
+                isinstance(resource["attributes"][name], bool)
+                and str(resource["attributes"][name]).lower() in wanted
+            )
+        data = resource.get("relationships", {}).get(name, {}).get("data")
+        links = data if isinstance(data, list) else [data] if data else []
+        if not rest:
+            return any(link["id"] in wanted for link in links)
+        return any(self._matches(target, rest, wanted) for target in self._resolve(links))
+
+    def _select(
+        self, resources: list[dict[str, Any]], params: dict[str, str]
+    ) -> list[dict[str, Any]]:
+        for key, value in params.items():
+            if key.startswith("filter[") and key.endswith("]"):
+                field_path = key[7:-1].split(".")
+                wanted = set(value.split(","))
+                resources = [r for r in resources if self._matches(r, field_path, wanted)]
+        for field_name in reversed([f for f in params.get("sort", "").split(",") if f]):
+            descending = field_name.startswith("-")
+            name = field_name.lstrip("-")
+            present = [r for r in resources if r.get("attributes", {}).get(name) is not None]
+            missing = [r for r in resources if r.get("attributes", {}).get(name) is None]
+            resources = sorted(
+                present, key=lambda r: r["attributes"][name], reverse=descending
+            ) + missing
+        return resources
+
+    def _render(
+        self, resource: dict[str, Any], params: dict[str, str], includes: set[str]
+    ) -> dict[str, Any]:
+        fields = params.get(f"fields[{resource['type']}]")
+        allowed = set(fields.split(",")) if fields else None
+        out: dict[str, Any] = {"type": resource["type"], "id": resource["id"]}
+        out["attributes"] = {
+            k: v for k, v in resource.get("attributes", {}).items()
+            if allowed is None or k in allowed
+        }
+        relationships = {}
+        for name, rel in resource.get("relationships", {}).items():
+            if allowed is not None and name not in allowed:
+                continue
+            rendered: dict[str, Any] = {}
+            # To-many linkage only comes back for included relationships.
+            if not isinstance(rel.get("data"), list) or name in includes:
+                rendered["data"] = rel.get("data")
+            relationships[name] = rendered
+        if relationships:
+            out["relationships"] = relationships
+        return out
+
+    def _included(
+        self, resources: list[dict[str, Any]], params: dict[str, str], includes: set[str]
+    ) -> list[dict[str, Any]]:
+        seen: set[tuple[str, str]] = set()
+        included = []
+        for resource in resources:
+            for name in includes:
+                data = resource.get("relationships", {}).get(name, {}).get("data")
+                links = data if isinstance(data, list) else [data] if data else []
+                for target in self._resolve(links):
+                    key = (target["type"], target["id"])
+                    if key not in seen:
+                        seen.add(key)
+                        included.append(self._render(target, params, set()))
+        return included
+
+    def _document(self, resource: dict[str, Any], params: dict[str, str]) -> dict[str, Any]:
+        includes = {i for i in params.get("include", "").split(",") if i}
+        body: dict[str, Any] = {"data": self._render(resource, params, includes)}
+        if includes:
+            body["included"] = self._included([resource], params, includes)
+        return body
+
+    def _page(
+        self,
+        path: str,
+        resources: list[Any],
+        params: dict[str, str],
+        base: str,
+        filtered: bool = False,
+        linkage_only: bool = False,
+    ) -> dict[str, Any]:
+        maximum = documented_page_size(path)
+        try:
+            limit = int(params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            raise _Error(400, f"'{params['limit']}' is not a valid value for 'limit'", "limit")
+        if not 1 <= limit <= maximum:
+            raise _Error(
+                400,
+                f"'{limit}' is not a valid value for 'limit'. The maximum allowed is {maximum}",
+                "limit",
+            )
+        if not filtered and not linkage_only:
+            resources = self._select(resources, params)
+        offset = int(params.get("cursor", "0") or 0)
+        window = resources[offset:offset + limit]
+        query = urlencode(params)
+        body: dict[str, Any] = {
+            "links": {"self": f"{base}{path}" + (f"?{query}" if query else "")},
+            "meta": {"paging": {"total": len(resources), "limit": limit}},
+        }
+        if linkage_only:
+            body["data"] = [linkage(r) for r in window]
+        else:
+            includes = {i for i in params.get("include", "").split(",") if i}
+            body["data"] = [self._render(r, params, includes) for r in window]
+            if includes:
+                body["included"] = self._included(window, params, includes)
+        if offset + limit < len(resources):
+            body["links"]["next"] = f"{base}{path}?" + urlencode(
+                {**params, "cursor": str(offset + limit), "limit": str(limit)}
+            )
+        return body
+
+    # --- recording --------------------------------------------------------
+
+    def _record(self, path: str, params: dict[str, str], base: str) -> dict[str, Any]:
+        upstream_params = {k: v for k, v in params.items() if k != "cursor"}
+        pages = list(self.upstream.iter_pages(path, upstream_params))
+        data: Any = pages[0].get("data") if pages else None
+        included: list[dict[str, Any]] = []
+        if isinstance(data, list):
+            data = [item for page in pages for item in page.get("data", [])]
+        for page in pages:
+            included.extend(page.get("included", []))
+        with self._lock:
+            self.stats["recorded"] += 1
+        self.fixtures.record_listing(path, params, {"data": data, "included": included})
+        return self._get(path, [s for s in path.split("/") if s][1:], params, base)
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class FakeASCServer:
+    """Serve a :class:`FakeASC` on ``127.0.0.1`` from a background thread.
+
+    Extra keyword arguments go to :class:`FakeASC`. ``url`` is the base URL
+    to hand to ``ASCClient(..., base_url=...)``.
+    """
+
+    def __init__(self, fixtures: Fixtures, port: int = 0, **options: Any):
+        self.app = FakeASC(fixtures, **options)
+        self._server = make_server(
+            "127.0.0.1", port, self.app,
+            server_class=_ThreadingWSGIServer, handler_class=_QuietHandler,
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return self.app.stats
+
+    def start(self) -> "FakeASCServer":
+        # A short poll so stop() returns promptly: test suites start dozens.
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeASCServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
@@ -0,0 +1,25 @@
+"""Local SQLite mirror of an app's TestFlight and Xcode Cloud state.
+
+Questions like "which 2.9.x builds are still unexpired, and in which groups"
+come up all day in the scripts and the MCP server, and each one costs a full
+build listing plus a group sweep against the live API. Sync once into a
+:class:`Mirror`, keep it current with cheap incremental syncs, and answer
+from SQLite::
+
+    mirror = Mirror("~/.cache/asc/mirror.db")
+    sync(client, mirror, app_id, max_age=300)
+    builds = mirror.builds(app_id, version_prefix="2.9.", unexpired=True)
+    groups = mirror.groups_for_builds([b["id"] for b in builds])
+
+| Submodule | Covers |
+|---|---|
+| ``store`` | ``Mirror`` — schema, upserts and the query helpers |
+| ``sync`` | ``sync`` and the per-resource incremental syncs |
+
+Sync from the shell with ``python -m asc.mirror``.
+"""
+
+from asc.mirror.store import Mirror
+from asc.mirror.sync import RESOURCES, sync
+
+__all__ = ["Mirror", "RESOURCES", "sync"]
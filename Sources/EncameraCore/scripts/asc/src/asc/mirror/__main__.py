@@ -0,0 +1,42 @@
+"""Sync the local App Store Connect mirror.
+
+    python -m asc.mirror                          # incremental sync of everything
+    python -m asc.mirror --full                   # re-read whole listings
+    python -m asc.mirror --only builds ciBuildRuns --max-age 300
+
+The database is ``--path``, else ``ASC_MIRROR_PATH``, else
+``~/.cache/asc/mirror.db``.
+"""
+
+import argparse
+import time
+
+from asc.auth import Credentials
+from asc.client import ASCClient
+from asc.mirror.store import Mirror
+from asc.mirror.sync import RESOURCES, sync
+
+DEFAULT_PATH = "~/.cache/asc/mirror.db"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m asc.mirror", description=__doc__.splitlines()[0])
+    parser.add_argument("--credentials", help="ASC credentials YAML")
+    parser.add_argument("--path", help=f"Mirror database (default: ASC_MIRROR_PATH or {DEFAULT_PATH})")
+    parser.add_argument("--only", nargs="+", choices=RESOURCES, help="Resources to sync (default: all)")
+    parser.add_argument("--full", action="store_true", help="Re-read whole listings")
+    parser.add_argument("--max-age", type=float, help="Skip resources synced within this many seconds")
+    args = parser.parse_args()
+
+    mirror = Mirror(args.path) if args.path else Mirror.from_env() or Mirror(DEFAULT_PATH)
+    client = ASCClient(Credentials.load(args.credentials))
+    app_id = client.resolve_app_id()
+    start = time.perf_counter()
+    written = sync(client, mirror, app_id, resources=args.only, full=args.full, max_age=args.max_age)
+    for resource, count in written.items():
+        print(f"{resource:<30} {count:>6} written")
+    print(f"Synced app {app_id} into {mirror.path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+"""SQLite storage and queries for the App Store Connect mirror.
+
+One row per resource, with the columns the query helpers filter and sort on
+pulled out and indexed; the rest of the resource is kept as JSON in ``body``.
+Builds keep the raw API dict (with ``_app_version``, the shape
+``list_builds_with_versions`` returns), everything else the fields of its
+``asc.models`` dataclass, so every helper returns what the equivalent live
+call would.
+
+Dates are compared as Unix timestamps (``*_ts`` columns): Apple sends ISO
+8601 with whatever UTC offset the record was written in, so the strings
+don't sort.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from asc.models import BetaGroup, BetaTester, CrashSubmission
+from asc.xcode_cloud.models import CiBuildRun
+
+_SCHEMA = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS builds (
+    id TEXT PRIMARY KEY,
+    app_id TEXT NOT NULL,
+    number TEXT,
+    app_version TEXT NOT NULL,
+    pre_release_version_id TEXT,
+    processing_state TEXT,
+    expired INTEGER NOT NULL,
+    uploaded_ts REAL,
+    expiration_ts REAL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS builds_by_upload ON builds(app_id, uploaded_ts DESC);
+CREATE INDEX IF NOT EXISTS builds_by_version ON builds(app_id, app_version);
+CREATE TABLE IF NOT EXISTS pre_release_versions (
+    id TEXT PRIMARY KEY,
+    app_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    platform TEXT
+);
+CREATE TABLE IF NOT EXISTS beta_groups (
+    id TEXT PRIMARY KEY,
+    app_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS beta_group_builds (
+    group_id TEXT NOT NULL,
+    build_id TEXT NOT NULL,
+    PRIMARY KEY (group_id, build_id)
+);
+CREATE INDEX IF NOT EXISTS beta_group_builds_by_build ON beta_group_builds(build_id);
+CREATE TABLE IF NOT EXISTS beta_testers (
+    id TEXT PRIMARY KEY,
+    app_id TEXT NOT NULL,
+    email TEXT COLLATE NOCASE,
+    state TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS beta_testers_by_email ON beta_testers(app_id, email);
+CREATE TABLE IF NOT EXISTS beta_group_testers (
+    group_id TEXT NOT NULL,
+    tester_id TEXT NOT NULL,
+    PRIMARY KEY (group_id, tester_id)
+);
+CREATE INDEX IF NOT EXISTS beta_group_testers_by_tester ON beta_group_testers(tester_id);
+CREATE TABLE IF NOT EXISTS ci_build_runs (
+    id TEXT PRIMARY KEY,
+    app_id TEXT NOT NULL,
+    workflow_id TEXT,
+    number INTEGER,
+    execution_progress TEXT,
+    completion_status TEXT,
+    source_commit_sha TEXT,
+    created_ts REAL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ci_build_runs_by_workflow ON ci_build_runs(workflow_id, number DESC);
+CREATE INDEX IF NOT EXISTS ci_build_runs_by_app ON ci_build_runs(app_id, created_ts DESC);
+CREATE TABLE IF NOT EXISTS crash_submissions (
+    id TEXT PRIMARY KEY,
+    app_id TEXT NOT NULL,
+    build_id TEXT,
+    device_model TEXT,
+    os_version TEXT,
+    created_ts REAL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS crash_submissions_by_app ON crash_submissions(app_id, created_ts DESC);
+CREATE INDEX IF NOT EXISTS crash_submissions_by_build ON crash_submissions(build_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    app_id TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (app_id, resource)
+);
+"""
+
+# Build runs that can still change: anything not yet COMPLETE.
+_SETTLED_PROGRESS = "COMPLETE"
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+class Mirror:
+    """A local copy of one or more apps' TestFlight and Xcode Cloud state.
+
+    Fill it with :func:`asc.mirror.sync`; read it with the query methods
+    below, which never touch the network. Safe to share between threads.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["Mirror"]:
+        path = os.environ.get("ASC_MIRROR_PATH")
+        return cls(path) if path else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                yield self._db
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+        with self._lock:
+            return self._db.execute(sql, tuple(params)).fetchall()
+
+    # --- sync bookkeeping ----------------------------------------------------
+
+    def synced_at(self, app_id: str, resource: str) -> Optional[float]:
+        """When ``resource`` was last synced for the app, or ``None``."""
+        rows = self._query(
+            "SELECT synced_at FROM sync_state WHERE app_id = ? AND resource = ?",
+            (app_id, resource),
+        )
+        return rows[0][0] if rows else None
+
+    def mark_synced(self, app_id: str, resource: str, when: Optional[float] = None) -> None:
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (app_id, resource, time.time() if when is None else when),
+            )
+
+    def has(self, table: str, id_: str) -> bool:
+        """Whether ``table`` already holds the record — the incremental syncs'
+        stopping test."""
+        return bool(self._query(f"SELECT 1 FROM {table} WHERE id = ?", (id_,)))
+
+    def unsettled_build_ids(self, app_id: str) -> list[str]:
+        """Builds Apple is still processing, whose state will change."""
+        return [row[0] for row in self._query(
+            "SELECT id FROM builds WHERE app_id = ? AND processing_state = 'PROCESSING'",
+            (app_id,),
+        )]
+
+    def unsettled_build_run_ids(self, app_id: str) -> list[str]:
+        """Build runs that are still pending or running."""
+        return [row[0] for row in self._query(
+            "SELECT id FROM ci_build_runs WHERE app_id = ? AND execution_progress != ?",
+            (app_id, _SETTLED_PROGRESS),
+        )]
+
+    # --- writes ----------------------------------------------------------------
+
+    def put_builds(
+        self,
+        app_id: str,
+        builds: Iterable[dict[str, Any]],
+        pre_release_versions: Iterable[dict[str, Any]] = (),
+    ) -> int:
+        """Upsert raw build dicts (and the preReleaseVersions included with
+        them). ``_app_version`` is filled in from the versions when missing."""
+        builds = list(builds)
+        with self._transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO pre_release_versions VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        version["id"], app_id,
+                        version.get("attributes", {}).get("version", "?"),
+                        version.get("attributes", {}).get("platform"),
+                    )
+                    for version in pre_release_versions
+                ],
+            )
+            rows = []
+            for build in builds:
+                attrs = build.get("attributes", {})
+                rel = build.get("relationships", {}).get("preReleaseVersion", {}).get("data")
+                version_id = rel["id"] if rel else None
+                if "_app_version" not in build:
+                    found = version_id and db.execute(
+                        "SELECT version FROM pre_release_versions WHERE id = ?", (version_id,)
+                    ).fetchone()
+                    build = {**build, "_app_version": found[0] if found else "?"}
+                rows.append((
+                    build["id"], app_id, attrs.get("version"), build["_app_version"], version_id,
+                    attrs.get("processingState"), int(bool(attrs.get("expired"))),
+                    parse_timestamp(attrs.get("uploadedDate")), parse_timestamp(attrs.get("expirationDate")),
+                    _encode(build),
+                ))
+            db.executemany(
+                "INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(builds)
+
+    def replace_beta_groups(
+        self,
+        app_id: str,
+        groups: Iterable[BetaGroup],
+        builds_by_group: dict[str, Iterable[str]],
+    ) -> int:
+        """Replace the app's groups and build↔group membership wholesale."""
+        groups = list(groups)
+        with self._transaction() as db:
+            db.execute(
+                "DELETE FROM beta_group_builds WHERE group_id IN "
+                "(SELECT id FROM beta_groups WHERE app_id = ?)",
+                (app_id,),
+            )
+            db.execute("DELETE FROM beta_groups WHERE app_id = ?", (app_id,))
+            db.executemany(
+                "INSERT OR REPLACE INTO beta_groups VALUES (?, ?, ?, ?)",
+                [(g.id, app_id, g.name, _encode(asdict(g))) for g in groups],
+            )
+            db.executemany(
+                "INSERT OR IGNORE INTO beta_group_builds VALUES (?, ?)",
+                [
+                    (group_id, build_id)
+                    for group_id, build_ids in builds_by_group.items()
+                    for build_id in build_ids
+                ],
+            )
+        return len(groups)
+
+    def replace_beta_testers(self, app_id: str, testers: Iterable[BetaTester]) -> int:
+        """Replace the app's testers (and their group membership) wholesale."""
+        testers = list(testers)
+        with self._transaction() as db:
+            db.execute(
+                "DELETE FROM beta_group_testers WHERE tester_id IN "
+                "(SELECT id FROM beta_testers WHERE app_id = ?)",
+                (app_id,),
+            )
+            db.execute("DELETE FROM beta_testers WHERE app_id = ?", (app_id,))
+            db.executemany(
+                "INSERT OR REPLACE INTO beta_testers VALUES (?, ?, ?, ?, ?)",
+                [(t.id, app_id, t.email, t.state, _encode(asdict(t))) for t in testers],
+            )
+            db.executemany(
+                "INSERT OR IGNORE INTO beta_group_testers VALUES (?, ?)",
+                [(group_id, t.id) for t in testers for group_id in t.beta_group_ids],
+            )
+        return len(testers)
+
+    def put_build_runs(self, app_id: str, runs: Iterable[CiBuildRun]) -> int:
+        runs = list(runs)
+        with self._transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO ci_build_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        r.id, app_id, r.workflow_id, r.number, r.execution_progress,
+                        r.completion_status, r.source_commit_sha, parse_timestamp(r.created_date),
+                        _encode(asdict(r)),
+                    )
+                    for r in runs
+                ],
+            )
+        return len(runs)
+
+    def put_crash_submissions(self, app_id: str, crashes: Iterable[CrashSubmission]) -> int:
+        crashes = list(crashes)
+        with self._transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO crash_submissions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        c.id, app_id, c.build_id, c.device_model, c.os_version,
+                        parse_timestamp(c.created_date), _encode(asdict(c)),
+                    )
+                    for c in crashes
+                ],
+            )
+        return len(crashes)
+
+    # --- queries ---------------------------------------------------------------
+
+    def builds(
+        self,
+        app_id: str,
+        app_version: Optional[str] = None,
+        version_prefix: Optional[str] = None,
+        processing_state: Optional[str] = None,
+        unexpired: bool = False,
+        limit: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """Builds newest upload first, as ``list_builds_with_versions`` dicts.
+
+        ``version_prefix="2.9."`` matches every 2.9.x marketing version.
+        ``unexpired`` drops builds flagged expired and builds past their
+        expiration date, so TestFlight's automatic 90-day expiry needs no
+        re-sync to show up.
+        """
+        where = ["app_id = ?"]
+        params: list[Any] = [app_id]
+        if app_version is not None:
+            where.append("app_version = ?")
+            params.append(app_version)
+        if version_prefix is not None:
+            where.append("substr(app_version, 1, ?) = ?")
+            params += [len(version_prefix), version_prefix]
+        if processing_state is not None:
+            where.append("processing_state = ?")
+            params.append(processing_state)
+        if unexpired:
+            where.append("expired = 0 AND (expiration_ts IS NULL OR expiration_ts > ?)")
+            params.append(time.time())
+        sql = f"SELECT body FROM builds WHERE {' AND '.join(where)} ORDER BY uploaded_ts DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(body) for (body,) in self._query(sql, params)]
+
+    def beta_groups(self, app_id: str) -> list[BetaGroup]:
+        return [
+            BetaGroup(**json.loads(body))
+            for (body,) in self._query(
+                "SELECT body FROM beta_groups WHERE app_id = ? ORDER BY name", (app_id,)
+            )
+        ]
+
+    def groups_for_builds(self, build_ids: Iterable[str]) -> dict[str, list[BetaGroup]]:
+        """Beta groups each build is attached to (an empty list for none)."""
+        build_ids = list(build_ids)
+        result: dict[str, list[BetaGroup]] = {build_id: [] for build_id in build_ids}
+        if not build_ids:
+            return result
+        placeholders = ",".join("?" * len(build_ids))
+        rows = self._query(
+            f"SELECT m.build_id, g.body FROM beta_group_builds m "
+            f"JOIN beta_groups g ON g.id = m.group_id "
+            f"WHERE m.build_id IN ({placeholders}) ORDER BY g.name",
+            build_ids,
+        )
+        for build_id, body in rows:
+            result[build_id].append(BetaGroup(**json.loads(body)))
+        return result
+
+    def builds_in_group(self, group_id: str) -> list[dict[str, Any]]:
+        """Builds attached to a beta group, newest upload first."""
+        return [json.loads(body) for (body,) in self._query(
+            "SELECT b.body FROM beta_group_builds m JOIN builds b ON b.id = m.build_id "
+            "WHERE m.group_id = ? ORDER BY b.uploaded_ts DESC",
+            (group_id,),
+        )]
+
+    def testers(
+        self,
+        app_id: str,
+        email: Optional[str] = None,
+        state: Optional[str] = None,
+        group_id: Optional[str] = None,
+    ) -> list[BetaTester]:
+        """The app's testers; ``email`` matches case-insensitively."""
+        sql = "SELECT t.body FROM beta_testers t"
+        where = ["t.app_id = ?"]
+        params: list[Any] = [app_id]
+        if group_id is not None:
+            sql += " JOIN beta_group_testers m ON m.tester_id = t.id"
+            where.append("m.group_id = ?")
+            params.append(group_id)
+        if email is not None:
+            where.append("t.email = ?")
+            params.append(email)
+        if state is not None:
+            where.append("t.state = ?")
+            params.append(state)
+        sql += f" WHERE {' AND '.join(where)} ORDER BY t.email"
+        return [BetaTester(**json.loads(body)) for (body,) in self._query(sql, params)]
+
+    def build_runs(
+        self,
+        app_id: str,
+        workflow_id: Optional[str] = None,
+        execution_progress: Optional[str] = None,
+        completion_status: Optional[str] = None,
+        commit_sha: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[CiBuildRun]:
+        """Build runs newest first; ``commit_sha`` may be a prefix."""
+        where = ["app_id = ?"]
+        params: list[Any] = [app_id]
+        for column, value in (
+            ("workflow_id", workflow_id),
+            ("execution_progress", execution_progress),
+            ("completion_status", completion_status),
+        ):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if commit_sha is not None:
+            where.append("substr(source_commit_sha, 1, ?) = ?")
+            params += [len(commit_sha), commit_sha]
+        order = "number DESC" if workflow_id is not None else "created_ts DESC"
+        sql = f"SELECT body FROM ci_build_runs WHERE {' AND '.join(where)} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [CiBuildRun(**json.loads(body)) for (body,) in self._query(sql, params)]
+
+    def crash_submissions(
+        self,
+        app_id: str,
+        build_ids: Optional[list[str]] = None,
+        device_model: Optional[str] = None,
+        os_version: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[CrashSubmission]:
+        """Crash submissions newest first, filtered like
+        ``list_crash_submissions``."""
+        where = ["app_id = ?"]
+        params: list[Any] = [app_id]
+        if build_ids:
+            where.append(f"build_id IN ({','.join('?' * len(build_ids))})")
+            params += build_ids
+        if device_model is not None:
+            where.append("device_model = ?")
+            params.append(device_model)
+        if os_version is not None:
+            where.append("os_version = ?")
+            params.append(os_version)
+        sql = (
+            f"SELECT body FROM crash_submissions WHERE {' AND '.join(where)} "
+            f"ORDER BY created_ts DESC"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [CrashSubmission(**json.loads(body)) for (body,) in self._query(sql, params)]
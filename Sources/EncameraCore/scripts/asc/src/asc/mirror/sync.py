@@ -0,0 +1,200 @@
+"""Incremental sync from App Store Connect into a :class:`~asc.mirror.store.Mirror`.
+
+Three of the listings can be read newest-first, and each of their records is
+written once and only changes while it is in flight:
+
+- builds, by ``-uploadedDate`` (with their preReleaseVersions included);
+- Xcode Cloud build runs, per workflow by ``-number``;
+- crash submissions, by ``-createdDate``.
+
+For those, paging stops at the first record the mirror already has that was
+created before the last completed sync of that listing started, so a sync
+after a quiet hour is one request per listing. Records are written page by
+page, so one the mirror has that is newer than that came from a sync that
+never finished — which may have stopped anywhere below it — and paging goes
+on past it. Until a sync of the listing has completed, it is read in full. Builds still
+``PROCESSING`` and runs not yet ``COMPLETE`` are re-read by id afterwards;
+builds expiring on schedule need no re-read (see ``Mirror.builds``). A build
+expired by hand, elsewhere, is only picked up by a ``full`` sync.
+
+Beta groups, group membership and testers have no usable ordering — Apple
+sorts testers by name, and membership is a set — so they are replaced
+wholesale on every sync: one listing for the groups plus one linkage read per
+group, and one listing for the testers.
+"""
+
+import time
+from itertools import takewhile
+from typing import Any, Iterable, Optional
+
+from asc.client import ASCClient
+from asc.mirror.store import Mirror, parse_timestamp
+from asc.models import BetaGroup, CrashSubmission
+from asc.testflight import BetaGroupMembershipIndex, list_app_testers
+from asc.xcode_cloud.build_runs import get_build_run
+from asc.xcode_cloud.models import CiBuildRun
+from asc.xcode_cloud.products import get_product_for_app
+from asc.xcode_cloud.workflows import list_workflows_for_product
+
+RESOURCES = ("builds", "betaGroups", "betaTesters", "ciBuildRuns", "betaFeedbackCrashSubmissions")
+
+# preReleaseVersion must be listed for the relationship to come back.
+_BUILD_FIELDS = (
+    "version,uploadedDate,expirationDate,expired,processingState,buildAudienceType,"
+    "minOsVersion,preReleaseVersion"
+)
+# Largest id list Apple accepts in one filter[id].
+_ID_BATCH = 200
+
+
+def _build_params(app_id: str) -> dict[str, Any]:
+    return {
+        "filter[app]": app_id,
+        "fields[builds]": _BUILD_FIELDS,
+        "include": "preReleaseVersion",
+        "fields[preReleaseVersions]": "version,platform",
+    }
+
+
+def _since(mirror: Mirror, app_id: str, resource: str, full: bool) -> Optional[float]:
+    """Start of the last completed sync of ``resource``; ``None`` reads the
+    whole listing."""
+    return None if full else mirror.synced_at(app_id, resource)
+
+
+def _newer(
+    mirror: Mirror, table: str, items: list[dict], since: Optional[float], date_field: str
+) -> list[dict]:
+    """The leading run of ``items`` up to the first that the mirror has and
+    that was created (``date_field``) before ``since`` — all of them if
+    ``since`` is ``None``."""
+    if since is None:
+        return items
+
+    def synced(item: dict) -> bool:
+        created = parse_timestamp(item.get("attributes", {}).get(date_field))
+        return created is not None and created < since and mirror.has(table, item["id"])
+
+    return list(takewhile(lambda item: not synced(item), items))
+
+
+def _included(page: dict[str, Any], type_: str) -> list[dict[str, Any]]:
+    return [item for item in page.get("included", []) if item.get("type") == type_]
+
+
+def sync_builds(client: ASCClient, mirror: Mirror, app_id: str, full: bool = False) -> int:
+    """New builds, newest first, down to the first one already mirrored;
+    then every build still processing, by id."""
+    seen: set[str] = set()
+    since = _since(mirror, app_id, "builds", full)
+    params = {**_build_params(app_id), "sort": "-uploadedDate"}
+    for page in client.iter_pages("/v1/builds", params=params):
+        data = page.get("data", [])
+        fresh = _newer(mirror, "builds", data, since, "uploadedDate")
+        mirror.put_builds(app_id, fresh, _included(page, "preReleaseVersions"))
+        seen.update(build["id"] for build in fresh)
+        if len(fresh) < len(data):
+            break
+    pending = [id_ for id_ in mirror.unsettled_build_ids(app_id) if id_ not in seen]
+    for start in range(0, len(pending), _ID_BATCH):
+        ids = pending[start:start + _ID_BATCH]
+        result = client.get_all_paginated_with_includes(
+            "/v1/builds", params={**_build_params(app_id), "filter[id]": ",".join(ids)}
+        )
+        mirror.put_builds(app_id, result["data"], _included(result, "preReleaseVersions"))
+    return len(seen)
+
+
+def sync_beta_groups(client: ASCClient, mirror: Mirror, app_id: str, full: bool = False) -> int:
+    """Every group and its builds, replacing what the mirror had."""
+    index = BetaGroupMembershipIndex(client, app_id)
+    groups = [BetaGroup.from_api(group) for group in index.groups.values()]
+    return mirror.replace_beta_groups(
+        app_id, groups, {group.id: index.builds_in(group.id) for group in groups}
+    )
+
+
+def sync_beta_testers(client: ASCClient, mirror: Mirror, app_id: str, full: bool = False) -> int:
+    """Every tester on the app, replacing what the mirror had."""
+    return mirror.replace_beta_testers(app_id, list_app_testers(client, app_id))
+
+
+def sync_build_runs(client: ASCClient, mirror: Mirror, app_id: str, full: bool = False) -> int:
+    """New runs of every workflow on the app's ciProduct, newest first down to
+    the first one already mirrored; then every run still in flight, by id."""
+    product = get_product_for_app(client, app_id)
+    if product is None:
+        return 0
+    seen: set[str] = set()
+    since = _since(mirror, app_id, "ciBuildRuns", full)
+    for workflow in list_workflows_for_product(client, product.id):
+        path = f"/v1/ciWorkflows/{workflow.id}/buildRuns"
+        for page in client.iter_pages(path, params={"sort": "-number"}):
+            data = page.get("data", [])
+            fresh = _newer(mirror, "ci_build_runs", data, since, "createdDate")
+            mirror.put_build_runs(app_id, (CiBuildRun.from_api(item) for item in fresh))
+            seen.update(item["id"] for item in fresh)
+            if len(fresh) < len(data):
+                break
+    pending = [id_ for id_ in mirror.unsettled_build_run_ids(app_id) if id_ not in seen]
+    mirror.put_build_runs(app_id, [get_build_run(client, run_id) for run_id in pending])
+    return len(seen)
+
+
+def sync_crash_submissions(
+    client: ASCClient, mirror: Mirror, app_id: str, full: bool = False
+) -> int:
+    """New crash submissions, newest first, down to the first one already
+    mirrored. Submissions never change once created."""
+    written = 0
+    since = _since(mirror, app_id, "betaFeedbackCrashSubmissions", full)
+    params = {"sort": "-createdDate", "include": "build", "fields[builds]": "version"}
+    path = f"/v1/apps/{app_id}/betaFeedbackCrashSubmissions"
+    for page in client.iter_pages(path, params=params):
+        data = page.get("data", [])
+        fresh = _newer(mirror, "crash_submissions", data, since, "createdDate")
+        written += mirror.put_crash_submissions(
+            app_id, CrashSubmission.from_api_many(fresh, page.get("included", []))
+        )
+        if len(fresh) < len(data):
+            break
+    return written
+
+
+_SYNCERS = {
+    "builds": sync_builds,
+    "betaGroups": sync_beta_groups,
+    "betaTesters": sync_beta_testers,
+    "ciBuildRuns": sync_build_runs,
+    "betaFeedbackCrashSubmissions": sync_crash_submissions,
+}
+
+
+def sync(
+    client: ASCClient,
+    mirror: Mirror,
+    app_id: str,
+    resources: Optional[Iterable[str]] = None,
+    full: bool = False,
+    max_age: Optional[float] = None,
+) -> dict[str, int]:
+    """Bring the mirror up to date for one app.
+
+    ``resources`` picks from :data:`RESOURCES` (default: all). ``full``
+    re-reads whole listings instead of stopping at the newest mirrored record.
+    With ``max_age``, resources synced less than that many seconds ago are
+    skipped. Returns the number of records written per resource synced.
+    """
+    selected = list(resources or RESOURCES)
+    unknown = set(selected) - set(RESOURCES)
+    if unknown:
+        raise ValueError(f"unknown mirror resources: {', '.join(sorted(unknown))}")
+    written: dict[str, int] = {}
+    for resource in selected:
+        last = mirror.synced_at(app_id, resource)
+        if max_age is not None and last is not None and time.time() - last < max_age:
+            continue
+        started = time.time()
+        written[resource] = _SYNCERS[resource](client, mirror, app_id, full)
+        mirror.mark_synced(app_id, resource, started)
+    return written
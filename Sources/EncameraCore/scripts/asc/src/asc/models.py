@@ -1,10 +1,78 @@
-"""Data models for App Store Connect API responses."""
+"""Data models for App Store Connect API responses.
 
-from dataclasses import dataclass
-from typing import Optional
+Models are frozen and slotted: no per-instance ``__dict__``, so a few thousand
+price points or testers cost a fraction of what plain dataclasses do. Fields
+holding nested JSON (per-device results, issue counts, raw attributes) are
+declared with :func:`lazy_field`; ``asc.table.ModelTable`` keeps those
+encoded and only decodes them when read.
+"""
 
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Union
 
-@dataclass
+LAZY = "asc.lazy"
+
+
+def lazy_field(**kwargs: Any) -> Any:
+    """A field that is rarely read and expensive to hold decoded."""
+    return field(metadata={LAZY: True}, **kwargs)
+
+
+class IncludedIndex:
+    """A response's ``included`` resources, keyed by ``(type, id)``.
+
+    JSON:API ids are only unique within a type — a territory and a price point
+    can share one — so lookups go through the relationship linkage, which
+    carries both. Build one per response and hand it to every ``from_api`` (or
+    use ``from_api_many``); constructors also accept the raw ``included``
+    list and index it themselves.
+    """
+
+    __slots__ = ("_by_key",)
+
+    def __init__(self, included: Optional[Iterable[dict]] = None):
+        self._by_key: dict[tuple[str, str], dict] = {
+            (inc["type"], inc["id"]): inc for inc in (included or [])
+        }
+
+    @classmethod
+    def of(cls, included: Union["IncludedIndex", Iterable[dict], None]) -> "IncludedIndex":
+        return included if isinstance(included, cls) else cls(included)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def get(self, type_: str, id_: str) -> Optional[dict]:
+        return self._by_key.get((type_, id_))
+
+    def resolve(self, linkage: Optional[dict]) -> Optional[dict]:
+        """The included resource for a relationship's ``data`` linkage."""
+        if not linkage:
+            return None
+        return self._by_key.get((linkage.get("type"), linkage.get("id")))
+
+    def attribute(self, linkage: Optional[dict], name: str, default: Any = None) -> Any:
+        resource = self.resolve(linkage)
+        if resource is None:
+            return default
+        return resource.get("attributes", {}).get(name, default)
+
+
+Included = Union[IncludedIndex, list, None]
+
+
+class _CompoundDocumentModel:
+    """``from_api_many`` for models whose ``from_api`` reads ``included``."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_api_many(cls, data: Iterable[dict], included: Included = None) -> list:
+        index = IncludedIndex.of(included)
+        return [cls.from_api(item, index) for item in data]
+
+
+@dataclass(frozen=True, slots=True)
 class SubscriptionGroup:
     id: str
     name: str
@@ -14,7 +82,7 @@ class SubscriptionGroup:
         return cls(id=data["id"], name=data["attributes"]["referenceName"])
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Subscription:
     id: str
     name: str
@@ -35,8 +103,8 @@ class Subscription:
         )
 
 
-@dataclass
-class SubscriptionPrice:
+@dataclass(frozen=True, slots=True)
+class SubscriptionPrice(_CompoundDocumentModel):
     id: str
     territory: str
     currency: str
@@ -45,23 +113,14 @@ class SubscriptionPrice:
     subscription_id: str
 
     @classmethod
-    def from_api(cls, data: dict, included: Optional[list] = None) -> "SubscriptionPrice":
+    def from_api(cls, data: dict, included: Included = None) -> "SubscriptionPrice":
         attrs = data["attributes"]
-        territory = ""
-        currency = ""
-        price = ""
-        included_map = {inc["id"]: inc for inc in (included or [])}
+        index = IncludedIndex.of(included)
         territory_rel = data.get("relationships", {}).get("territory", {}).get("data", {})
-        if territory_rel:
-            territory = territory_rel.get("id", "")
-            terr_obj = included_map.get(territory)
-            if terr_obj:
-                currency = terr_obj.get("attributes", {}).get("currency", "")
+        territory = territory_rel.get("id", "") if territory_rel else ""
+        currency = index.attribute(territory_rel, "currency", "")
         pp_rel = data.get("relationships", {}).get("subscriptionPricePoint", {}).get("data", {})
-        if pp_rel:
-            pp_obj = included_map.get(pp_rel.get("id"))
-            if pp_obj:
-                price = pp_obj.get("attributes", {}).get("customerPrice", "")
+        price = index.attribute(pp_rel, "customerPrice", "")
         sub_rel = data.get("relationships", {}).get("subscription", {}).get("data", {})
         return cls(
             id=data["id"],
@@ -73,8 +132,8 @@ class SubscriptionPrice:
         )
 
 
-@dataclass
-class PricePoint:
+@dataclass(frozen=True, slots=True)
+class PricePoint(_CompoundDocumentModel):
     id: str
     territory: str
     currency: str
@@ -82,17 +141,12 @@ class PricePoint:
     proceeds: str
 
     @classmethod
-    def from_api(cls, data: dict, included: Optional[list] = None) -> "PricePoint":
+    def from_api(cls, data: dict, included: Included = None) -> "PricePoint":
         attrs = data["attributes"]
-        territory = ""
-        currency = ""
-        included_map = {inc["id"]: inc for inc in (included or [])}
+        index = IncludedIndex.of(included)
         terr_rel = data.get("relationships", {}).get("territory", {}).get("data", {})
-        if terr_rel:
-            territory = terr_rel.get("id", "")
-            terr_obj = included_map.get(territory)
-            if terr_obj:
-                currency = terr_obj.get("attributes", {}).get("currency", "")
+        territory = terr_rel.get("id", "") if terr_rel else ""
+        currency = index.attribute(terr_rel, "currency", "")
         return cls(
             id=data["id"],
             territory=territory,
@@ -102,8 +156,8 @@ class PricePoint:
         )
 
 
-@dataclass
-class IAPPrice:
+@dataclass(frozen=True, slots=True)
+class IAPPrice(_CompoundDocumentModel):
     id: str
     territory: str
     currency: str
@@ -111,23 +165,14 @@ class IAPPrice:
     manual: bool
 
     @classmethod
-    def from_api(cls, data: dict, included: Optional[list] = None) -> "IAPPrice":
+    def from_api(cls, data: dict, included: Included = None) -> "IAPPrice":
         attrs = data["attributes"]
-        territory = ""
-        currency = ""
-        price = ""
-        included_map = {inc["id"]: inc for inc in (included or [])}
+        index = IncludedIndex.of(included)
         terr_rel = data.get("relationships", {}).get("territory", {}).get("data", {})
-        if terr_rel:
-            territory = terr_rel.get("id", "")
-            terr_obj = included_map.get(territory)
-            if terr_obj:
-                currency = terr_obj.get("attributes", {}).get("currency", "")
+        territory = terr_rel.get("id", "") if terr_rel else ""
+        currency = index.attribute(terr_rel, "currency", "")
         pp_rel = data.get("relationships", {}).get("inAppPurchasePricePoint", {}).get("data", {})
-        if pp_rel:
-            pp_obj = included_map.get(pp_rel.get("id"))
-            if pp_obj:
-                price = pp_obj.get("attributes", {}).get("customerPrice", "")
+        price = index.attribute(pp_rel, "customerPrice", "")
         return cls(
             id=data["id"],
             territory=territory,
@@ -137,7 +182,7 @@ class IAPPrice:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class InAppPurchase:
     id: str
     name: str
@@ -157,8 +202,8 @@ class InAppPurchase:
         )
 
 
-@dataclass
-class AppStoreVersion:
+@dataclass(frozen=True, slots=True)
+class AppStoreVersion(_CompoundDocumentModel):
     id: str
     version_string: str
     platform: str
@@ -169,18 +214,11 @@ class AppStoreVersion:
     build_version: Optional[str]
 
     @classmethod
-    def from_api(cls, data: dict, included: Optional[list] = None) -> "AppStoreVersion":
+    def from_api(cls, data: dict, included: Included = None) -> "AppStoreVersion":
         attrs = data["attributes"]
-        build_id = None
-        build_version = None
         build_rel = data.get("relationships", {}).get("build", {}).get("data")
-        if build_rel:
-            build_id = build_rel.get("id")
-            if included:
-                included_map = {inc["id"]: inc for inc in included}
-                build_obj = included_map.get(build_id)
-                if build_obj:
-                    build_version = build_obj.get("attributes", {}).get("version")
+        build_id = build_rel.get("id") if build_rel else None
+        build_version = IncludedIndex.of(included).attribute(build_rel, "version")
         return cls(
             id=data["id"],
             version_string=attrs.get("versionString", ""),
@@ -193,7 +231,7 @@ class AppStoreVersion:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Build:
     id: str
     version: str
@@ -215,7 +253,7 @@ class Build:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BetaGroup:
     """A TestFlight group. Internal groups are limited to App Store Connect
     users and get builds automatically when ``has_access_to_all_builds`` is set;
@@ -245,8 +283,8 @@ class BetaGroup:
         )
 
 
-@dataclass
-class BetaTester:
+@dataclass(frozen=True, slots=True)
+class BetaTester(_CompoundDocumentModel):
     """A TestFlight tester. ``state`` is INVITED until they accept the emailed
     invitation, then ACCEPTED / INSTALLED."""
 
@@ -260,14 +298,14 @@ class BetaTester:
     beta_group_names: list[str]
 
     @classmethod
-    def from_api(cls, data: dict, included: Optional[list] = None) -> "BetaTester":
+    def from_api(cls, data: dict, included: Included = None) -> "BetaTester":
         """``beta_group_ids`` is only populated when the request asked for
         ``include=betaGroups`` — the collection endpoint returns relationship
         links but no ``data`` otherwise. ``beta_group_names`` additionally needs
         the ``included`` resources passed through."""
         attrs = data.get("attributes", {})
         groups = data.get("relationships", {}).get("betaGroups", {}).get("data") or []
-        included_map = {inc["id"]: inc for inc in (included or [])}
+        index = IncludedIndex.of(included)
         return cls(
             id=data["id"],
             email=attrs.get("email"),
@@ -276,14 +314,11 @@ class BetaTester:
             state=attrs.get("state"),
             invite_type=attrs.get("inviteType"),
             beta_group_ids=[g["id"] for g in groups],
-            beta_group_names=[
-                included_map.get(g["id"], {}).get("attributes", {}).get("name", g["id"])
-                for g in groups
-            ],
+            beta_group_names=[index.attribute(g, "name", g["id"]) for g in groups],
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BuildBetaDetail:
     """TestFlight distribution state for one build.
 
@@ -309,7 +344,7 @@ class BuildBetaDetail:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BetaAppReviewSubmission:
     """A build's submission to Apple's beta app review, required before any
     external group can install it. The resource id equals the build id."""
@@ -328,7 +363,7 @@ class BetaAppReviewSubmission:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BetaBuildLocalization:
     """Per-build, per-locale "What to Test" text."""
 
@@ -346,8 +381,8 @@ class BetaBuildLocalization:
         )
 
 
-@dataclass
-class CrashSubmission:
+@dataclass(frozen=True, slots=True)
+class CrashSubmission(_CompoundDocumentModel):
     id: str
     created_date: Optional[str]
     comment: Optional[str]
@@ -362,17 +397,11 @@ class CrashSubmission:
     build_number: Optional[str]
 
     @classmethod
-    def from_api(cls, data: dict, included: Optional[list] = None) -> "CrashSubmission":
+    def from_api(cls, data: dict, included: Included = None) -> "CrashSubmission":
         attrs = data.get("attributes", {})
-        build_id = None
-        build_number = None
         build_rel = data.get("relationships", {}).get("build", {}).get("data")
-        if build_rel:
-            build_id = build_rel.get("id")
-            included_map = {inc["id"]: inc for inc in (included or [])}
-            build_obj = included_map.get(build_id)
-            if build_obj:
-                build_number = build_obj.get("attributes", {}).get("version")
+        build_id = build_rel.get("id") if build_rel else None
+        build_number = IncludedIndex.of(included).attribute(build_rel, "version")
         return cls(
             id=data["id"],
             created_date=attrs.get("createdDate"),
@@ -389,7 +418,7 @@ class CrashSubmission:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppStoreVersionLocalization:
     id: str
     locale: str
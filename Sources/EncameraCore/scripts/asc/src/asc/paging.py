@@ -0,0 +1,104 @@
+"""Page sizes for App Store Connect list endpoints.
+
+Without a ``limit`` Apple pages at its default of 20–50 resources, so a full
+listing costs several times the round trips it needs to. The client fills
+``limit`` in on every paginated read that doesn't set one, using the largest
+size the endpoint accepts — 200 on almost every collection, more on the few
+listed in :data:`MAX_PAGE_SIZES`. A caller's own ``limit`` is left alone.
+
+If Apple rejects a size with a 400 on ``limit`` (the documented maximums do
+drift), the client retries that page at :data:`DEFAULT_PAGE_SIZE` — or, if
+that was the size refused, with no ``limit`` at all — and remembers the
+fallback for the endpoint for the rest of the process.
+
+Apple's ``links.next`` carries an opaque ``cursor`` parameter. A caller
+that reads one page at a time (an MCP tool answering "the next 25") keeps
+:func:`next_cursor` of the page, and sends it back as ``cursor`` with the same
+query to continue. Cursors go stale once the listing changes underneath, like
+any offset.
+"""
+
+import re
+import threading
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_PAGE_SIZE = 200
+
+# Listed resource (last path segment) -> documented maximum ``limit``.
+MAX_PAGE_SIZES: dict[str, int] = {
+    # /v1/subscriptions/{id}/pricePoints, /v2/inAppPurchases/{id}/pricePoints:
+    # one row per territory per tier, thousands per product.
+    "pricePoints": 8000,
+}
+# Relationship linkage lists (``/relationships/builds``) are ids only.
+RELATIONSHIP_PAGE_SIZE = 1000
+
+_COLLECTION = re.compile(r"^[a-z][A-Za-z]+$")
+_API_VERSION = re.compile(r"^v\d+$")
+
+# Endpoint key -> fallback size after a rejection (None: send no ``limit``).
+_rejected: dict[str, Optional[int]] = {}
+_rejected_lock = threading.Lock()
+
+
+def endpoint_key(path: str) -> str:
+    """``path`` with ids replaced by ``*`` — one key per endpoint."""
+    return "/".join(
+        segment if not segment or _API_VERSION.match(segment) or _COLLECTION.match(segment)
+        else "*"
+        for segment in urlsplit(path).path.split("/")
+    )
+
+
+def documented_page_size(path: str) -> int:
+    """The largest ``limit`` Apple documents for ``path``."""
+    segments = endpoint_key(path).split("/")
+    if len(segments) >= 2 and segments[-2] == "relationships":
+        return RELATIONSHIP_PAGE_SIZE
+    return MAX_PAGE_SIZES.get(segments[-1], DEFAULT_PAGE_SIZE)
+
+
+def max_page_size(path: str) -> Optional[int]:
+    """The page size to request: the documented one, unless Apple refused it
+    earlier in this process."""
+    key = endpoint_key(path)
+    with _rejected_lock:
+        if key in _rejected:
+            return _rejected[key]
+    return documented_page_size(path)
+
+
+def with_page_size(
+    path: str, params: Optional[dict[str, Any]], max_items: Optional[int] = None
+) -> Optional[dict[str, Any]]:
+    """``params`` with ``limit`` filled in, if the caller didn't set one.
+
+    With ``max_items`` the first page is no bigger than what will be used.
+    """
+    if params and "limit" in params:
+        return params
+    size = max_page_size(path)
+    if size is None:
+        return params
+    if max_items is not None:
+        size = max(1, min(size, max_items))
+    return {**(params or {}), "limit": size}
+
+
+def reject_page_size(path: str, size: int) -> Optional[int]:
+    """Record that ``path`` refused ``size``; returns the size to retry with,
+    or None to retry without ``limit``."""
+    fallback = DEFAULT_PAGE_SIZE if size > DEFAULT_PAGE_SIZE else None
+    with _rejected_lock:
+        _rejected[endpoint_key(path)] = fallback
+    return fallback
+
+
+def next_cursor(body: dict[str, Any]) -> Optional[str]:
+    """The ``cursor`` of the page after ``body``, or None on the last page."""
+    url = body.get("links", {}).get("next")
+    if not url:
+        return None
+    values = parse_qs(urlsplit(url).query).get("cursor")
+    return values[0] if values else None
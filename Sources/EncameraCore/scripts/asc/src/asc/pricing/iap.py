@@ -4,23 +4,35 @@ from typing import Optional
 
 from asc.client import ASCClient
 from asc.models import IAPPrice, InAppPurchase, PricePoint
+from asc.table import ModelTable
+
+_IAP_FIELDS = "name,productId,inAppPurchaseType,state"
+_PRICE_POINT_FIELDS = "customerPrice,proceeds,territory"
 
 
 def list_in_app_purchases(client: ASCClient, app_id: str) -> list[InAppPurchase]:
-    items = client.get_all(f"/v1/apps/{app_id}/inAppPurchasesV2")
+    items = client.get_all(
+        f"/v1/apps/{app_id}/inAppPurchasesV2", params={"fields[inAppPurchases]": _IAP_FIELDS}
+    )
     return [InAppPurchase.from_api(item) for item in items]
 
 
 def get_iap_price_points(
     client: ASCClient, iap_id: str, territory: Optional[str] = None
-) -> list[PricePoint]:
-    params = {"include": "territory"}
+) -> ModelTable[PricePoint]:
+    """Several thousand rows without a territory filter — see
+    ``get_subscription_price_points``."""
+    params = {
+        "include": "territory",
+        "fields[inAppPurchasePricePoints]": _PRICE_POINT_FIELDS,
+        "fields[territories]": "currency",
+    }
     if territory:
         params["filter[territory]"] = territory
     result = client.get_all_paginated_with_includes(
         f"/v2/inAppPurchases/{iap_id}/pricePoints", params=params
     )
-    return [PricePoint.from_api(item, result["included"]) for item in result["data"]]
+    return ModelTable.from_api(PricePoint, result["data"], result["included"])
 
 
 def get_iap_price_schedule(
@@ -40,9 +52,7 @@ def get_iap_price_schedule(
             f"/v1/inAppPurchasePriceSchedules/{iap_id}/{price_type}",
             params=params,
         )
-        prices.extend(
-            IAPPrice.from_api(item, result["included"]) for item in result["data"]
-        )
+        prices.extend(IAPPrice.from_api_many(result["data"], result["included"]))
     return prices
 
 
@@ -4,15 +4,25 @@ from typing import Optional
 
 from asc.client import ASCClient
 from asc.models import PricePoint, Subscription, SubscriptionGroup, SubscriptionPrice
+from asc.table import ModelTable
+
+_SUBSCRIPTION_FIELDS = "name,productId,state,group"
+_PRICE_POINT_FIELDS = "customerPrice,proceeds,territory"
 
 
 def list_subscription_groups(client: ASCClient, app_id: str) -> list[SubscriptionGroup]:
-    items = client.get_all(f"/v1/apps/{app_id}/subscriptionGroups")
+    items = client.get_all(
+        f"/v1/apps/{app_id}/subscriptionGroups",
+        params={"fields[subscriptionGroups]": "referenceName"},
+    )
     return [SubscriptionGroup.from_api(item) for item in items]
 
 
 def list_subscriptions(client: ASCClient, group_id: str) -> list[Subscription]:
-    items = client.get_all(f"/v1/subscriptionGroups/{group_id}/subscriptions")
+    items = client.get_all(
+        f"/v1/subscriptionGroups/{group_id}/subscriptions",
+        params={"fields[subscriptions]": _SUBSCRIPTION_FIELDS},
+    )
     return [Subscription.from_api(item) for item in items]
 
 
@@ -21,19 +31,25 @@ def get_subscription_prices(client: ASCClient, subscription_id: str) -> list[Sub
         f"/v1/subscriptions/{subscription_id}/prices",
         params={"include": "subscriptionPricePoint,territory"},
     )
-    return [SubscriptionPrice.from_api(item, result["included"]) for item in result["data"]]
+    return SubscriptionPrice.from_api_many(result["data"], result["included"])
 
 
 def get_subscription_price_points(
     client: ASCClient, subscription_id: str, territory: Optional[str] = None
-) -> list[PricePoint]:
-    params = {"include": "territory"}
+) -> ModelTable[PricePoint]:
+    """Every price point for every territory runs to several thousand rows,
+    so they come back as a :class:`~asc.table.ModelTable`."""
+    params = {
+        "include": "territory",
+        "fields[subscriptionPricePoints]": _PRICE_POINT_FIELDS,
+        "fields[territories]": "currency",
+    }
     if territory:
         params["filter[territory]"] = territory
     result = client.get_all_paginated_with_includes(
         f"/v1/subscriptions/{subscription_id}/pricePoints", params=params
     )
-    return [PricePoint.from_api(item, result["included"]) for item in result["data"]]
+    return ModelTable.from_api(PricePoint, result["data"], result["included"])
 
 
 def set_subscription_price(
@@ -5,6 +5,10 @@ from typing import Optional
 from asc.client import ASCClient
 from asc.models import AppStoreVersion, AppStoreVersionLocalization, Build
 
+_BUILD_FIELDS = "version,processingState,uploadedDate,expirationDate,minOsVersion"
+_VERSION_LOCALIZATION_FIELDS = (
+    "locale,description,keywords,whatsNew,promotionalText,marketingUrl,supportUrl"
+)
 
 EDITABLE_VERSION_STATES = frozenset({
     "PREPARE_FOR_SUBMISSION",
@@ -26,7 +30,7 @@ def list_app_store_versions(
     result = client.get_all_paginated_with_includes(
         f"/v1/apps/{app_id}/appStoreVersions", params=params
     )
-    return [AppStoreVersion.from_api(item, result["included"]) for item in result["data"]]
+    return AppStoreVersion.from_api_many(result["data"], result["included"])
 
 
 def get_app_store_version(client: ASCClient, version_id: str) -> AppStoreVersion:
@@ -146,10 +150,10 @@ def list_builds(
     app_id: str,
     processing_state: Optional[str] = None,
 ) -> list[Build]:
-    params: dict = {}
+    params: dict = {"fields[builds]": _BUILD_FIELDS}
     if processing_state:
         params["filter[processingState]"] = processing_state
-    items = client.get_all(f"/v1/apps/{app_id}/builds", params=params or None)
+    items = client.get_all(f"/v1/apps/{app_id}/builds", params=params)
     return [Build.from_api(item) for item in items]
 
 
@@ -157,7 +161,8 @@ def get_version_localizations(
     client: ASCClient, version_id: str
 ) -> list[AppStoreVersionLocalization]:
     items = client.get_all(
-        f"/v1/appStoreVersions/{version_id}/appStoreVersionLocalizations"
+        f"/v1/appStoreVersions/{version_id}/appStoreVersionLocalizations",
+        params={"fields[appStoreVersionLocalizations]": _VERSION_LOCALIZATION_FIELDS},
     )
     return [AppStoreVersionLocalization.from_api(item) for item in items]
 
@@ -0,0 +1,161 @@
+"""Columnar container for large model listings.
+
+A list of a few thousand model instances repeats the same handful of values
+— territory codes, currencies, test statuses, class names — once per row, and
+holds every nested JSON blob fully decoded. :class:`ModelTable` stores one
+list per field instead, shares equal values within a column, and keeps
+:func:`asc.models.lazy_field` columns as compact JSON text until they are
+read. Filtering and sorting work on the columns and never build a model.
+
+It behaves like a read-only list of models — ``len``, indexing, slicing and
+iteration all work, with rows built on access — so helpers can return one
+where they used to return a list::
+
+    points = get_iap_price_points(client, iap_id, territory="USA")
+    cheap = points.where("customer_price", lambda p: float(p) < 5).sort_by(
+        "customer_price", key=float
+    )
+    rows = cheap.to_dicts()
+"""
+
+import json
+from dataclasses import fields
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar, Union, overload
+
+from asc.models import LAZY
+
+M = TypeVar("M")
+
+_SHAREABLE = (str, int, float, bool, type(None))
+
+
+class ModelTable(Generic[M]):
+    __slots__ = ("model", "_columns", "_lazy")
+
+    def __init__(self, model: type[M], columns: dict[str, list[Any]]):
+        self.model = model
+        self._columns = columns
+        self._lazy = frozenset(f.name for f in fields(model) if f.metadata.get(LAZY))
+
+    @classmethod
+    def from_models(cls, model: type[M], items: Iterable[M]) -> "ModelTable[M]":
+        names = [f.name for f in fields(model)]
+        lazy = {f.name for f in fields(model) if f.metadata.get(LAZY)}
+        columns: dict[str, list[Any]] = {name: [] for name in names}
+        # Per-column value sharing: one str object per distinct territory or
+        # status rather than one per row. Dropped once the table is built.
+        shared: dict[str, dict[Any, Any]] = {name: {} for name in names}
+        for item in items:
+            for name in names:
+                value = getattr(item, name)
+                if name in lazy and value is not None:
+                    value = json.dumps(value, separators=(",", ":"))
+                if isinstance(value, _SHAREABLE):
+                    value = shared[name].setdefault(value, value)
+                columns[name].append(value)
+        return cls(model, columns)
+
+    @classmethod
+    def from_api(
+        cls, model: type[M], data: Iterable[dict], included: Any = None
+    ) -> "ModelTable[M]":
+        """Decode API resources straight into columns; ``included`` is passed
+        through for models that resolve relationships against it."""
+        if hasattr(model, "from_api_many"):
+            return cls.from_models(model, model.from_api_many(data, included))
+        return cls.from_models(model, (model.from_api(item) for item in data))
+
+    def __len__(self) -> int:
+        return len(next(iter(self._columns.values()), ()))
+
+    def __iter__(self) -> Iterator[M]:
+        return (self.row(i) for i in range(len(self)))
+
+    @overload
+    def __getitem__(self, index: int) -> M: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ModelTable[M]": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[M, "ModelTable[M]"]:
+        if isinstance(index, slice):
+            return self.take(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ModelTable index out of range")
+        return self.row(index)
+
+    def __repr__(self) -> str:
+        return f"ModelTable({self.model.__name__}, rows={len(self)})"
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._columns)
+
+    def _decode(self, name: str, value: Any) -> Any:
+        if name in self._lazy and value is not None:
+            return json.loads(value)
+        return value
+
+    def row(self, index: int) -> M:
+        return self.model(
+            **{name: self._decode(name, column[index]) for name, column in self._columns.items()}
+        )
+
+    def column(self, name: str) -> list[Any]:
+        """All values of one field, decoded."""
+        values = self._columns[name]
+        if name in self._lazy:
+            return [self._decode(name, value) for value in values]
+        return list(values)
+
+    def take(self, indices: Iterable[int]) -> "ModelTable[M]":
+        """A new table with the given rows, in the given order."""
+        indices = list(indices)
+        return type(self)(
+            self.model,
+            {name: [column[i] for i in indices] for name, column in self._columns.items()},
+        )
+
+    def where(self, name: str, predicate: Callable[[Any], bool]) -> "ModelTable[M]":
+        """Rows whose ``name`` value satisfies ``predicate``."""
+        return self.take(
+            i for i, value in enumerate(self._columns[name])
+            if predicate(self._decode(name, value))
+        )
+
+    def filter(self, **equals: Any) -> "ModelTable[M]":
+        """Rows where every given field equals the given value —
+        ``table.filter(territory="USA", status="FAILURE")``."""
+        indices: Iterable[int] = range(len(self))
+        for name, expected in equals.items():
+            column = self._columns[name]
+            indices = [i for i in indices if self._decode(name, column[i]) == expected]
+        return self.take(indices)
+
+    def sort_by(
+        self,
+        name: str,
+        key: Optional[Callable[[Any], Any]] = None,
+        reverse: bool = False,
+    ) -> "ModelTable[M]":
+        """Rows ordered by one field (stable). ``key`` converts the stored
+        value, e.g. ``key=float`` for prices, which the API sends as strings."""
+        column = self._columns[name]
+        decode = key or (lambda value: value)
+        order = sorted(
+            range(len(self)),
+            key=lambda i: decode(self._decode(name, column[i])),
+            reverse=reverse,
+        )
+        return self.take(order)
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Rows as dicts, matching ``dataclasses.asdict`` of each model."""
+        names = list(self._columns)
+        columns = [self._columns[name] for name in names]
+        return [
+            {name: self._decode(name, column[i]) for name, column in zip(names, columns)}
+            for i in range(len(self))
+        ]
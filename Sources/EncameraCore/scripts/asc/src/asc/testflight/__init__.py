@@ -5,25 +5,29 @@ Split into submodules; every public name is re-exported here so
 
 | Submodule | Covers |
 |---|---|
-| ``builds`` | listing builds, expiration, beta state, "What to Test", notifications |
+| ``builds`` | listing builds (and per-run ``BuildSnapshot``), expiration, beta state, "What to Test", notifications |
 | ``groups`` | beta groups and the build↔group relationship |
 | ``testers`` | tester lookup/creation, group membership, per-build assignment, invitations |
 | ``review`` | beta app review submissions and the app's review contact details |
 """
 
 from asc.testflight.builds import (
+    BuildSnapshot,
     expire_build,
     find_latest_build,
     get_build,
     get_build_beta_detail,
     get_build_localizations,
+    iter_builds_with_versions,
     list_builds_for_version,
+    list_builds_page,
     list_builds_with_versions,
     notify_testers_of_build,
     set_build_auto_notify,
     set_build_whats_new,
 )
 from asc.testflight.groups import (
+    BetaGroupMembershipIndex,
     add_build_to_beta_groups,
     create_beta_group,
     delete_beta_group,
@@ -51,8 +55,10 @@ from asc.testflight.testers import (
     ensure_tester,
     find_testers_by_email,
     get_beta_tester,
+    list_app_testers,
     list_individual_testers,
     list_testers_in_group,
+    list_testers_page,
     remove_individual_testers_from_build,
     remove_testers_from_groups,
     resend_invitation,
@@ -60,17 +66,21 @@ from asc.testflight.testers import (
 
 __all__ = [
     # builds
+    "BuildSnapshot",
     "expire_build",
     "find_latest_build",
     "get_build",
     "get_build_beta_detail",
     "get_build_localizations",
+    "iter_builds_with_versions",
     "list_builds_for_version",
+    "list_builds_page",
     "list_builds_with_versions",
     "notify_testers_of_build",
     "set_build_auto_notify",
     "set_build_whats_new",
     # groups
+    "BetaGroupMembershipIndex",
     "add_build_to_beta_groups",
     "create_beta_group",
     "delete_beta_group",
@@ -90,8 +100,10 @@ __all__ = [
     "ensure_tester",
     "find_testers_by_email",
     "get_beta_tester",
+    "list_app_testers",
     "list_individual_testers",
     "list_testers_in_group",
+    "list_testers_page",
     "remove_individual_testers_from_build",
     "remove_testers_from_groups",
     "resend_invitation",
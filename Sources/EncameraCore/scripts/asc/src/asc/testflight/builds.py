@@ -1,45 +1,97 @@
 """TestFlight build operations: listing, expiration, beta state, release notes."""
 
-from typing import Any, Optional
+import time
+from typing import Any, Iterator, Optional
 
 from asc.client import ASCClient
 from asc.models import BetaBuildLocalization, BuildBetaDetail
 
+_LOCALIZATION_FIELDS = "locale,whatsNew"
 
-def list_builds_with_versions(
-    client: ASCClient,
-    app_id: str,
-    limit: int = 200,
-) -> list[dict[str, Any]]:
-    """List builds for an app with preReleaseVersion attached.
 
-    Each returned build dict gets an extra ``_app_version`` key set to the
-    marketing version string from the related preReleaseVersion, or ``"?"``
-    when no preReleaseVersion is associated.
-    """
-    params = {
+def _build_list_params(
+    app_id: str,
+    version: Optional[str] = None,
+    processing_state: Optional[str] = None,
+    include_expired: bool = True,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {
         "filter[app]": app_id,
-        "limit": limit,
         "sort": "-uploadedDate",
         # preReleaseVersion must be listed here too — see AGENTS.md "sparse fieldsets gotcha"
         "fields[builds]": "version,uploadedDate,expired,processingState,buildAudienceType,minOsVersion,preReleaseVersion",
         "include": "preReleaseVersion",
         "fields[preReleaseVersions]": "version",
     }
-    result = client.get_all_paginated_with_includes("/v1/builds", params=params)
+    if version:
+        params["filter[preReleaseVersion.version]"] = version
+    if processing_state:
+        params["filter[processingState]"] = processing_state
+    if not include_expired:
+        params["filter[expired]"] = "false"
+    return params
 
-    version_map: dict[str, str] = {}
-    for item in result.get("included", []):
+
+def _with_versions(page: dict[str, Any], version_map: dict[str, str]) -> list[dict[str, Any]]:
+    """The page's builds, each with ``_app_version`` set from ``included``."""
+    for item in page.get("included", []):
         if item.get("type") == "preReleaseVersions":
             version_map[item["id"]] = item.get("attributes", {}).get("version", "?")
-
-    builds = result["data"]
+    builds = page.get("data", [])
     for build in builds:
         rel = build.get("relationships", {}).get("preReleaseVersion", {}).get("data")
         build["_app_version"] = version_map.get(rel["id"], "?") if rel else "?"
     return builds
 
 
+def iter_builds_with_versions(
+    client: ASCClient,
+    app_id: str,
+    limit: int = 200,
+    version: Optional[str] = None,
+    processing_state: Optional[str] = None,
+) -> Iterator[dict[str, Any]]:
+    """Builds for an app, newest upload first, with preReleaseVersion attached.
+
+    Each yielded build dict gets an extra ``_app_version`` key set to the
+    marketing version string from the related preReleaseVersion, or ``"?"``
+    when no preReleaseVersion is associated. ``limit`` is the page size;
+    pages are fetched only as the caller iterates, so stopping early skips
+    the rest of the build history. ``version`` and ``processing_state`` are
+    filtered by Apple, not here.
+    """
+    params = {**_build_list_params(app_id, version, processing_state), "limit": limit}
+    version_map: dict[str, str] = {}
+    for page in client.iter_pages("/v1/builds", params=params):
+        yield from _with_versions(page, version_map)
+
+
+def list_builds_with_versions(
+    client: ASCClient,
+    app_id: str,
+    limit: int = 200,
+) -> list[dict[str, Any]]:
+    """Every build for an app with preReleaseVersion attached — see
+    :func:`iter_builds_with_versions`."""
+    return list(iter_builds_with_versions(client, app_id, limit=limit))
+
+
+def list_builds_page(
+    client: ASCClient,
+    app_id: str,
+    version: Optional[str] = None,
+    processing_state: Optional[str] = None,
+    limit: int = 25,
+    cursor: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """One page of :func:`iter_builds_with_versions` — at most ``limit``
+    builds — and the cursor of the next page (``None`` on the last)."""
+    page, next_cursor = client.get_page(
+        "/v1/builds", _build_list_params(app_id, version, processing_state), limit, cursor
+    )
+    return _with_versions(page, {}), next_cursor
+
+
 def list_builds_for_version(
     client: ASCClient,
     app_id: str,
@@ -50,16 +102,60 @@ def list_builds_for_version(
 
     Optionally further filtered to a specific ``processingState``
     (e.g. ``"VALID"`` for ready-to-attach builds or ``"PROCESSING"`` for builds
-    still being processed by Apple).
+    still being processed by Apple). Both filters go to the API, so only the
+    matching builds are read.
     """
-    builds = list_builds_with_versions(client, app_id)
-    out = [b for b in builds if b.get("_app_version") == version_string]
-    if processing_state:
-        out = [
-            b for b in out
-            if b.get("attributes", {}).get("processingState") == processing_state
-        ]
-    return out
+    return list(iter_builds_with_versions(
+        client, app_id, version=version_string, processing_state=processing_state
+    ))
+
+
+class BuildSnapshot:
+    """One listing of an app's builds, indexed for repeated lookups.
+
+    A release run asks the same questions several times — is there a VALID
+    build for this version, is anything still PROCESSING, what was uploaded
+    last — and each :func:`list_builds_for_version` call is another listing.
+    Fetch once, answer from the indexes, and call :meth:`refresh` only when a
+    step has actually waited on Apple's processing. Builds keep the
+    ``_app_version`` key and newest-first order of
+    :func:`list_builds_with_versions`.
+    """
+
+    def __init__(self, client: ASCClient, app_id: str):
+        self.client = client
+        self.app_id = app_id
+        self.refresh()
+
+    def refresh(self) -> "BuildSnapshot":
+        self.builds = list_builds_with_versions(self.client, self.app_id)
+        self.fetched_at = time.time()
+        self._by_version: dict[str, list[dict[str, Any]]] = {}
+        self._by_version_state: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        for build in self.builds:
+            version = build.get("_app_version")
+            state = build.get("attributes", {}).get("processingState")
+            self._by_version.setdefault(version, []).append(build)
+            self._by_version_state.setdefault((version, state), []).append(build)
+        return self
+
+    def for_version(
+        self, version_string: str, processing_state: Optional[str] = None
+    ) -> list[dict[str, Any]]:
+        """Same result as :func:`list_builds_for_version`, without a request."""
+        if processing_state:
+            return list(self._by_version_state.get((version_string, processing_state), []))
+        return list(self._by_version.get(version_string, []))
+
+    def latest(
+        self, version_string: str, processing_state: Optional[str] = "VALID"
+    ) -> Optional[dict[str, Any]]:
+        """Newest upload for the version (and state), or ``None``."""
+        builds = self.for_version(version_string, processing_state)
+        return builds[0] if builds else None
+
+    def recent(self, count: int) -> list[dict[str, Any]]:
+        return self.builds[:count]
 
 
 def find_latest_build(
@@ -73,19 +169,14 @@ def find_latest_build(
     Defaults to the newest build Apple has finished processing — that's the one
     a tester can actually install. Pass ``processing_state=None`` to include
     builds still in PROCESSING.
+
+    The state and expiry filters go to the API, so this is one request for
+    one build.
     """
-    builds = list_builds_with_versions(client, app_id)
-    if processing_state:
-        builds = [
-            b for b in builds
-            if b.get("attributes", {}).get("processingState") == processing_state
-        ]
-    if not include_expired:
-        builds = [b for b in builds if not b.get("attributes", {}).get("expired")]
-    if not builds:
-        return None
-    # list_builds_with_versions already sorts by -uploadedDate
-    return builds[0]
+    params = _build_list_params(app_id, None, processing_state, include_expired)
+    page, _ = client.get_page("/v1/builds", params, limit=1)
+    builds = _with_versions(page, {})
+    return builds[0] if builds else None
 
 
 def get_build(client: ASCClient, build_id: str) -> dict[str, Any]:
@@ -141,7 +232,10 @@ def get_build_localizations(
     client: ASCClient, build_id: str
 ) -> list[BetaBuildLocalization]:
     """Per-locale "What to Test" text for a build."""
-    items = client.get_all(f"/v1/builds/{build_id}/betaBuildLocalizations")
+    items = client.get_all(
+        f"/v1/builds/{build_id}/betaBuildLocalizations",
+        params={"fields[betaBuildLocalizations]": _LOCALIZATION_FIELDS},
+    )
     return [BetaBuildLocalization.from_api(item) for item in items]
 
 
@@ -4,9 +4,12 @@ Note on direction: Apple allows only CREATE and DELETE on
 ``/v1/builds/{id}/relationships/betaGroups`` — reading it back returns 403
 ``The relationship 'betaGroups' does not allow 'GET_RELATED'``. To find out
 which groups a build is in you have to query from the group side, which is what
-:func:`get_build_beta_groups` does.
+:func:`get_build_beta_groups` does. For more than one build, build a
+:class:`BetaGroupMembershipIndex` once instead — it reads every group's build
+ids in one sweep and answers any number of lookups from memory.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 from asc.client import ASCClient
@@ -17,14 +20,14 @@ _GROUP_FIELDS = "name,isInternalGroup,hasAccessToAllBuilds,publicLinkEnabled,pub
 
 def list_beta_groups(client: ASCClient, app_id: str) -> list[dict[str, Any]]:
     """List all beta (TestFlight build) groups for an app, as raw API dicts."""
-    return client.get_all(f"/v1/apps/{app_id}/betaGroups", params={"limit": 200})
+    return client.get_all(f"/v1/apps/{app_id}/betaGroups")
 
 
 def list_beta_groups_typed(client: ASCClient, app_id: str) -> list[BetaGroup]:
     """Same as :func:`list_beta_groups` but returns :class:`BetaGroup` records."""
     items = client.get_all(
         f"/v1/apps/{app_id}/betaGroups",
-        params={"limit": 200, "fields[betaGroups]": _GROUP_FIELDS},
+        params={"fields[betaGroups]": _GROUP_FIELDS},
     )
     return [BetaGroup.from_api(item) for item in items]
 
@@ -83,9 +86,15 @@ def create_beta_group(
     return BetaGroup.from_api(result["data"])
 
 
-def delete_beta_group(client: ASCClient, group_id: str) -> None:
-    """Delete a beta group."""
+def delete_beta_group(
+    client: ASCClient,
+    group_id: str,
+    index: Optional["BetaGroupMembershipIndex"] = None,
+) -> None:
+    """Delete a beta group, dropping it from ``index`` if one is given."""
     client.delete(f"/v1/betaGroups/{group_id}")
+    if index is not None:
+        index.discard_group(group_id)
 
 
 def list_builds_in_group(
@@ -98,33 +107,93 @@ def list_builds_in_group(
     )
 
 
+class BetaGroupMembershipIndex:
+    """The build↔group map for one app, read in a single sweep.
+
+    One paged ``/v1/betaGroups/{id}/relationships/builds`` listing per group
+    (linkage only — ids, no attributes) fills both directions, after which
+    :meth:`groups_for` and :meth:`groups_for_many` are dictionary lookups.
+    Pass the index to :func:`add_build_to_beta_groups`,
+    :func:`remove_build_from_beta_groups` or :func:`delete_beta_group` and it
+    is updated in place, so a bulk cleanup never re-sweeps.
+
+    With ``max_workers`` above 1 the per-group reads run on that many threads
+    sharing the client, so the sweep costs a few round trips instead of one
+    per group.
+    """
+
+    def __init__(self, client: ASCClient, app_id: str, max_workers: int = 1):
+        self.client = client
+        self.app_id = app_id
+        self.max_workers = max_workers
+        self.refresh()
+
+    def refresh(self) -> "BetaGroupMembershipIndex":
+        self.groups: dict[str, dict[str, Any]] = {
+            g["id"]: g for g in list_beta_groups(self.client, self.app_id)
+        }
+        self._builds_by_group: dict[str, set[str]] = {}
+        self._groups_by_build: dict[str, set[str]] = {}
+
+        def linkage(group_id: str) -> list[dict[str, Any]]:
+            return self.client.get_all(f"/v1/betaGroups/{group_id}/relationships/builds")
+
+        if self.max_workers > 1 and len(self.groups) > 1:
+            with ThreadPoolExecutor(min(self.max_workers, len(self.groups))) as pool:
+                linkages = list(pool.map(linkage, self.groups))
+        else:
+            linkages = [linkage(group_id) for group_id in self.groups]
+        for group_id, items in zip(self.groups, linkages):
+            self._builds_by_group[group_id] = set()
+            self.record_added([item["id"] for item in items], [group_id])
+        return self
+
+    def groups_for(self, build_id: str) -> list[dict[str, Any]]:
+        """Raw beta group dicts the build is attached to."""
+        return [self.groups[gid] for gid in sorted(self._groups_by_build.get(build_id, ()))]
+
+    def groups_for_many(self, build_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+        return {build_id: self.groups_for(build_id) for build_id in build_ids}
+
+    def builds_in(self, group_id: str) -> set[str]:
+        return set(self._builds_by_group.get(group_id, ()))
+
+    def record_added(self, build_ids: list[str], group_ids: list[str]) -> None:
+        for group_id in group_ids:
+            for build_id in build_ids:
+                self._builds_by_group.setdefault(group_id, set()).add(build_id)
+                self._groups_by_build.setdefault(build_id, set()).add(group_id)
+
+    def record_removed(self, build_ids: list[str], group_ids: list[str]) -> None:
+        for group_id in group_ids:
+            for build_id in build_ids:
+                self._builds_by_group.get(group_id, set()).discard(build_id)
+                self._groups_by_build.get(build_id, set()).discard(group_id)
+
+    def discard_group(self, group_id: str) -> None:
+        self.record_removed(list(self._builds_by_group.get(group_id, ())), [group_id])
+        self._builds_by_group.pop(group_id, None)
+        self.groups.pop(group_id, None)
+
+
 def get_build_beta_groups(
-    client: ASCClient, build_id: str, app_id: str
+    client: ASCClient, build_id: str, app_id: str, max_workers: int = 1
 ) -> list[dict[str, Any]]:
     """The beta groups a build is attached to.
 
-    Queried group-by-group because the build→betaGroups relationship is
+    Queried from the group side because the build→betaGroups relationship is
     write-only (see the module docstring). ``app_id`` scopes which groups get
-    checked.
+    checked. Looking up several builds? Use :class:`BetaGroupMembershipIndex`
+    directly and sweep once.
     """
-    matches = []
-    for group in list_beta_groups(client, app_id):
-        builds = client.get_all(
-            "/v1/builds",
-            params={
-                "filter[betaGroups]": group["id"],
-                "filter[app]": app_id,
-                "limit": 200,
-                "fields[builds]": "version",
-            },
-        )
-        if any(b["id"] == build_id for b in builds):
-            matches.append(group)
-    return matches
+    return BetaGroupMembershipIndex(client, app_id, max_workers).groups_for(build_id)
 
 
 def add_build_to_beta_groups(
-    client: ASCClient, build_id: str, group_ids: list[str]
+    client: ASCClient,
+    build_id: str,
+    group_ids: list[str],
+    index: Optional[BetaGroupMembershipIndex] = None,
 ) -> None:
     """Attach a build to the given beta groups, making it available to their testers.
 
@@ -137,13 +206,20 @@ def add_build_to_beta_groups(
         f"/v1/builds/{build_id}/relationships/betaGroups",
         {"data": [{"type": "betaGroups", "id": gid} for gid in group_ids]},
     )
+    if index is not None:
+        index.record_added([build_id], group_ids)
 
 
 def remove_build_from_beta_groups(
-    client: ASCClient, build_id: str, group_ids: list[str]
+    client: ASCClient,
+    build_id: str,
+    group_ids: list[str],
+    index: Optional[BetaGroupMembershipIndex] = None,
 ) -> None:
     """Detach a build from the given beta groups."""
     if not group_ids:
         return
     body = {"data": [{"type": "betaGroups", "id": gid} for gid in group_ids]}
     client.delete(f"/v1/builds/{build_id}/relationships/betaGroups", data=body)
+    if index is not None:
+        index.record_removed([build_id], group_ids)
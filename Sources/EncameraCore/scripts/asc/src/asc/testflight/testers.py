@@ -29,7 +29,7 @@ def _tester_params(include_groups: bool) -> dict[str, Any]:
     ``/builds/{id}/individualTesters``) reject ``include`` outright with a 400,
     so they opt out and come back with empty group lists.
     """
-    params: dict[str, Any] = {"fields[betaTesters]": _TESTER_FIELDS, "limit": 200}
+    params: dict[str, Any] = {"fields[betaTesters]": _TESTER_FIELDS}
     if include_groups:
         params["include"] = "betaGroups"
         params["fields[betaGroups]"] = "name"
@@ -45,7 +45,7 @@ def _list_testers(
     params = _tester_params(include_groups)
     params.update(extra or {})
     result = client.get_all_paginated_with_includes(path, params=params)
-    return [BetaTester.from_api(item, result["included"]) for item in result["data"]]
+    return BetaTester.from_api_many(result["data"], result["included"])
 
 
 def find_testers_by_email(
@@ -65,6 +65,15 @@ def find_testers_by_email(
     return _list_testers(client, "/v1/betaTesters", extra)
 
 
+def list_app_testers(client: ASCClient, app_id: str) -> list[BetaTester]:
+    """Every beta tester on the app, with group membership.
+
+    One ``include=betaGroups`` listing; ``state`` is populated because the
+    query is app-scoped.
+    """
+    return _list_testers(client, "/v1/betaTesters", {"filter[apps]": app_id})
+
+
 def get_beta_tester(client: ASCClient, tester_id: str) -> BetaTester:
     """Read one beta tester by id.
 
@@ -73,7 +82,6 @@ def get_beta_tester(client: ASCClient, tester_id: str) -> BetaTester:
     when you need to know whether someone is INVITED or ACCEPTED.
     """
     params = _tester_params(include_groups=True)
-    params.pop("limit")
     result = client.get(f"/v1/betaTesters/{tester_id}", params=params)
     return BetaTester.from_api(result["data"], result.get("included", []))
 
@@ -93,6 +101,36 @@ def list_testers_in_group(
     )
 
 
+def list_testers_page(
+    client: ASCClient,
+    app_id: str,
+    email: Optional[str] = None,
+    group_id: Optional[str] = None,
+    build_id: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> tuple[list[BetaTester], Optional[str]]:
+    """One page of testers and the cursor of the next page (``None`` on the last).
+
+    Picks the first of ``email`` (on this app), ``group_id`` or ``build_id``
+    (individual testers), else every tester on the app — the same reads as
+    the list functions above, one page at a time.
+    """
+    if email:
+        path, extra, include_groups = (
+            "/v1/betaTesters", {"filter[email]": email, "filter[apps]": app_id}, True
+        )
+    elif group_id:
+        path, extra, include_groups = f"/v1/betaGroups/{group_id}/betaTesters", {}, False
+    elif build_id:
+        path, extra, include_groups = f"/v1/builds/{build_id}/individualTesters", {}, False
+    else:
+        path, extra, include_groups = "/v1/betaTesters", {"filter[apps]": app_id}, True
+    params = {**_tester_params(include_groups), **extra}
+    page, next_cursor = client.get_page(path, params, limit, cursor)
+    return BetaTester.from_api_many(page.get("data", []), page.get("included", [])), next_cursor
+
+
 def create_beta_tester(
     client: ASCClient,
     email: str,
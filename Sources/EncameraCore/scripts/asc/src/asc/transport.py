@@ -0,0 +1,165 @@
+"""Retry, backoff and rate limiting for App Store Connect requests.
+
+ASC enforces a rolling per-key quota (documented as 3600 requests/hour) and
+reports what is left in every response as ``X-Rate-Limit:
+user-hour-lim:3600;user-hour-rem:3412;``. Going over it returns ``429`` —
+sometimes with ``Retry-After``, often without. The API also returns the odd
+``500``/``503`` under load that succeeds when simply retried.
+
+:class:`TokenBucket` paces requests so a bulk job spends the quota at the
+rate it refills, with a burst allowance so short scripts run unthrottled; it
+also drains itself to whatever ``user-hour-rem`` says is actually left, so a
+second process using the same key is accounted for. :class:`RetryPolicy`
+decides what gets retried and how long to wait. One bucket is shared by every
+``ASCClient`` built from the same API key in a process.
+"""
+
+import email.utils
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PATCH", "DELETE"})
+
+_RATE_LIMIT_REMAINING = re.compile(r"user-hour-rem:(\d+)")
+
+
+class ASCAPIError(RuntimeError):
+    """An error response, with Apple's body attached.
+
+    ``body`` is the decoded JSON (``{"errors": [...]}``) when there is one,
+    otherwise the raw text.
+    """
+
+    def __init__(self, status: int, reason: str, url: str, body: Any):
+        super().__init__(f"{status} {reason} for {url}: {body}")
+        self.status = status
+        self.url = url
+        self.body = body
+
+    @property
+    def errors(self) -> list[dict[str, Any]]:
+        return self.body.get("errors", []) if isinstance(self.body, dict) else []
+
+    def rejects_parameter(self, name: str) -> bool:
+        """True for a 400 that Apple pinned on query parameter ``name``."""
+        return self.status == 400 and any(
+            (error.get("source") or {}).get("parameter") == name for error in self.errors
+        )
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``capacity`` tokens, refilled at ``rate`` per
+    second. :meth:`acquire` blocks until a token is available."""
+
+    def __init__(self, rate: float = 1.0, capacity: float = 300):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token now and return how long to wait before using it.
+
+        Tokens can go negative: concurrent callers each get their own slot in
+        the queue, rather than all waking at once when a token frees up.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is usable. Returns the time spent
+        waiting."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def observe_remaining(self, remaining: int) -> None:
+        """Never hold more tokens than the server says are left this hour."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, remaining)
+
+    def pause(self, seconds: float) -> None:
+        """Empty the bucket so the next request waits at least ``seconds`` —
+        used after a ``429`` so every thread backs off, not just the one that
+        was rejected."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+
+_shared_buckets: dict[str, TokenBucket] = {}
+_shared_buckets_lock = threading.Lock()
+
+
+def shared_bucket(key_id: str) -> TokenBucket:
+    """The process-wide bucket for one API key (the quota is per key)."""
+    with _shared_buckets_lock:
+        if key_id not in _shared_buckets:
+            _shared_buckets[key_id] = TokenBucket()
+        return _shared_buckets[key_id]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or an
+    HTTP date), or None if absent or unparseable."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def parse_rate_limit_remaining(value: Optional[str]) -> Optional[int]:
+    match = _RATE_LIMIT_REMAINING.search(value or "")
+    return int(match.group(1)) if match else None
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    ``429`` is retried for every method: the request was rejected before it
+    was processed. ``5xx`` and connection errors are only retried for methods
+    where a repeat can't double-apply — a ``POST`` that creates a resource may
+    have gone through before the error.
+    """
+
+    max_retries: int = 5
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    statuses: frozenset = field(default=RETRY_STATUSES)
+
+    def should_retry(self, method: str, status: Optional[int], attempt: int) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        if status == 429:
+            return True
+        if status is not None and status not in self.statuses:
+            return False
+        # 5xx or no response at all.
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
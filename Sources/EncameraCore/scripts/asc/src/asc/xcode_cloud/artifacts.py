@@ -7,11 +7,16 @@ bundles. Use the download URL (short-lived) to pull them.
 from asc.client import ASCClient
 from asc.xcode_cloud.models import CiArtifact
 
+_ARTIFACT_FIELDS = "fileType,fileName,fileSize,downloadUrl"
+
 
 def list_artifacts_for_action(
     client: ASCClient, build_action_id: str
 ) -> list[CiArtifact]:
-    items = client.get_all(f"/v1/ciBuildActions/{build_action_id}/artifacts")
+    items = client.get_all(
+        f"/v1/ciBuildActions/{build_action_id}/artifacts",
+        params={"fields[ciArtifacts]": _ARTIFACT_FIELDS},
+    )
     return [CiArtifact.from_api(item) for item in items]
 
 
@@ -8,11 +8,20 @@ drill into that action's issues/artifacts/test_results.
 from asc.client import ASCClient
 from asc.xcode_cloud.models import CiBuildAction
 
+# buildRun must be listed for the relationship linkage to come back.
+_ACTION_FIELDS = (
+    "name,actionType,executionProgress,completionStatus,startedDate,"
+    "finishedDate,isRequiredToPass,issueCounts,buildRun"
+)
+
 
 def list_build_actions_for_run(
     client: ASCClient, build_run_id: str
 ) -> list[CiBuildAction]:
-    items = client.get_all(f"/v1/ciBuildRuns/{build_run_id}/actions")
+    items = client.get_all(
+        f"/v1/ciBuildRuns/{build_run_id}/actions",
+        params={"fields[ciBuildActions]": _ACTION_FIELDS},
+    )
     return [CiBuildAction.from_api(item) for item in items]
 
 
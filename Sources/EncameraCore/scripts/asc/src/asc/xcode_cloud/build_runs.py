@@ -9,6 +9,7 @@ from typing import Any, Optional
 
 from asc.client import ASCClient
 from asc.models import Build
+from asc.paging import DEFAULT_PAGE_SIZE
 from asc.xcode_cloud.models import CiBuildRun
 
 
@@ -17,10 +18,17 @@ def list_build_runs_for_workflow(
     workflow_id: str,
     limit: Optional[int] = None,
 ) -> list[CiBuildRun]:
+    """Build runs for a workflow, newest first.
+
+    ``limit`` caps the number of runs returned (and pages are sized to match),
+    so ``limit=20`` costs one request rather than the workflow's whole history.
+    """
     params: dict[str, Any] = {"sort": "-number"}
     if limit:
-        params["limit"] = limit
-    items = client.get_all(f"/v1/ciWorkflows/{workflow_id}/buildRuns", params=params)
+        params["limit"] = min(limit, DEFAULT_PAGE_SIZE)
+    items = client.get_all(
+        f"/v1/ciWorkflows/{workflow_id}/buildRuns", params=params, max_items=limit
+    )
     return [CiBuildRun.from_api(item) for item in items]
 
 
@@ -33,16 +41,36 @@ def list_build_runs_for_product(
 
     /ciProducts/{id}/buildRuns does not accept a sort param (unlike the
     per-workflow endpoint), so results come in the API's default order.
+    ``limit`` caps the number of runs returned.
     """
     params: dict[str, Any] = {}
     if limit:
-        params["limit"] = limit
+        params["limit"] = min(limit, DEFAULT_PAGE_SIZE)
     items = client.get_all(
-        f"/v1/ciProducts/{product_id}/buildRuns", params=params or None
+        f"/v1/ciProducts/{product_id}/buildRuns", params=params or None, max_items=limit
     )
     return [CiBuildRun.from_api(item) for item in items]
 
 
+def list_build_runs_page(
+    client: ASCClient,
+    workflow_id: Optional[str] = None,
+    product_id: Optional[str] = None,
+    limit: int = 25,
+    cursor: Optional[str] = None,
+) -> tuple[list[CiBuildRun], Optional[str]]:
+    """One page of build runs for a workflow (newest first) or a product, and
+    the cursor of the next page (``None`` on the last)."""
+    if workflow_id:
+        path, params = f"/v1/ciWorkflows/{workflow_id}/buildRuns", {"sort": "-number"}
+    elif product_id:
+        path, params = f"/v1/ciProducts/{product_id}/buildRuns", {}
+    else:
+        raise ValueError("Must provide either workflow_id or product_id")
+    page, next_cursor = client.get_page(path, params, limit, cursor)
+    return [CiBuildRun.from_api(item) for item in page.get("data", [])], next_cursor
+
+
 def get_build_run(client: ASCClient, build_run_id: str) -> CiBuildRun:
     result = client.get(f"/v1/ciBuildRuns/{build_run_id}")
     return CiBuildRun.from_api(result["data"])
@@ -7,12 +7,14 @@ macOS/Xcode versions by id.
 from asc.client import ASCClient
 from asc.xcode_cloud.models import CiMacOsVersion, CiXcodeVersion
 
+_ENVIRONMENT_FIELDS = "name,version"
+
 
 def list_macos_versions(client: ASCClient) -> list[CiMacOsVersion]:
-    items = client.get_all("/v1/ciMacOsVersions")
+    items = client.get_all("/v1/ciMacOsVersions", params={"fields[ciMacOsVersions]": _ENVIRONMENT_FIELDS})
     return [CiMacOsVersion.from_api(item) for item in items]
 
 
 def list_xcode_versions(client: ASCClient) -> list[CiXcodeVersion]:
-    items = client.get_all("/v1/ciXcodeVersions")
+    items = client.get_all("/v1/ciXcodeVersions", params={"fields[ciXcodeVersions]": _ENVIRONMENT_FIELDS})
     return [CiXcodeVersion.from_api(item) for item in items]
@@ -7,11 +7,16 @@ attached to a ciBuildAction. This is the "what actually broke" surface.
 from asc.client import ASCClient
 from asc.xcode_cloud.models import CiIssue
 
+_ISSUE_FIELDS = "issueType,message,category,fileSource"
+
 
 def list_issues_for_action(
     client: ASCClient, build_action_id: str
 ) -> list[CiIssue]:
-    items = client.get_all(f"/v1/ciBuildActions/{build_action_id}/issues")
+    items = client.get_all(
+        f"/v1/ciBuildActions/{build_action_id}/issues",
+        params={"fields[ciIssues]": _ISSUE_FIELDS},
+    )
     return [CiIssue.from_api(item) for item in items]
 
 
@@ -4,9 +4,11 @@ Kept separate from asc.models so the top-level models file doesn't balloon
 with CI-specific types. One dataclass per ciResource.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Any, Optional
 
+from asc.models import lazy_field
+
 
 def _rel_id(data: dict, name: str) -> Optional[str]:
     rel = data.get("relationships", {}).get(name, {}).get("data")
@@ -22,7 +24,7 @@ def _rel_ids(data: dict, name: str) -> list[str]:
     return []
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CiProduct:
     id: str
     name: str
@@ -42,7 +44,7 @@ class CiProduct:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CiWorkflow:
     id: str
     name: str
@@ -54,7 +56,7 @@ class CiWorkflow:
     last_modified_date: Optional[str]
     product_id: Optional[str]
     repository_id: Optional[str]
-    raw_attributes: dict[str, Any] = field(default_factory=dict)
+    raw_attributes: dict[str, Any] = lazy_field(default_factory=dict)
 
     @classmethod
     def from_api(cls, data: dict) -> "CiWorkflow":
@@ -74,7 +76,7 @@ class CiWorkflow:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CiBuildRun:
     id: str
     number: Optional[int]
@@ -90,7 +92,7 @@ class CiBuildRun:
     source_commit_author: Optional[str]
     destination_commit_sha: Optional[str]
     is_pull_request_build: bool
-    issue_counts: dict[str, Any]
+    issue_counts: dict[str, Any] = lazy_field()
     workflow_id: Optional[str]
     product_id: Optional[str]
     source_branch_or_tag_id: Optional[str]
@@ -129,7 +131,7 @@ class CiBuildRun:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CiBuildAction:
     id: str
     name: str
@@ -139,7 +141,7 @@ class CiBuildAction:
     started_date: Optional[str]
     finished_date: Optional[str]
     is_required_to_pass: bool
-    issue_counts: dict[str, Any]
+    issue_counts: dict[str, Any] = lazy_field()
     build_run_id: Optional[str]
 
     @classmethod
@@ -159,7 +161,7 @@ class CiBuildAction:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CiIssue:
     id: str
     issue_type: str
@@ -182,7 +184,7 @@ class CiIssue:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CiArtifact:
     id: str
     file_type: str
@@ -202,7 +204,7 @@ class CiArtifact:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CiTestResult:
     id: str
     class_name: str
@@ -211,7 +213,7 @@ class CiTestResult:
     message: Optional[str]
     file_path: Optional[str]
     line_number: Optional[int]
-    destination_test_results: list[dict[str, Any]]
+    destination_test_results: list[dict[str, Any]] = lazy_field()
 
     @classmethod
     def from_api(cls, data: dict) -> "CiTestResult":
@@ -229,7 +231,7 @@ class CiTestResult:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CiMacOsVersion:
     id: str
     name: str
@@ -245,7 +247,7 @@ class CiMacOsVersion:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CiXcodeVersion:
     id: str
     name: str
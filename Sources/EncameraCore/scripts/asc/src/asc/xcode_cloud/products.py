@@ -10,9 +10,14 @@ from typing import Optional
 from asc.client import ASCClient
 from asc.xcode_cloud.models import CiProduct
 
+# app must be listed for the relationship linkage to come back.
+_PRODUCT_FIELDS = "name,productType,createdDate,app"
+
 
 def list_products(client: ASCClient) -> list[CiProduct]:
-    items = client.get_all("/v1/ciProducts", params={"include": "app"})
+    items = client.get_all(
+        "/v1/ciProducts", params={"include": "app", "fields[ciProducts]": _PRODUCT_FIELDS}
+    )
     return [CiProduct.from_api(item) for item in items]
 
 
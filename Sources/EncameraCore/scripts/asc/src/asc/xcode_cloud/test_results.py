@@ -1,18 +1,26 @@
 """ciTestResult operations.
 
 Individual test case results for a ciBuildAction of type TEST. Per-device
-outcomes are in destination_test_results.
+outcomes are in destination_test_results. A large suite has thousands of
+results, so listings come back as a ModelTable — filter on status before
+building rows.
 """
 
 from asc.client import ASCClient
+from asc.table import ModelTable
 from asc.xcode_cloud.models import CiTestResult
 
+_TEST_RESULT_FIELDS = "className,name,status,message,fileSource,destinationTestResults"
+
 
 def list_test_results_for_action(
     client: ASCClient, build_action_id: str
-) -> list[CiTestResult]:
-    items = client.get_all(f"/v1/ciBuildActions/{build_action_id}/testResults")
-    return [CiTestResult.from_api(item) for item in items]
+) -> ModelTable[CiTestResult]:
+    items = client.get_all(
+        f"/v1/ciBuildActions/{build_action_id}/testResults",
+        params={"fields[ciTestResults]": _TEST_RESULT_FIELDS},
+    )
+    return ModelTable.from_api(CiTestResult, items)
 
 
 def get_test_result(client: ASCClient, test_result_id: str) -> CiTestResult:
@@ -0,0 +1,412 @@
+"""Unit tests for the asc library, run against the fake App Store Connect server.
+
+Run with: python3 -m unittest discover -s asc/tests
+
+Every test talks HTTP to an ``asc.fake.FakeASCServer`` on a loopback port, so
+request counts are the server's own and retries, paging and cache hits are
+exercised through ``ASCClient`` exactly as a tool would drive them. The
+synthetic dataset is shrunk to keep setup fast; tests that write to it get a
+server of their own.
+"""
+
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from asc.auth import Credentials
+from asc.cache import ResponseCache
+from asc.client import ASCClient
+from asc.fake import FakeASCServer, synthetic
+from asc.mirror import Mirror, sync
+from asc.models import PricePoint
+from asc.paging import documented_page_size
+from asc.pricing.iap import get_iap_price_points
+from asc.table import ModelTable
+from asc.testflight import BetaGroupMembershipIndex
+from asc.transport import ASCAPIError, RetryPolicy, TokenBucket
+
+APP_ID = "6446000001"
+IAP_ID = "6446100001"
+BUILDS = 300
+GROUPS = 5
+TERRITORIES = 6
+PRICE_TIERS = 8
+
+# Retries without sleeping: the fake answers Retry-After: 0 and 5xx backoff
+# is jittered between 0 and backoff_base.
+NO_WAIT = RetryPolicy(max_retries=3, backoff_base=0)
+
+_KEY = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+    serialization.Encoding.PEM,
+    serialization.PrivateFormat.PKCS8,
+    serialization.NoEncryption(),
+).decode()
+CREDENTIALS = Credentials("TEST", "test-issuer", _KEY, bundle_id="com.example.app", app_id=APP_ID)
+
+
+def make_fixtures():
+    return synthetic(
+        builds=BUILDS,
+        versions=10,
+        groups=GROUPS,
+        builds_per_group=12,
+        testers=20,
+        territories=TERRITORIES,
+        price_tiers=PRICE_TIERS,
+        build_runs=10,
+        crash_submissions=10,
+    )
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault("retry", NO_WAIT)
+    return ASCClient(
+        CREDENTIALS, base_url=server.url, limiter=TokenBucket(rate=1e9, capacity=1e9), **kwargs
+    )
+
+
+def start_server(test, **options):
+    """A fake server over a fresh dataset, stopped when ``test`` ends."""
+    server = FakeASCServer(make_fixtures(), **options).start()
+    test.addCleanup(server.stop)
+    return server
+
+
+BUILD_PARAMS = {"filter[app]": APP_ID, "sort": "-uploadedDate"}
+
+
+class RetryTests(unittest.TestCase):
+    def test_throttled_get_is_retried(self):
+        server = start_server(self, throttle_every=2)
+        client = make_client(server)
+        client.get(f"/v1/apps/{APP_ID}")
+        app = client.get(f"/v1/apps/{APP_ID}")
+        self.assertEqual(app["data"]["id"], APP_ID)
+        self.assertEqual(server.stats["requests"], 3)
+        self.assertEqual(server.stats["throttled"], 1)
+
+    def test_throttled_post_is_retried(self):
+        # A 429 is rejected before it is processed, so even a POST is safe to
+        # repeat.
+        server = start_server(self, throttle_every=2)
+        client = make_client(server)
+        client.get(f"/v1/apps/{APP_ID}")
+        build_id = server.app.fixtures.of_type("builds")[-1]["id"]
+        client.post(
+            "/v1/betaGroups/group-0000/relationships/builds",
+            {"data": [{"type": "builds", "id": build_id}]},
+        )
+        self.assertEqual(server.stats["throttled"], 1)
+        self.assertEqual(server.stats["requests"], 3)
+        group = server.app.fixtures.get("betaGroups", "group-0000")
+        self.assertIn(build_id, [b["id"] for b in group["relationships"]["builds"]["data"]])
+
+    def test_get_is_retried_on_server_error(self):
+        server = start_server(self, fail_every=2)
+        client = make_client(server)
+        client.get(f"/v1/apps/{APP_ID}")
+        client.get(f"/v1/apps/{APP_ID}")
+        self.assertEqual(server.stats["requests"], 3)
+        self.assertEqual(server.stats["failed"], 1)
+
+    def test_post_is_not_retried_on_server_error(self):
+        # The create may have gone through before the 503; repeating it could
+        # apply it twice.
+        server = start_server(self, fail_every=1)
+        client = make_client(server)
+        with self.assertRaises(ASCAPIError) as caught:
+            client.post(
+                "/v1/betaGroups",
+                {"data": {"type": "betaGroups", "attributes": {"name": "New"}}},
+            )
+        self.assertEqual(caught.exception.status, 503)
+        self.assertEqual(server.stats["requests"], 1)
+
+    def test_retries_stop_at_max_retries(self):
+        server = start_server(self, fail_every=1)
+        client = make_client(server, retry=RetryPolicy(max_retries=2, backoff_base=0))
+        with self.assertRaises(ASCAPIError):
+            client.get(f"/v1/apps/{APP_ID}")
+        self.assertEqual(server.stats["requests"], 3)
+
+
+class PagingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeASCServer(make_fixtures()).start()
+        cls.client = make_client(cls.server)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.app.reset_stats()
+
+    def test_max_items_sizes_the_first_page(self):
+        builds = list(self.client.paginate("/v1/builds", BUILD_PARAMS, max_items=10))
+        self.assertEqual(len(builds), 10)
+        self.assertEqual(self.server.stats["requests"], 1)
+
+    def test_max_items_reads_only_the_pages_it_needs(self):
+        page = documented_page_size("/v1/builds")
+        builds = list(self.client.paginate("/v1/builds", BUILD_PARAMS, max_items=page + 1))
+        self.assertEqual(len(builds), page + 1)
+        self.assertEqual(self.server.stats["requests"], 2)
+
+    def test_explicit_limit_is_the_page_size_not_a_cap(self):
+        params = {**BUILD_PARAMS, "limit": 20}
+        builds = list(self.client.paginate("/v1/builds", params, max_items=50))
+        self.assertEqual(len(builds), 50)
+        self.assertEqual(self.server.stats["requests"], 3)
+
+    def test_max_pages(self):
+        params = {**BUILD_PARAMS, "limit": 20}
+        builds = self.client.get_all("/v1/builds", params, max_pages=2)
+        self.assertEqual(len(builds), 40)
+        self.assertEqual(self.server.stats["requests"], 2)
+
+    def test_unbounded_listing_reads_every_page(self):
+        builds = self.client.get_all("/v1/builds", BUILD_PARAMS)
+        self.assertEqual(len(builds), BUILDS)
+        page = documented_page_size("/v1/builds")
+        self.assertEqual(self.server.stats["requests"], -(-BUILDS // page))
+
+    def test_breaking_out_stops_paging(self):
+        params = {**BUILD_PARAMS, "limit": 20}
+        for _ in self.client.paginate("/v1/builds", params):
+            break
+        self.assertEqual(self.server.stats["requests"], 1)
+
+    def test_stop_ends_at_the_first_match(self):
+        params = {**BUILD_PARAMS, "limit": 20}
+        stop_at = self.server.app.fixtures.of_type("builds")[30]["id"]
+        builds = list(self.client.paginate("/v1/builds", params, stop=lambda b: b["id"] == stop_at))
+        self.assertEqual(len(builds), 30)
+        self.assertEqual(self.server.stats["requests"], 2)
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.server = start_server(self)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = ResponseCache(f"{tmp.name}/cache.sqlite")
+        self.addCleanup(self.cache._db.close)
+        self.client = make_client(self.server, cache=self.cache)
+        self.build_id = self.server.app.fixtures.of_type("builds")[0]["id"]
+
+    def read_detail(self):
+        return self.client.get(f"/v1/builds/{self.build_id}/buildBetaDetail")
+
+    def read_groups(self):
+        return self.client.get_all("/v1/betaGroups", {"filter[app]": APP_ID})
+
+    def test_repeat_reads_are_served_from_the_cache(self):
+        self.read_detail()
+        self.read_groups()
+        requests = self.server.stats["requests"]
+        self.read_detail()
+        self.read_groups()
+        self.assertEqual(self.server.stats["requests"], requests)
+
+    def test_invalidate_drops_only_entries_sharing_a_tag(self):
+        self.read_detail()
+        self.read_groups()
+        requests = self.server.stats["requests"]
+        removed = self.cache.invalidate(f"/v1/buildBetaDetails/{self.build_id}")
+        self.assertEqual(removed, 1)
+        self.read_groups()
+        self.assertEqual(self.server.stats["requests"], requests)
+        self.read_detail()
+        self.assertEqual(self.server.stats["requests"], requests + 1)
+
+    def test_invalidate_by_relationship_path_drops_both_sides(self):
+        self.read_detail()
+        self.read_groups()
+        removed = self.cache.invalidate("/v1/betaGroups/group-0000/relationships/builds")
+        self.assertEqual(removed, 2)
+
+    def test_patch_through_the_client_invalidates(self):
+        before = self.read_detail()["data"]["attributes"]["autoNotifyEnabled"]
+        self.client.patch(
+            f"/v1/buildBetaDetails/{self.build_id}",
+            {"data": {
+                "type": "buildBetaDetails", "id": self.build_id,
+                "attributes": {"autoNotifyEnabled": not before},
+            }},
+        )
+        after = self.read_detail()["data"]["attributes"]["autoNotifyEnabled"]
+        self.assertEqual(after, not before)
+
+
+class MembershipIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.server = start_server(self)
+        self.fixtures = self.server.app.fixtures
+        self.expected = {}
+        for group in self.fixtures.of_type("betaGroups"):
+            for link in group["relationships"]["builds"]["data"]:
+                self.expected.setdefault(link["id"], set()).add(group["id"])
+
+    def assert_matches_fixtures(self, index):
+        for build in self.fixtures.of_type("builds"):
+            groups = index.groups_for(build["id"])
+            self.assertEqual({g["id"] for g in groups}, self.expected.get(build["id"], set()))
+            self.assertEqual([g["id"] for g in groups], sorted(g["id"] for g in groups))
+
+    def test_groups_for_matches_the_fixture_links(self):
+        index = BetaGroupMembershipIndex(make_client(self.server), APP_ID)
+        self.assert_matches_fixtures(index)
+        # One group listing plus one linkage read per group.
+        self.assertEqual(self.server.stats["requests"], 1 + GROUPS)
+
+    def test_threaded_sweep_builds_the_same_index(self):
+        index = BetaGroupMembershipIndex(make_client(self.server), APP_ID, max_workers=4)
+        self.assert_matches_fixtures(index)
+
+    def test_lookups_make_no_requests(self):
+        index = BetaGroupMembershipIndex(make_client(self.server), APP_ID)
+        requests = self.server.stats["requests"]
+        index.groups_for_many([b["id"] for b in self.fixtures.of_type("builds")])
+        self.assertEqual(self.server.stats["requests"], requests)
+
+    def test_record_added_and_removed(self):
+        index = BetaGroupMembershipIndex(make_client(self.server), APP_ID)
+        build_id = self.fixtures.of_type("builds")[-1]["id"]
+        self.assertEqual(index.groups_for(build_id), [])
+        index.record_added([build_id], ["group-0001", "group-0000"])
+        self.assertEqual([g["id"] for g in index.groups_for(build_id)], ["group-0000", "group-0001"])
+        self.assertIn(build_id, index.builds_in("group-0001"))
+        index.record_removed([build_id], ["group-0000"])
+        self.assertEqual([g["id"] for g in index.groups_for(build_id)], ["group-0001"])
+
+
+class ModelTableTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with FakeASCServer(make_fixtures()) as server:
+            cls.table = get_iap_price_points(make_client(server), IAP_ID)
+        cls.models = list(cls.table)
+
+    def test_rows_match_the_models(self):
+        self.assertEqual(len(self.table), TERRITORIES * PRICE_TIERS)
+        self.assertIsInstance(self.models[0], PricePoint)
+        rebuilt = ModelTable.from_models(PricePoint, self.models)
+        self.assertEqual(list(rebuilt), self.models)
+
+    def test_where(self):
+        cheap = self.table.where("customer_price", lambda price: float(price) < 2.5)
+        self.assertEqual(list(cheap), [m for m in self.models if float(m.customer_price) < 2.5])
+        self.assertEqual(len(cheap), 2 * TERRITORIES)
+
+    def test_filter(self):
+        usa = self.table.filter(territory="USA")
+        self.assertEqual(len(usa), PRICE_TIERS)
+        self.assertEqual({m.currency for m in usa}, {"USD"})
+
+    def test_sort_by_is_stable(self):
+        ordered = self.table.sort_by("customer_price", key=float, reverse=True)
+        self.assertEqual(
+            list(ordered),
+            sorted(self.models, key=lambda m: float(m.customer_price), reverse=True),
+        )
+
+    def test_slicing_and_indexing(self):
+        window = self.table[2:7]
+        self.assertIsInstance(window, ModelTable)
+        self.assertEqual(list(window), self.models[2:7])
+        self.assertEqual(list(self.table[::-5]), self.models[::-5])
+        self.assertEqual(self.table[-1], self.models[-1])
+        with self.assertRaises(IndexError):
+            self.table[len(self.table)]
+
+    def test_column_and_to_dicts(self):
+        self.assertEqual(self.table.column("id"), [m.id for m in self.models])
+        self.assertEqual(self.table[:3].to_dicts()[0]["id"], self.models[0].id)
+
+
+class MirrorSyncTests(unittest.TestCase):
+    def setUp(self):
+        self.server = start_server(self)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.mirror = Mirror(f"{tmp.name}/mirror.sqlite")
+        self.addCleanup(self.mirror.close)
+        self.client = make_client(self.server)
+
+    def sync_builds(self, **kwargs):
+        self.server.app.reset_stats()
+        return sync(self.client, self.mirror, APP_ID, resources=["builds"], **kwargs)["builds"]
+
+    def add_builds(self, count):
+        """``count`` builds uploaded after the syncs so far, newest last."""
+        fixtures = self.server.app.fixtures
+        newest = fixtures.of_type("builds")[0]
+        version = fixtures.get(
+            "preReleaseVersions", newest["relationships"]["preReleaseVersion"]["data"]["id"]
+        )
+        now = datetime.now(timezone.utc)
+        for i in range(1, count + 1):
+            build = fixtures.add({
+                "type": "builds", "id": f"new-build-{i:04d}",
+                "attributes": {
+                    **newest["attributes"],
+                    "version": str(BUILDS + i),
+                    "uploadedDate": (now + timedelta(seconds=i)).isoformat(timespec="milliseconds"),
+                },
+            })
+            fixtures.link_one(build, "app", fixtures.get("apps", APP_ID))
+            fixtures.link_one(build, "preReleaseVersion", version)
+
+    def test_second_sync_stops_at_the_first_mirrored_build(self):
+        self.assertEqual(self.sync_builds(), BUILDS)
+        self.assertEqual(len(self.mirror.builds(APP_ID)), BUILDS)
+        self.assertEqual(self.sync_builds(), 0)
+        self.assertEqual(self.server.stats["requests"], 1)
+
+    def test_new_builds_are_picked_up_in_one_request(self):
+        self.sync_builds()
+        self.add_builds(2)
+        self.assertEqual(self.sync_builds(), 2)
+        self.assertEqual(self.server.stats["requests"], 1)
+        self.assertEqual(self.mirror.builds(APP_ID, limit=1)[0]["id"], "new-build-0002")
+
+    def test_full_sync_rereads_everything(self):
+        self.sync_builds()
+        self.assertEqual(self.sync_builds(full=True), BUILDS)
+
+    def interrupt_sync_after_one_page(self):
+        self.server.app.fail_every = 2
+        self.client.retry = RetryPolicy(max_retries=0)
+        try:
+            with self.assertRaises(ASCAPIError):
+                self.sync_builds()
+        finally:
+            self.server.app.fail_every = None
+            self.client.retry = NO_WAIT
+
+    def test_interrupted_first_sync_is_completed_by_the_next(self):
+        self.interrupt_sync_after_one_page()
+        self.assertIsNone(self.mirror.synced_at(APP_ID, "builds"))
+        self.assertEqual(len(self.mirror.builds(APP_ID)), documented_page_size("/v1/builds"))
+        self.sync_builds()
+        self.assertEqual(len(self.mirror.builds(APP_ID)), BUILDS)
+
+    def test_interrupted_sync_leaves_no_gap(self):
+        # The interrupted sync wrote the newest page of new builds; the next
+        # must page on past them rather than stop at the first it has.
+        self.sync_builds()
+        page = documented_page_size("/v1/builds")
+        self.add_builds(page + 50)
+        self.interrupt_sync_after_one_page()
+        self.assertEqual(len(self.mirror.builds(APP_ID)), BUILDS + page)
+        self.sync_builds()
+        self.assertEqual(len(self.mirror.builds(APP_ID)), BUILDS + page + 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
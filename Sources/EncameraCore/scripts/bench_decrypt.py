@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Benchmark decrypt.py
+Builds a synthetic vault with PyNaCl's secretstream push — many small photos,
+a few large videos, v1 and v2 files, and a mix of block sizes — then times
+each decrypt.py mode against it and writes the results to JSON.
+
+Each mode runs in a fresh child process, so peak RSS is per mode and includes
+the pool workers (for the parallel mode, the largest worker). Throughput is
+ciphertext bytes read per second; the best of --repeat runs is kept.
+
+    python3 bench_decrypt.py --preset quick -o bench.json
+    python3 bench_decrypt.py --preset full --work-dir /Volumes/Scratch/bench \\
+        --compare bench-1.4.0.json
+
+A --work-dir keeps the generated vault between runs (it is rebuilt only when
+the vault parameters change); without one a temporary directory is used.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+from nacl.bindings.crypto_secretstream import (
+    crypto_secretstream_xchacha20poly1305_ABYTES,
+    crypto_secretstream_xchacha20poly1305_init_push,
+    crypto_secretstream_xchacha20poly1305_push,
+    crypto_secretstream_xchacha20poly1305_state,
+    crypto_secretstream_xchacha20poly1305_TAG_FINAL,
+    crypto_secretstream_xchacha20poly1305_TAG_MESSAGE,
+)
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+KEY = bytes(range(32))
+
+# Plaintext block sizes the synthetic files cycle through. 20480 is what
+# SecretFileHandler writes today; the others stand in for files written with
+# different settings, and exercise the decryptor's buffer resizing.
+BLOCK_SIZES = (20480, 4096, 65536)
+
+PRESETS = {
+    "quick": {"photos": 200, "photo_kb": 400, "videos": 2, "video_mb": 64},
+    "full": {"photos": 2000, "photo_kb": 3000, "videos": 3, "video_mb": 2048},
+}
+
+MODES = ("sequential", "parallel", "streaming", "verify")
+
+# Plaintext pattern reused for every block: generating fresh random bytes per
+# block would dominate vault build time, and the ciphertext is random anyway.
+_PATTERN = os.urandom(max(BLOCK_SIZES))
+
+
+def write_encrypted(path, size, block, v2=False):
+    """Write ``size`` bytes of plaintext to ``path`` in the app's v1 layout, or
+    v2 with a small JSON metadata section, one block at a time."""
+    with open(path, "wb") as f:
+        if v2:
+            state = crypto_secretstream_xchacha20poly1305_state()
+            header = crypto_secretstream_xchacha20poly1305_init_push(state, KEY)
+            metadata = json.dumps({
+                "originalFilename": os.path.basename(path) + ".HEIC",
+                "originalExtension": "heic",
+            }).encode()
+            encrypted = header + crypto_secretstream_xchacha20poly1305_push(
+                state, metadata, tag=crypto_secretstream_xchacha20poly1305_TAG_FINAL)
+            f.write(struct.pack("<4sHHI", b"ENC2", 2, 0, len(encrypted)))
+            f.write(encrypted)
+
+        state = crypto_secretstream_xchacha20poly1305_state()
+        f.write(crypto_secretstream_xchacha20poly1305_init_push(state, KEY))
+        f.write(struct.pack("<I", block + crypto_secretstream_xchacha20poly1305_ABYTES))
+        f.write(b"\0" * 4)
+        remaining = size
+        while True:
+            chunk = min(block, remaining)
+            remaining -= chunk
+            tag = (crypto_secretstream_xchacha20poly1305_TAG_FINAL if remaining == 0
+                   else crypto_secretstream_xchacha20poly1305_TAG_MESSAGE)
+            f.write(crypto_secretstream_xchacha20poly1305_push(state, _PATTERN[:chunk], tag=tag))
+            if remaining == 0:
+                break
+
+
+def build_vault(vault_dir, spec):
+    """Create the synthetic vault described by ``spec`` unless ``vault_dir``
+    already holds one built from the same spec. Returns its file count and
+    total size."""
+    spec_path = os.path.join(vault_dir, "..", "vault-spec.json")
+    if os.path.exists(spec_path):
+        with open(spec_path) as f:
+            if json.load(f) == spec and os.path.isdir(vault_dir):
+                return _vault_stats(vault_dir)
+    shutil.rmtree(vault_dir, ignore_errors=True)
+
+    photos_dir = os.path.join(vault_dir, "Photos")
+    videos_dir = os.path.join(vault_dir, "Videos")
+    thumbs_dir = os.path.join(vault_dir, "Thumbnails")
+    for d in (photos_dir, videos_dir, thumbs_dir):
+        os.makedirs(d)
+
+    print(f"Building vault in {vault_dir}...", file=sys.stderr)
+    for i in range(spec["photos"]):
+        # Sizes spread between half and one and a half times the nominal size.
+        size = spec["photo_kb"] * 1024 * (50 + (i * 37) % 101) // 100
+        block = BLOCK_SIZES[i % len(BLOCK_SIZES)]
+        write_encrypted(os.path.join(photos_dir, f"P{i:05d}.encimage"), size, block, v2=i % 2 == 0)
+        write_encrypted(os.path.join(thumbs_dir, f"P{i:05d}.encpreview"), 16 * 1024, BLOCK_SIZES[0])
+    for i in range(spec["videos"]):
+        write_encrypted(os.path.join(videos_dir, f"V{i:03d}.encvideo"),
+                        spec["video_mb"] * 1024 * 1024, BLOCK_SIZES[0], v2=i % 2 == 0)
+
+    with open(spec_path, "w") as f:
+        json.dump(spec, f)
+    return _vault_stats(vault_dir)
+
+
+def _vault_stats(vault_dir):
+    files = 0
+    total = 0
+    for root, _, names in os.walk(vault_dir):
+        for name in names:
+            files += 1
+            total += os.path.getsize(os.path.join(root, name))
+    return {"files": files, "bytes": total}
+
+
+def _peak_rss_bytes(who):
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_mode(mode, vault_dir, out_dir, jobs, buffer_size):
+    """Child-process entry point: run one mode and print its timings as JSON."""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import decrypt
+    decrypt.console.quiet = True
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    start = time.perf_counter()
+    if mode == "sequential":
+        decrypt.decrypt_directory(vault_dir, out_dir, KEY, jobs=1, buffer_size=buffer_size)
+    elif mode == "parallel":
+        decrypt.decrypt_directory(vault_dir, out_dir, KEY, jobs=jobs, buffer_size=buffer_size)
+    elif mode == "streaming":
+        decrypt.archive_directory(vault_dir, os.devnull, KEY, buffer_size=buffer_size)
+    elif mode == "verify":
+        decrypt.verify_directory(vault_dir, KEY, jobs=jobs, buffer_size=buffer_size)
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(out_dir, ignore_errors=True)
+
+    json.dump({
+        "seconds": elapsed,
+        "peak_rss_bytes": max(_peak_rss_bytes(resource.RUSAGE_SELF),
+                              _peak_rss_bytes(resource.RUSAGE_CHILDREN)),
+    }, sys.stdout)
+
+
+def measure_mode(mode, vault_dir, out_dir, jobs, buffer_size, repeat, vault):
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-mode", mode,
+             vault_dir, out_dir, str(jobs), str(buffer_size)],
+            check=True, stdout=subprocess.PIPE, text=True,
+        )
+        runs.append(json.loads(result.stdout))
+    best = min(runs, key=lambda r: r["seconds"])
+    return {
+        "mode": mode,
+        "jobs": 1 if mode in ("sequential", "streaming") else jobs,
+        "seconds": round(best["seconds"], 4),
+        "mb_per_s": round(vault["bytes"] / best["seconds"] / 1e6, 2),
+        "files_per_s": round(vault["files"] / best["seconds"], 1),
+        "peak_rss_mb": round(max(r["peak_rss_bytes"] for r in runs) / 1e6, 1),
+    }
+
+
+def measure_startup(repeat):
+    """Median wall time of ``decrypt.py --help``: interpreter start plus imports."""
+    times = []
+    for _ in range(max(repeat, 5)):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, "decrypt.py"), "--help"],
+                       check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times), 4)
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {r["mode"]: r for r in json.load(f)["results"]}
+    for result in results:
+        before = baseline.get(result["mode"])
+        if not before:
+            continue
+        change = (result["mb_per_s"] - before["mb_per_s"]) / before["mb_per_s"] * 100
+        print(f"{result['mode']:<11} {before['mb_per_s']:>9.1f} -> {result['mb_per_s']:>9.1f} MB/s "
+              f"({change:+.1f}%)  RSS {before['peak_rss_mb']} -> {result['peak_rss_mb']} MB")
+
+
+def main():
+    if len(sys.argv) == 7 and sys.argv[1] == "--run-mode":
+        _, _, mode, vault_dir, out_dir, jobs, buffer_size = sys.argv
+        run_mode(mode, vault_dir, out_dir, int(jobs), int(buffer_size))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark decrypt.py on a synthetic vault.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick",
+                        help="Vault size preset (default: quick)")
+    parser.add_argument("--photos", type=int, help="Number of photos (overrides the preset)")
+    parser.add_argument("--photo-kb", type=int, help="Nominal photo size in KiB")
+    parser.add_argument("--videos", type=int, help="Number of videos")
+    parser.add_argument("--video-mb", type=int, help="Video size in MiB")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES),
+                        help="Modes to run (default: all)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Workers for the parallel and verify modes (default: one per CPU)")
+    parser.add_argument("--buffer-size", type=int, default=4096, metavar="KiB",
+                        help="decrypt.py --buffer-size (default: 4096)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per mode; the fastest is reported (default: 3)")
+    parser.add_argument("--work-dir", help="Keep the generated vault here between runs")
+    parser.add_argument("--output", "-o", default="bench-decrypt.json",
+                        help="Results file (default: bench-decrypt.json)")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Print throughput changes against an earlier results file")
+    args = parser.parse_args()
+
+    spec = dict(PRESETS[args.preset])
+    for field in spec:
+        if getattr(args, field) is not None:
+            spec[field] = getattr(args, field)
+
+    temp_dir = None
+    work_dir = args.work_dir
+    if work_dir is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        work_dir = temp_dir.name
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        vault_dir = os.path.join(work_dir, "vault")
+        out_dir = os.path.join(work_dir, "out")
+        start = time.perf_counter()
+        vault = build_vault(vault_dir, spec)
+        print(f"Vault: {vault['files']} files, {vault['bytes'] / 1e6:.1f} MB "
+              f"(ready in {time.perf_counter() - start:.1f}s)", file=sys.stderr)
+
+        results = []
+        for mode in args.modes:
+            result = measure_mode(mode, vault_dir, out_dir, args.jobs,
+                                  args.buffer_size * 1024, args.repeat, vault)
+            print(f"{mode:<11} {result['mb_per_s']:>9.1f} MB/s {result['files_per_s']:>9.1f} files/s "
+                  f"{result['peak_rss_mb']:>7.1f} MB RSS", file=sys.stderr)
+            results.append(result)
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "vault": {**spec, **vault, "block_sizes": list(BLOCK_SIZES)},
+        "buffer_size_kb": args.buffer_size,
+        "startup_seconds": measure_startup(args.repeat),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,65 @@
 #!/usr/bin/env python3
 import argparse
 import base64
+import hashlib
 import json
 import os
 import struct
 import subprocess
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 
 import nacl.encoding
+from nacl._sodium import ffi, lib
 from nacl.bindings.crypto_secretstream import (
+    crypto_secretstream_xchacha20poly1305_ABYTES,
     crypto_secretstream_xchacha20poly1305_init_pull,
-    crypto_secretstream_xchacha20poly1305_pull)
+    crypto_secretstream_xchacha20poly1305_pull,
+    crypto_secretstream_xchacha20poly1305_TAG_FINAL)
 from nacl.exceptions import CryptoError
 from rich.console import Console
-from rich.progress import Progress
+from rich.progress import (BarColumn, DownloadColumn, Progress, TextColumn,
+                           TimeRemainingColumn, TransferSpeedColumn)
 
 HEADER_SIZE = 24
 BLOCK_SIZE_SIZE = 8
 
+# v2 ("ENC2") layout, mirroring EncryptedFileFormat in
+# Models/EncryptedFileMetadata.swift: magic(4) + version(2) + flags(2) +
+# metadataLength(4) + encrypted metadata (its own stream header + one
+# ciphertext message), followed by the v1-compatible content.
+V2_MAGIC = b"ENC2"
+V2_PREFIX = struct.Struct("<4sHHI")
+MAX_METADATA_SIZE = 1024 * 1024
+
+# Ciphertext read per batch. Memory per decrypting process is roughly twice this
+# (one ciphertext buffer, one plaintext buffer) regardless of file size.
+DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Key fingerprint, mirroring KeyFingerprint.swift: a 16-byte BLAKE2b of the key
+# bytes keyed with this domain-separation constant. The app stamps the first 4
+# bytes (little-endian UInt32) into the unused bytes 4-7 of the block-size field
+# (KeyStampSlot.swift); zero means unstamped.
+KEY_FINGERPRINT_DOMAIN = b"encamera.keyfp.1"
+STAMP_SIZE = 4
+
+# Output naming, mirroring MediaType.encryptedFileExtension and
+# MediaType.decryptedFileExtension in Models/Enums.swift.
+DECRYPTED_EXTENSIONS = {"encimage": "jpg", "encvideo": "mov", "encpreview": "jpg"}
+PREVIEW_EXTENSION = "encpreview"
+LAYOUT_FLAT = "flat"
+LAYOUT_MIRROR = "mirror"
+
+MANIFEST_NAME = ".decrypt-manifest.jsonl"
+# Bytes hashed from the start of each source file for the manifest's content
+# hash. The stream header in those bytes is random per encryption, so a file
+# re-encrypted to the same size still hashes differently.
+MANIFEST_HASH_BYTES = 64 * 1024
+
 console = Console()
 
 def fetch_key_from_keychain(keychain_item):
@@ -38,78 +81,1039 @@ def fetch_key_from_keychain(keychain_item):
         console.log(f"[red]Error fetching key from keychain: {e}[/red]")
         raise
 
-def decrypt_file(file_path, output_path, key):
+def _read_v2_prefix(f):
+    """``(format_version, metadata_length)`` for the file at its current
+    position (expected to be 0). v1 files report ``(1, 0)``; the file position
+    is left wherever the read stopped."""
+    prefix = f.read(V2_PREFIX.size)
+    if len(prefix) < V2_PREFIX.size or prefix[:4] != V2_MAGIC:
+        return 1, 0
+    _, version, _flags, metadata_length = V2_PREFIX.unpack(prefix)
+    if version < 2:
+        raise ValueError(f"Unsupported ENC2 version {version}")
+    if metadata_length > MAX_METADATA_SIZE:
+        raise ValueError(f"Invalid metadata size {metadata_length}")
+    return version, metadata_length
+
+
+def content_offset(f):
+    """Byte offset of the v1-compatible content (stream header + block size).
+
+    0 for v1 files. For v2 files it is computed from the fixed prefix alone, so
+    the encrypted metadata is skipped without being read.
+    """
+    f.seek(0)
+    version, metadata_length = _read_v2_prefix(f)
+    if version == 1:
+        return 0
+    return V2_PREFIX.size + metadata_length
+
+
+def key_fingerprint(key):
+    return hashlib.blake2b(key, key=KEY_FINGERPRINT_DOMAIN, digest_size=16).digest()
+
+
+def read_stamp(file_path):
+    """The 4-byte key stamp from the file's block-size field, or None when the
+    slot is zero (unstamped) or the file is too short to have one."""
+    with open(file_path, 'rb') as f:
+        offset = content_offset(f) + HEADER_SIZE + STAMP_SIZE
+        f.seek(offset)
+        stamp = f.read(STAMP_SIZE)
+    if len(stamp) < STAMP_SIZE or stamp == b"\0" * STAMP_SIZE:
+        return None
+    return stamp
+
+
+def _first_block_authenticates(file_path, key):
+    """Trial-decrypt only the first ciphertext block with ``key``."""
+    with open(file_path, 'rb') as f:
+        try:
+            state, block_size = _open_stream(f, key)
+            crypto_secretstream_xchacha20poly1305_pull(state, f.read(block_size))
+        except Exception:
+            return False
+    return True
+
+
+class NoMatchingKeyError(ValueError):
+    pass
+
+
+class KeyRejectedError(ValueError):
+    """The key failed on the first thing it decrypted in a file (the metadata
+    or the first content block), so it may just be the wrong key."""
+
+
+class KeyRing:
+    """Routes each file to its key by the fingerprint stamp in the file.
+
+    Stamped files go straight to the one key whose fingerprint prefix matches,
+    with no trial decryption. Unstamped files, and stamps that match no key or
+    more than one, fall back to trying each candidate on the first block only.
+    With a single key there is nothing to route and no stamp is read.
+
+    As in the app (KeyStampSlot.swift), the stamp is only a hint: a stale or
+    colliding 4-byte stamp can route to the wrong key, which :meth:`decrypting`
+    catches on the first block and corrects by trial decryption.
+    """
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.by_stamp = {}
+        for key in self.keys:
+            self.by_stamp.setdefault(key_fingerprint(key)[:STAMP_SIZE], []).append(key)
+
+    @classmethod
+    def of(cls, key):
+        return key if isinstance(key, cls) else cls([key])
+
+    def key_for(self, file_path):
+        if len(self.keys) == 1:
+            return self.keys[0]
+        candidates = self.by_stamp.get(read_stamp(file_path), [])
+        if len(candidates) == 1:
+            return candidates[0]
+        return self._trial(file_path, candidates + [k for k in self.keys if k not in candidates])
+
+    def _trial(self, file_path, keys):
+        for key in keys:
+            if _first_block_authenticates(file_path, key):
+                return key
+        raise NoMatchingKeyError("None of the supplied keys decrypts this file")
+
+    def decrypting(self, file_path, fn, key=None):
+        """``fn(key)`` with the file's key (``key`` if already routed by
+        :meth:`key_for`). If ``fn`` raises :class:`KeyRejectedError`, the other
+        keys are trial-decrypted and ``fn`` runs again with the one that fits;
+        if none does, the original error stands — the file is corrupt."""
+        key = self.key_for(file_path) if key is None else key
+        try:
+            return fn(key)
+        except KeyRejectedError:
+            other = next((k for k in self.keys
+                          if k != key and _first_block_authenticates(file_path, k)), None)
+            if other is None:
+                raise
+        return fn(other)
+
+
+def read_metadata(file_path, key):
+    """Decrypt just the embedded metadata of a v2 file, or None for v1.
+
+    Reads at most the 12-byte prefix plus the metadata section — the payload is
+    never touched, so this costs the same for a thumbnail and a 4 GB video.
+    ``key`` is key bytes or a :class:`KeyRing`.
+    """
+    with open(file_path, 'rb') as f:
+        _, metadata_length = _read_v2_prefix(f)
+        if metadata_length == 0:
+            return None
+        encrypted = f.read(metadata_length)
+    if len(encrypted) != metadata_length or metadata_length <= HEADER_SIZE:
+        raise ValueError("Truncated metadata section")
+
+    def decrypt_metadata(key):
+        state = nacl.bindings.crypto_secretstream.crypto_secretstream_xchacha20poly1305_state()
+        crypto_secretstream_xchacha20poly1305_init_pull(state, encrypted[:HEADER_SIZE], key)
+        try:
+            plaintext, _ = crypto_secretstream_xchacha20poly1305_pull(state, encrypted[HEADER_SIZE:])
+        except CryptoError as e:
+            raise KeyRejectedError(f"Metadata decryption failed: {e}")
+        return json.loads(plaintext)
+
+    return KeyRing.of(key).decrypting(file_path, decrypt_metadata)
+
+
+def _open_stream(f, key):
+    """Parse the stream header and block-size field at the content offset and
+    return ``(state, block_size)`` ready for pulling ciphertext blocks."""
+    f.seek(content_offset(f))
+
+    # Read header
+    header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError("Invalid header in file")
+
+    # Read block size
+    block_size_info = f.read(BLOCK_SIZE_SIZE)
+    if block_size_info is None or len(block_size_info) < 8:
+        raise ValueError("Invalid block size info in file")
+
+    block_size = struct.unpack("<I", block_size_info[:4])[0]
+    if block_size <= crypto_secretstream_xchacha20poly1305_ABYTES:
+        raise ValueError(f"Invalid block size {block_size}")
+    # Initialize the SecretStream with the key
+    state = nacl.bindings.crypto_secretstream.crypto_secretstream_xchacha20poly1305_state()
+    crypto_secretstream_xchacha20poly1305_init_pull(state, header, key)
+    return state, block_size
+
+
+def _read_full(f, view):
+    """``readinto`` until ``view`` is full or EOF; returns the byte count.
+
+    A short read in the middle of a batch would otherwise be mistaken for the
+    final (short) ciphertext block.
+    """
+    filled = 0
+    while filled < len(view):
+        n = f.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
+
+class StreamDecryptor:
+    """Batched secretstream decryption through two reusable buffers.
+
+    Each batch reads as many whole ciphertext blocks as fit in ``buffer_size``
+    with one ``readinto``, decrypts them in order straight into a preallocated
+    plaintext buffer (libsodium writes into it directly, so no per-block
+    ``bytes`` are created), and flushes the batch with one ``write``. The
+    buffers are kept between files, so a worker allocates them once.
+    """
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._cipher = bytearray()
+        self._plain = bytearray()
+
+    def _buffers(self, block_size):
+        """The cipher and plaintext buffers, and how much of the cipher buffer
+        one batch fills."""
+        blocks = max(1, self.buffer_size // block_size)
+        cipher_size = blocks * block_size
+        plain_size = blocks * (block_size - crypto_secretstream_xchacha20poly1305_ABYTES)
+        # Only grows when a file's block size doesn't fit the current buffers.
+        if len(self._cipher) < cipher_size:
+            self._cipher = bytearray(cipher_size)
+        if len(self._plain) < plain_size:
+            self._plain = bytearray(plain_size)
+        return self._cipher, self._plain, cipher_size
+
+    def decrypt(self, f, output_file, key):
+        """Decrypt the stream in ``f`` (an unbuffered binary file) into
+        ``output_file``, or authenticate it without writing anything when
+        ``output_file`` is None.
+
+        Returns ``(plaintext_bytes, finished)``; ``finished`` is False when the
+        stream ends without a FINAL-tagged block, i.e. the file is truncated.
+        Raises ValueError on an authentication failure or data after FINAL.
+        """
+        state, block_size = _open_stream(f, key)
+        cipher, plain, cipher_size = self._buffers(block_size)
+        # The raw pointers are taken on the bytearrays themselves and released
+        # on the way out. Left to the garbage collector, a pointer kept alive by
+        # a failed decrypt's traceback holds an export on its buffer that the
+        # collector cannot break, and the interpreter crashes.
+        with ffi.from_buffer(cipher) as cipher_ptr, ffi.from_buffer(plain) as plain_ptr, \
+                memoryview(cipher) as cipher_buffer, memoryview(plain) as plain_view:
+            cipher_view = cipher_buffer[:cipher_size]
+            written = 0
+            finished = False
+            while filled := _read_full(f, cipher_view):
+                offset = 0
+                plain_len = 0
+                while offset < filled:
+                    if finished:
+                        raise ValueError(f"Data after the FINAL block at byte {written + plain_len}")
+                    chunk_len = min(block_size, filled - offset)
+                    if chunk_len < crypto_secretstream_xchacha20poly1305_ABYTES:
+                        raise ValueError("Truncated ciphertext block")
+                    rc = lib.crypto_secretstream_xchacha20poly1305_pull(
+                        state.statebuf, plain_ptr + plain_len, ffi.NULL, state.tagbuf,
+                        cipher_ptr + offset, chunk_len, ffi.NULL, 0,
+                    )
+                    if rc != 0:
+                        error = KeyRejectedError if written + plain_len == 0 else ValueError
+                        raise error(f"Decryption failed at byte {written + plain_len}")
+                    finished = state.tagbuf[0] == crypto_secretstream_xchacha20poly1305_TAG_FINAL
+                    offset += chunk_len
+                    plain_len += chunk_len - crypto_secretstream_xchacha20poly1305_ABYTES
+                if output_file is not None:
+                    output_file.write(plain_view[:plain_len])
+                written += plain_len
+            return written, finished
+
+
+def plaintext_size(file_path):
+    """Decrypted payload size, from the block-size field and file length alone.
+
+    Every ciphertext block carries exactly ABYTES of overhead, so this is exact
+    for any well-formed file without decrypting anything — which is what lets
+    a tar header be written before the member's data is produced.
+    """
+    with open(file_path, 'rb') as f:
+        offset = content_offset(f)
+        f.seek(offset + HEADER_SIZE)
+        block_size_info = f.read(BLOCK_SIZE_SIZE)
+        if len(block_size_info) < BLOCK_SIZE_SIZE:
+            raise ValueError("Invalid block size info in file")
+        block_size = struct.unpack("<I", block_size_info[:4])[0]
+        if block_size <= crypto_secretstream_xchacha20poly1305_ABYTES:
+            raise ValueError(f"Invalid block size {block_size}")
+        cipher_len = os.fstat(f.fileno()).st_size - offset - HEADER_SIZE - BLOCK_SIZE_SIZE
+    blocks = -(-cipher_len // block_size)
+    return max(0, cipher_len - blocks * crypto_secretstream_xchacha20poly1305_ABYTES)
+
+
+def _decrypt_to_path(file_path, output_path, key, decryptor=None):
+    """Decrypt one file to ``output_path``. Raises on any failure; never logs,
+    so it is safe to call from a worker process. ``key`` is key bytes or a
+    :class:`KeyRing`.
+
+    Writes to ``<output_path>.part`` and renames on success, so an interrupted
+    run never leaves a truncated file under the final name — nor does a
+    truncated input, which raises once its last block turns out not to be FINAL.
+    """
+    decryptor = decryptor or StreamDecryptor()
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    partial_path = output_path + ".part"
+
+    def decrypt_with(key):
+        # Unbuffered on both ends: StreamDecryptor already batches, so a
+        # buffered file object would only add a second copy of every byte.
+        with open(file_path, 'rb', buffering=0) as f, open(partial_path, 'wb', buffering=0) as output_file:
+            return decryptor.decrypt(f, output_file, key)
+
     try:
-        with open(file_path, 'rb') as f:
-            # Read header
-            header = f.read(HEADER_SIZE)
-            if len(header) < HEADER_SIZE:
-                raise ValueError("Invalid header in file")
-
-            # Read block size
-            block_size_info = f.read(BLOCK_SIZE_SIZE)
-            if block_size_info is None or len(block_size_info) < 8:
-                raise Exception("Invalid block size info in file")
-
-            block_size = struct.unpack("<I", block_size_info[:4])[0]
-            # Initialize the SecretStream with the key
-            state = nacl.bindings.crypto_secretstream.crypto_secretstream_xchacha20poly1305_state()
-            crypto_secretstream_xchacha20poly1305_init_pull(state, header, key)
-
-            with open(output_path, 'wb') as output_file:
-                while chunk := f.read(block_size):
-                    try:
-                        decrypted_data, tag  = crypto_secretstream_xchacha20poly1305_pull(state, chunk)
-                        output_file.write(decrypted_data)
-                    except CryptoError as e:
-                        raise ValueError(f"Decryption failed: {e}")
+        _, finished = KeyRing.of(key).decrypting(file_path, decrypt_with)
+        if not finished:
+            raise ValueError("Stream ends without a FINAL block")
+        os.replace(partial_path, output_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
 
-                        # decrypted_data = box.decrypt(chunk, nonce=header)
-                        output_file.write(decrypted_data)
-                    except CryptoError as e:
-                        raise ValueError(f"Decryption failed: {e}")
 
+def decrypt_file(file_path, output_path, key, decryptor=None):
+    """Decrypt and log one file. Returns True on success."""
+    try:
+        _decrypt_to_path(file_path, output_path, key, decryptor)
         console.log(f"[green]Successfully decrypted: {file_path}[/green]")
+        return True
     except (ValueError, CryptoError) as e:
         console.log(f"[red]Failed to decrypt {file_path}: {e}[/red]")
         raise e
     except Exception as e:
         console.log(f"[red]Unexpected error decrypting {file_path}: {e}[/red]")
+        return False
+
+
+def _content_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(MANIFEST_HASH_BYTES), digest_size=8).hexdigest()
+
+
+class Manifest:
+    """Record of what a previous run already decrypted into ``output_directory``.
+
+    Stored as JSON lines, one entry per decrypted file, appended and flushed as
+    each file completes — an interrupted run keeps everything it finished, and
+    the next run resumes from there. Later lines win; :meth:`compact` rewrites
+    the file with one line per source at the end of a run.
+
+    A file counts as already done when its output still exists and the source
+    has the recorded size and mtime. If only the mtime moved (a copy or restore
+    touched it), the short content hash decides.
+    """
+
+    def __init__(self, output_directory, target_directory):
+        self.path = os.path.join(output_directory, MANIFEST_NAME)
+        self.output_directory = output_directory
+        self.target_directory = target_directory
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from a run killed mid-write.
+                        continue
+                    self.entries[entry["source"]] = entry
+        self._log = None
+
+    def _source_key(self, input_path):
+        return os.path.relpath(input_path, self.target_directory)
+
+    def is_current(self, input_path, output_path):
+        entry = self.entries.get(self._source_key(input_path))
+        if entry is None or not os.path.exists(output_path):
+            return False
+        if entry["output"] != os.path.relpath(output_path, self.output_directory):
+            return False
+        st = os.stat(input_path)
+        if st.st_size != entry["size"]:
+            return False
+        if st.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        return _content_hash(input_path) == entry["hash"]
+
+    def record(self, input_path, output_path):
+        """Mark ``output_path`` done. Only call once :func:`_decrypt_to_path`
+        has returned: it raises on a stream without a FINAL block, and an entry
+        for a truncated output would be skipped as current on every re-run."""
+        st = os.stat(input_path)
+        entry = {
+            "source": self._source_key(input_path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "hash": _content_hash(input_path),
+            "output": os.path.relpath(output_path, self.output_directory),
+        }
+        self.entries[entry["source"]] = entry
+        if self._log is None:
+            self._log = open(self.path, 'a')
+        self._log.write(json.dumps(entry) + "\n")
+        self._log.flush()
+
+    def compact(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+
+
+# Set once per worker process by the pool initializer so the key is sent to
+# each worker a single time instead of being pickled into every task, and the
+# decrypt buffers are allocated once per worker rather than once per file.
+_worker_key = None
+_worker_decryptor = None
+
+
+def _init_worker(key, buffer_size):
+    global _worker_key, _worker_decryptor
+    _worker_key = key
+    _worker_decryptor = StreamDecryptor(buffer_size)
+
+
+def _decrypt_in_worker(input_path, output_path):
+    """Pool task: returns an error string instead of raising, so one bad file
+    doesn't tear down the pool."""
+    try:
+        _decrypt_to_path(input_path, output_path, _worker_key, _worker_decryptor)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def _verify_in_worker(input_path):
+    """Pool task: authenticate every block of one file without writing any
+    plaintext. Returns a report entry; never raises."""
+    entry = {"path": input_path, "size": 0}
+
+    def authenticate(key):
+        with open(input_path, 'rb', buffering=0) as f:
+            return _worker_decryptor.decrypt(f, None, key)
+
+    start = time.perf_counter()
+    try:
+        entry["size"] = os.path.getsize(input_path)
+        plaintext_bytes, finished = KeyRing.of(_worker_key).decrypting(input_path, authenticate)
+        entry["plaintext_bytes"] = plaintext_bytes
+        entry["status"] = "ok" if finished else "truncated"
+        if not finished:
+            entry["error"] = "Stream ends without a FINAL block"
+    except NoMatchingKeyError as e:
+        entry["status"] = "no_key"
+        entry["error"] = str(e)
+    except ValueError as e:
+        entry["status"] = "corrupt"
+        entry["error"] = str(e)
+    except Exception as e:
+        entry["status"] = "error"
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["seconds"] = round(time.perf_counter() - start, 6)
+    return entry
+
 
+def _run_tasks(fn, tasks, key, jobs, buffer_size):
+    """Yield ``(task, result)`` for each argument tuple in ``tasks`` as it
+    completes.
 
-def decrypt_directory(target_directory, output_directory, key):
+    With more than one job the tasks go to a process pool in the order given
+    (callers pass them largest-first); with one job they run inline, through
+    the same per-worker key and buffers.
+    """
+    if jobs <= 1:
+        _init_worker(key, buffer_size)
+        for task in tasks:
+            yield task, fn(*task)
+        return
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(key, buffer_size)
+    ) as pool:
+        futures = {pool.submit(fn, *task): task for task in tasks}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _progress():
+    return Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    )
+
+
+def _safe_filename(name):
+    """``name`` reduced to a plain file name, or None if nothing usable is left.
+    Metadata is decrypted from the vault, but it still must not pick where
+    outside the output directory a file lands."""
+    name = os.path.basename((name or "").replace("\\", "/")).strip()
+    if name in ("", ".", ".."):
+        return None
+    return name
+
+
+def output_name(input_path, key=None):
+    """File name the app would give ``input_path`` once decrypted.
+
+    Mirrors ``MediaType.decryptedFileExtension``: ``.encimage`` and
+    ``.encpreview`` become ``.jpg``, ``.encvideo`` becomes ``.mov``. With a
+    ``key``, a v2 file's embedded ``originalFilename`` (or failing that, its
+    ``originalExtension``) wins. Unknown extensions are left alone.
+    """
+    stem, extension = os.path.splitext(os.path.basename(input_path))
+    extension = extension[1:]
+    if extension not in DECRYPTED_EXTENSIONS:
+        return os.path.basename(input_path)
+    if key is not None and extension != PREVIEW_EXTENSION:
+        try:
+            metadata = read_metadata(input_path, key) or {}
+        except (OSError, ValueError):
+            # Name it from the extension; decrypting it will report the error.
+            metadata = {}
+        original = _safe_filename(metadata.get("originalFilename"))
+        if original:
+            return original
+        original_extension = _safe_filename(metadata.get("originalExtension"))
+        if original_extension:
+            return f"{stem}.{original_extension}"
+    return f"{stem}.{DECRYPTED_EXTENSIONS[extension]}"
+
+
+def _deduplicate(relative_path, taken):
+    """``relative_path``, or ``name (2).ext`` and so on if already ``taken``."""
+    candidate = relative_path
+    stem, extension = os.path.splitext(relative_path)
+    n = 2
+    while candidate.lower() in taken:
+        candidate = f"{stem} ({n}){extension}"
+        n += 1
+    taken.add(candidate.lower())
+    return candidate
+
+
+def collect_files(target_directory, output_directory, layout=LAYOUT_FLAT, key=None,
+                  skip_previews=False):
+    """``(input_path, output_path, size)`` for every file under
+    ``target_directory``, largest first.
+
+    ``layout`` is ``flat`` (every file directly in ``output_directory`` under
+    its vault name) or ``mirror`` (album directories reproduced, names and
+    extensions as the app exports them; see :func:`output_name` — pass ``key``
+    to restore v2 original filenames). Either way two sources never share an
+    output path: later ones get `` (2)``, `` (3)``... suffixes, assigned in
+    sorted source order so a re-run maps every file to the same place.
+
+    Largest-first matters for the parallel mode: a multi-GB video picked up last
+    would otherwise run alone on one core long after every other worker is idle.
+    """
+    input_paths = []
+    for root, dirs, files in os.walk(target_directory):
+        dirs.sort()
+        for file in sorted(files):
+            if skip_previews and file.endswith("." + PREVIEW_EXTENSION):
+                continue
+            input_paths.append(os.path.join(root, file))
+
+    taken = set()
+    files_to_decrypt = []
+    for input_path in input_paths:
+        if layout == LAYOUT_MIRROR:
+            relative_dir = os.path.relpath(os.path.dirname(input_path), target_directory)
+            relative_path = os.path.normpath(
+                os.path.join(relative_dir, output_name(input_path, key)))
+        else:
+            relative_path = os.path.basename(input_path)
+        output_path = os.path.join(output_directory, _deduplicate(relative_path, taken))
+        files_to_decrypt.append((input_path, output_path, os.path.getsize(input_path)))
+    files_to_decrypt.sort(key=lambda item: item[2], reverse=True)
+    return files_to_decrypt
+
+
+def decrypt_directory(target_directory, output_directory, key, jobs=1,
+                      buffer_size=DEFAULT_BUFFER_SIZE, force=False,
+                      layout=LAYOUT_FLAT, skip_previews=False):
+    """Decrypt every file under ``target_directory`` into ``output_directory``,
+    laid out as ``layout`` (see :func:`collect_files`).
+
+    Files the manifest shows as already decrypted and unchanged are skipped
+    unless ``force`` is set.
+    """
     if not os.path.exists(output_directory):
         os.makedirs(output_directory)
 
-    files_to_decrypt = []
-    for root, _, files in os.walk(target_directory):
-        for file in files:
-            input_path = os.path.join(root, file)
-            output_path = os.path.join(output_directory, file)
-            files_to_decrypt.append((input_path, output_path))
-
-    with Progress() as progress:
-        task = progress.add_task("Decrypting files...", total=len(files_to_decrypt))
-
-        for input_path, output_path in files_to_decrypt:
-            console.log(f"[blue]Decrypting: {input_path}[/blue]")
-            decrypt_file(input_path, output_path, key)
+    manifest = Manifest(output_directory, target_directory)
+    files_to_decrypt = collect_files(target_directory, output_directory, layout, key,
+                                     skip_previews)
+    if not force:
+        pending = [f for f in files_to_decrypt if not manifest.is_current(f[0], f[1])]
+        skipped = len(files_to_decrypt) - len(pending)
+        if skipped:
+            console.log(f"[cyan]Skipping {skipped} unchanged file(s) already in {output_directory}[/cyan]")
+        files_to_decrypt = pending
+    total_bytes = sum(size for _, _, size in files_to_decrypt)
+
+    try:
+        if jobs > 1:
+            _decrypt_parallel(files_to_decrypt, total_bytes, key, jobs, buffer_size, manifest)
+            return
+
+        decryptor = StreamDecryptor(buffer_size)
+        with _progress() as progress:
+            task = progress.add_task("Decrypting files...", total=total_bytes)
+
+            for input_path, output_path, size in files_to_decrypt:
+                console.log(f"[blue]Decrypting: {input_path}[/blue]")
+                if decrypt_file(input_path, output_path, key, decryptor):
+                    manifest.record(input_path, output_path)
+                progress.advance(task, size)
+    finally:
+        manifest.compact()
+
+
+def _decrypt_parallel(files_to_decrypt, total_bytes, key, jobs, buffer_size, manifest):
+    """Fan files out to a process pool. Progress is advanced by each file's
+    size as it completes, so the speed column is aggregate throughput across
+    all workers."""
+    failures = []
+    with _progress() as progress:
+        task = progress.add_task(
+            f"Decrypting {len(files_to_decrypt)} files ({jobs} workers)...",
+            total=total_bytes,
+        )
+        sizes = {input_path: size for input_path, _, size in files_to_decrypt}
+        tasks = [(input_path, output_path) for input_path, output_path, _ in files_to_decrypt]
+        for (input_path, output_path), error in _run_tasks(
+            _decrypt_in_worker, tasks, key, jobs, buffer_size
+        ):
+            if error:
+                failures.append(input_path)
+                console.log(f"[red]Failed to decrypt {input_path}: {error}[/red]")
+            else:
+                manifest.record(input_path, output_path)
+            progress.advance(task, sizes[input_path])
+
+    decrypted = len(files_to_decrypt) - len(failures)
+    console.log(f"[cyan]Decrypted {decrypted} of {len(files_to_decrypt)} files[/cyan]")
+    if failures:
+        console.log(f"[red]{len(failures)} file(s) failed[/red]")
+
+
+class _MemberWriter:
+    """Write end of one archive member; refuses to overrun the declared size."""
+
+    def __init__(self, write, size):
+        self._write = write
+        self.size = size
+        self.written = 0
+
+    def write(self, data):
+        if self.written + len(data) > self.size:
+            raise ValueError(f"Member overruns its declared size of {self.size} bytes")
+        self._write(data)
+        self.written += len(data)
+        return len(data)
+
+
+class TarStreamWriter:
+    """Sequential tar writer that accepts each member's data as pushed writes.
+
+    ``tarfile`` only adds members by reading from a file object, which would
+    mean a pipe or a temp file per member. Member sizes are known up front
+    (:func:`plaintext_size`), so the PAX headers can be written directly and the
+    decryptor writes straight into the stream. Nothing is ever seeked, so the
+    output can be a pipe.
+    """
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.offset = 0
+
+    def _write(self, data):
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+    def _zero_fill(self, count):
+        while count:
+            chunk = min(count, DEFAULT_BUFFER_SIZE)
+            self._write(bytes(chunk))
+            count -= chunk
+
+    @contextmanager
+    def member(self, name, size, mtime):
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(mtime)
+        info.mode = 0o644
+        self._write(info.tobuf(format=tarfile.PAX_FORMAT))
+        writer = _MemberWriter(self._write, size)
+        try:
+            yield writer
+        finally:
+            # A member that failed part-way is zero-filled to its declared size
+            # so the members after it stay aligned and the archive stays valid.
+            self._zero_fill(size - writer.written)
+            self._zero_fill(-size % tarfile.BLOCKSIZE)
+
+    def close(self):
+        self._zero_fill(2 * tarfile.BLOCKSIZE)
+        self._zero_fill(-self.offset % tarfile.RECORDSIZE)
+        self.fileobj.flush()
+
+
+ZIP_MIN_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ZIP_MAX_DATE_TIME = (2107, 12, 31, 23, 59, 59)
+
+
+class ZipStreamWriter:
+    """Stored (uncompressed) zip written in one pass.
+
+    Photos and videos are already compressed, so deflate would cost CPU for
+    nothing; ``zipfile`` falls back to data descriptors on a non-seekable
+    output, so this works on a pipe as well.
+    """
+
+    def __init__(self, fileobj):
+        self.zip = zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_STORED,
+                                   allowZip64=True, strict_timestamps=False)
+
+    @contextmanager
+    def member(self, name, size, mtime):
+        # Zip timestamps only cover 1980-2107; clamp as strict_timestamps=False
+        # would for a ZipInfo built from a file.
+        date_time = min(max(time.localtime(mtime)[:6], ZIP_MIN_DATE_TIME), ZIP_MAX_DATE_TIME)
+        info = zipfile.ZipInfo(name, date_time=date_time)
+        info.compress_type = zipfile.ZIP_STORED
+        # Declaring the size lets zipfile pick zip64 headers up front for >4 GB.
+        info.file_size = size
+        with self.zip.open(info, 'w') as member:
+            yield _MemberWriter(member.write, size)
+
+    def close(self):
+        self.zip.close()
+
+
+ARCHIVE_WRITERS = {"tar": TarStreamWriter, "zip": ZipStreamWriter}
+
+
+def archive_format_for(path):
+    """``zip`` for a ``.zip`` path, ``tar`` for anything else (including stdout)."""
+    return "zip" if path.lower().endswith(".zip") else "tar"
+
+
+def archive_directory(target_directory, archive, key, archive_format="tar",
+                      buffer_size=DEFAULT_BUFFER_SIZE, layout=LAYOUT_FLAT,
+                      skip_previews=False):
+    """Decrypt every file under ``target_directory`` into one tar or zip stream.
+
+    ``archive`` is a path, or a binary file object such as
+    ``sys.stdout.buffer``. Plaintext goes from the decrypt buffer straight into
+    the archive — nothing is staged on disk — so a vault can be piped into
+    ``zstd``/``ssh`` in a single sequential pass. Members are named by their
+    path relative to the output root, as :func:`collect_files` lays them out
+    for ``layout``.
+
+    A file that fails to decrypt part-way cannot be taken back out of a
+    stream; it is logged and the run's failure list is returned so the caller
+    can exit non-zero. Returns the list of failed input paths.
+    """
+    files = collect_files(target_directory, "", layout, key, skip_previews)
+    total_bytes = sum(size for _, _, size in files)
+    decryptor = StreamDecryptor(buffer_size)
+    ring = KeyRing.of(key)
+    failures = []
+
+    own_file = isinstance(archive, str)
+    fileobj = open(archive, 'wb') if own_file else archive
+    writer = ARCHIVE_WRITERS[archive_format](fileobj)
+    try:
+        with _progress() as progress:
+            task = progress.add_task(f"Archiving {len(files)} files ({archive_format})...",
+                                     total=total_bytes)
+            for input_path, member_name, size in files:
+                # Everything that can fail before any data is written is done
+                # before the member header, so the file is skipped cleanly.
+                try:
+                    file_key = ring.key_for(input_path)
+                    member_size = plaintext_size(input_path)
+                    mtime = os.path.getmtime(input_path)
+                    f = open(input_path, 'rb', buffering=0)
+                except (OSError, ValueError) as e:
+                    failures.append(input_path)
+                    console.log(f"[red]Skipping {input_path}: {e}[/red]")
+                    progress.advance(task, size)
+                    continue
+                with f, writer.member(member_name, member_size, mtime) as member:
+                    try:
+                        # A rejected key fails before anything reaches the member,
+                        # so retrying with another key starts the member cleanly.
+                        _, finished = ring.decrypting(
+                            input_path, lambda k: decryptor.decrypt(f, member, k), file_key)
+                        if not finished:
+                            raise ValueError("Stream ends without a FINAL block")
+                    except (ValueError, CryptoError) as e:
+                        failures.append(input_path)
+                        console.log(f"[red]Failed to decrypt {input_path} "
+                                    f"(archived incomplete): {e}[/red]")
+                progress.advance(task, size)
+        writer.close()
+    finally:
+        if own_file:
+            fileobj.close()
+    return failures
+
+
+def verify_directory(target_directory, key, jobs=1, buffer_size=DEFAULT_BUFFER_SIZE,
+                     report_path=None):
+    """Authenticate every block of every file under ``target_directory`` and
+    check each stream ends with a FINAL block, writing no plaintext.
+
+    Returns the report dict (also written as JSON to ``report_path`` if given):
+    a ``summary`` with counts and aggregate throughput, and one ``files`` entry
+    per file with ``status`` ok / truncated / corrupt / no_key / error.
+    """
+    files = collect_files(target_directory, target_directory)
+    total_bytes = sum(size for _, _, size in files)
+    entries = []
+    start = time.perf_counter()
+    with _progress() as progress:
+        task = progress.add_task(
+            f"Verifying {len(files)} files ({jobs} workers)...", total=total_bytes
+        )
+        for _, entry in _run_tasks(
+            _verify_in_worker, [(input_path,) for input_path, _, _ in files],
+            key, jobs, buffer_size,
+        ):
+            entry["path"] = os.path.relpath(entry["path"], target_directory)
+            if entry["seconds"]:
+                entry["mb_per_s"] = round(entry["size"] / entry["seconds"] / 1e6, 2)
+            if entry["status"] != "ok":
+                console.log(f"[red]{entry['status'].upper()}: {entry['path']}: {entry['error']}[/red]")
+            entries.append(entry)
+            progress.advance(task, entry["size"])
+    elapsed = time.perf_counter() - start
+
+    counts = {}
+    for entry in entries:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    entries.sort(key=lambda e: e["path"])
+    report = {
+        "summary": {
+            "target_directory": os.path.abspath(target_directory),
+            "files": len(entries),
+            "bytes": total_bytes,
+            "seconds": round(elapsed, 3),
+            "mb_per_s": round(total_bytes / elapsed / 1e6, 2) if elapsed else None,
+            "jobs": jobs,
+            "status_counts": counts,
+        },
+        "files": entries,
+    }
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    ok = counts.get("ok", 0)
+    color = "green" if ok == len(entries) else "red"
+    console.log(
+        f"[{color}]{ok} of {len(entries)} files verified OK "
+        f"({report['summary']['mb_per_s']} MB/s)[/{color}]"
+    )
+    return report
+
+
+def catalog_directory(target_directory, output_directory, key):
+    """Write ``metadata.json`` to ``output_directory`` with the decrypted
+    embedded metadata of every file, without decrypting any payloads.
+
+    v1 files have no embedded metadata and are listed with ``"metadata": null``.
+    """
+    if not os.path.exists(output_directory):
+        os.makedirs(output_directory)
+
+    paths = [
+        os.path.join(root, file)
+        for root, _, files in os.walk(target_directory)
+        for file in files
+    ]
+    entries = []
+    failures = 0
+    with Progress(console=console) as progress:
+        task = progress.add_task("Reading metadata...", total=len(paths))
+        for input_path in paths:
+            entry = {"path": os.path.relpath(input_path, target_directory)}
+            try:
+                metadata = read_metadata(input_path, key)
+                entry["format"] = 1 if metadata is None else 2
+                entry["metadata"] = metadata
+            except (OSError, ValueError) as e:
+                console.log(f"[red]Failed to read metadata from {input_path}: {e}[/red]")
+                entry["error"] = str(e)
+                failures += 1
+            entries.append(entry)
             progress.advance(task)
 
+    catalog_path = os.path.join(output_directory, "metadata.json")
+    with open(catalog_path, 'w') as f:
+        json.dump(entries, f, indent=2)
+    console.log(f"[cyan]Wrote metadata for {len(entries) - failures} of {len(entries)} files to {catalog_path}[/cyan]")
+
+
+def _fetch_keys(keychain_items):
+    keys = []
+    for keychain_item in keychain_items:
+        console.log(f"[cyan]Fetching decryption key from keychain item: {keychain_item}[/cyan]")
+        keys.append(fetch_key_from_keychain(keychain_item))
+    return KeyRing(keys)
+
+
+def _add_key_arguments(parser):
+    parser.add_argument(
+        "--keychain-item", required=True, action="append",
+        help="Keychain item name to fetch a decryption key from. Repeat for vaults "
+             "that mix keys; each file is routed to its key by the fingerprint stamp.",
+    )
+    parser.add_argument(
+        "--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE // 1024, metavar="KiB",
+        help=f"Ciphertext read per batch, in KiB (default: {DEFAULT_BUFFER_SIZE // 1024})",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Use N worker processes (default: 1; 0 = one per CPU)",
+    )
+
 
-def main():
-    parser = argparse.ArgumentParser(description="Decrypt files in a directory.")
+def _jobs(args):
+    return args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+
+def verify_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="decrypt.py verify",
+        description="Authenticate every block of every file and check for truncation, "
+                    "without writing any plaintext.",
+    )
+    parser.add_argument("target_directory", help="Directory containing files to verify")
+    parser.add_argument(
+        "--report", default="verify-report.json",
+        help="Where to write the JSON report (default: verify-report.json)",
+    )
+    _add_key_arguments(parser)
+    args = parser.parse_args(argv)
+
+    key = _fetch_keys(args.keychain_item)
+    console.log(f"[cyan]Verifying directory: {args.target_directory}[/cyan]")
+    report = verify_directory(
+        args.target_directory, key, jobs=_jobs(args),
+        buffer_size=args.buffer_size * 1024, report_path=args.report,
+    )
+    console.log(f"[cyan]Report written to {args.report}[/cyan]")
+    summary = report["summary"]
+    if summary["status_counts"].get("ok", 0) != summary["files"]:
+        sys.exit(1)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["verify"]:
+        verify_main(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Decrypt files in a directory. Run `decrypt.py verify -h` for the "
+                    "integrity scan that writes no plaintext.",
+    )
     parser.add_argument("target_directory", help="Directory containing files to decrypt")
-    parser.add_argument("output_directory", help="Directory to save decrypted files")
-    parser.add_argument("--keychain-item", required=True, help="Keychain item name to fetch the decryption key")
+    parser.add_argument(
+        "output_directory",
+        help="Directory to save decrypted files (the archive path with --archive)",
+    )
+    _add_key_arguments(parser)
+    parser.add_argument(
+        "--metadata-only", action="store_true",
+        help="Only decrypt the embedded v2 metadata headers into OUTPUT_DIRECTORY/metadata.json",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help=f"Decrypt every file even if {MANIFEST_NAME} shows it is already up to date",
+    )
+    parser.add_argument(
+        "--layout", choices=[LAYOUT_FLAT, LAYOUT_MIRROR], default=LAYOUT_FLAT,
+        help="flat: every file in one directory under its vault name (default). "
+             "mirror: keep the album directories and name files as the app exports "
+             "them (.jpg/.mov, v2 original filenames restored)",
+    )
+    parser.add_argument(
+        "--skip-previews", action="store_true",
+        help="Leave out .encpreview thumbnails",
+    )
+    parser.add_argument(
+        "--archive", action="store_true",
+        help="Write one tar or zip stream to OUTPUT_DIRECTORY instead of a directory "
+             "of files; pass - to write it to stdout",
+    )
+    parser.add_argument(
+        "--archive-format", choices=sorted(ARCHIVE_WRITERS),
+        help="Archive format (default: zip for a .zip path, otherwise tar)",
+    )
+
+    args = parser.parse_args(argv)
+
+    to_stdout = args.archive and args.output_directory == "-"
+    if to_stdout:
+        # stdout carries the archive; keep logs and progress out of it.
+        console.file = sys.stderr
 
-    args = parser.parse_args()
+    key = _fetch_keys(args.keychain_item)
+
+    if args.archive:
+        archive_format = args.archive_format or archive_format_for(args.output_directory)
+        archive = sys.stdout.buffer if to_stdout else args.output_directory
+        console.log(f"[cyan]Archiving directory: {args.target_directory}[/cyan]")
+        failures = archive_directory(
+            args.target_directory, archive, key, archive_format=archive_format,
+            buffer_size=args.buffer_size * 1024, layout=args.layout,
+            skip_previews=args.skip_previews,
+        )
+        if failures:
+            console.log(f"[red]{len(failures)} file(s) failed to decrypt[/red]")
+            sys.exit(1)
+        return
 
-    console.log(f"[cyan]Fetching decryption key from keychain item: {args.keychain_item}[/cyan]")
-    key = fetch_key_from_keychain(args.keychain_item)
+    if args.metadata_only:
+        console.log(f"[cyan]Cataloguing metadata for directory: {args.target_directory}[/cyan]")
+        catalog_directory(args.target_directory, args.output_directory, key)
+        return
 
+    jobs = _jobs(args)
     console.log(f"[cyan]Starting decryption for directory: {args.target_directory}[/cyan]")
-    decrypt_directory(args.target_directory, args.output_directory, key)
+    decrypt_directory(
+        args.target_directory, args.output_directory, key,
+        jobs=jobs, buffer_size=args.buffer_size * 1024, force=args.force,
+        layout=args.layout, skip_previews=args.skip_previews,
+    )
 
 
 if __name__ == "__main__":
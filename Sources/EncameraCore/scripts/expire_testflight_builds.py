@@ -11,7 +11,6 @@ Requires the `asc` library: pip install -e scripts/asc
 
 import argparse
 import sys
-import time
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -19,9 +18,9 @@ try:
     from asc.auth import Credentials
     from asc.client import ASCClient
     from asc.testflight import (
+        BetaGroupMembershipIndex,
         delete_beta_group,
         expire_build,
-        get_build_beta_groups,
         list_beta_groups,
         list_builds_with_versions,
         remove_build_from_beta_groups,
@@ -300,6 +299,12 @@ Examples:
         success_count = 0
         error_count = 0
 
+        # One sweep of every group's builds answers the per-build lookups below.
+        membership = None
+        if args.remove_from_groups:
+            print("  Reading build group membership...")
+            membership = BetaGroupMembershipIndex(client, app_id)
+
         for b in builds_to_expire:
             build_id = b["id"]
             label = f"v{b['app_version']} ({b['build_number']})"
@@ -307,13 +312,12 @@ Examples:
             # Remove from build groups first
             if args.remove_from_groups:
                 try:
-                    groups = get_build_beta_groups(client, build_id, app_id)
+                    groups = membership.groups_for(build_id)
                     if groups:
                         group_ids = [g["id"] for g in groups]
                         group_names = [g.get("attributes", {}).get("name", g["id"]) for g in groups]
-                        remove_build_from_beta_groups(client, build_id, group_ids)
+                        remove_build_from_beta_groups(client, build_id, group_ids, index=membership)
                         print(f"  Removed {label} from groups: {', '.join(group_names)}")
-                        time.sleep(0.3)
                 except Exception as e:
                     print(f"  Warning: could not remove {label} from groups: {e}")
 
@@ -330,9 +334,6 @@ Examples:
                 print(f"  Already expired: {label} (group removal only)")
                 success_count += 1
 
-            # Rate limiting
-            time.sleep(0.5)
-
         print(f"\nBuild processing complete: {success_count} succeeded, {error_count} failed")
 
     # Step 2: Delete build groups
@@ -352,8 +353,6 @@ Examples:
                 print(f"  FAILED: {group_name} - {e}")
                 error_count += 1
 
-            time.sleep(0.5)
-
         print(f"\nBuild group deletion complete: {success_count} succeeded, {error_count} failed")
 
     print("\nDone!")
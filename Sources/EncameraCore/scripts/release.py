@@ -70,7 +70,7 @@ try:
         set_build_for_version,
         set_version_release_type,
     )
-    from asc.testflight import list_builds_for_version, list_builds_with_versions
+    from asc.testflight import BuildSnapshot
     from asc.xcode_cloud.build_runs import list_build_runs_for_workflow
 except ImportError:
     print("Missing required package 'asc'. Install with: pip install -e scripts/asc")
@@ -371,7 +371,7 @@ def preflight_strings_in_sync(en_lproj):
     return True
 
 
-def preflight_target_version_matches(client, app_id, version_string, marketing_version):
+def preflight_target_version_matches(builds, version_string, marketing_version):
     """True if the target version is consistent across repo, ASC, and TestFlight.
 
     Three things must agree, or we'd cut a release for the wrong version:
@@ -381,7 +381,8 @@ def preflight_target_version_matches(client, app_id, version_string, marketing_v
          marketing version equals ``version_string`` — i.e. a build we can
          actually attach and submit.
 
-    Prints the specific mismatch and returns False on any disagreement.
+    ``builds`` is the run's :class:`BuildSnapshot`. Prints the specific
+    mismatch and returns False on any disagreement.
     """
     ok = True
 
@@ -398,9 +399,7 @@ def preflight_target_version_matches(client, app_id, version_string, marketing_v
     else:
         print(f"  project.yml marketing_version {marketing_version} matches ASC version")
 
-    valid = list_builds_for_version(
-        client, app_id, version_string, processing_state="VALID"
-    )
+    valid = builds.for_version(version_string, processing_state="VALID")
     if not valid:
         print(
             f"  MISMATCH: no VALID TestFlight build found for v{version_string}. "
@@ -408,7 +407,7 @@ def preflight_target_version_matches(client, app_id, version_string, marketing_v
             "wait for the matching build to finish processing (or upload it)."
         )
         # Surface what IS on TestFlight so the mismatch is obvious.
-        others = list_builds_with_versions(client, app_id, limit=20)
+        others = builds.recent(20)
         seen = []
         for b in others:
             v = b.get("_app_version")
@@ -433,11 +432,10 @@ def preflight_target_version_matches(client, app_id, version_string, marketing_v
     return ok
 
 
-def preflight_no_pending_builds(client, app_id, version_string):
-    """True if no TestFlight builds for ``version_string`` are still PROCESSING."""
-    pending = list_builds_for_version(
-        client, app_id, version_string, processing_state="PROCESSING"
-    )
+def preflight_no_pending_builds(builds, version_string):
+    """True if no TestFlight builds for ``version_string`` are still PROCESSING
+    in the run's :class:`BuildSnapshot`."""
+    pending = builds.for_version(version_string, processing_state="PROCESSING")
     if pending:
         print(f"  {len(pending)} build(s) still PROCESSING for v{version_string}:")
         for b in pending:
@@ -539,12 +537,15 @@ def tag_release(version_string):
 
 
 def select_and_attach_build(
-    client, app_id, version_id, version_string, *,
+    client, builds, version_id, version_string, *,
     current_build_id=None, dry_run=False, interactive=False,
 ):
-    valid = list_builds_for_version(
-        client, app_id, version_string, processing_state="VALID"
-    )
+    valid = builds.for_version(version_string, processing_state="VALID")
+    if not valid:
+        # Only reachable with --skip-preflights: the build may have finished
+        # processing since the snapshot was taken (the Localizer alone can take
+        # minutes), so look once more before giving up.
+        valid = builds.refresh().for_version(version_string, processing_state="VALID")
     if not valid:
         print(f"  No VALID builds for v{version_string} — cannot proceed.")
         sys.exit(1)
@@ -747,15 +748,17 @@ def main():
     )
     print()
 
+    # One build listing for the whole run — every preflight and the attach
+    # step below read from it.
+    builds = BuildSnapshot(client, app_id)
+
     if not args.skip_preflights:
         marketing_version = read_marketing_version()
         print(
             f"[7/9] Target version matches everywhere "
             f"(project.yml {marketing_version or '?'} == ASC {version_string} == a VALID build)?"
         )
-        if not preflight_target_version_matches(
-            client, app_id, version_string, marketing_version
-        ):
+        if not preflight_target_version_matches(builds, version_string, marketing_version):
             print(
                 "  FAIL: the version we're releasing does not line up across "
                 "project.yml, App Store Connect, and TestFlight. Reconcile them "
@@ -766,7 +769,7 @@ def main():
         print()
 
         print(f"[8/9] No PROCESSING TestFlight builds for v{version_string}?")
-        if not preflight_no_pending_builds(client, app_id, version_string):
+        if not preflight_no_pending_builds(builds, version_string):
             print(
                 "  FAIL: there are TestFlight builds still being processed by Apple. "
                 "Wait for them to finish before releasing."
@@ -804,7 +807,7 @@ def main():
             print(f"  1. Run Localizer on {APP_STORE_YML}, then record strings hash")
         print(f"  2. attach latest VALID build (superseding any attached build):")
         select_and_attach_build(
-            client, app_id, version.id, version_string,
+            client, builds, version.id, version_string,
             current_build_id=version.build_id,
             dry_run=True, interactive=args.interactive,
         )
@@ -846,7 +849,7 @@ def main():
 
     print(f"[release 2/6] Selecting and attaching latest VALID build...")
     select_and_attach_build(
-        client, app_id, version.id, version_string,
+        client, builds, version.id, version_string,
         current_build_id=version.build_id, interactive=args.interactive,
     )
     print()
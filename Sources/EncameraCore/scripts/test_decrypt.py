@@ -0,0 +1,467 @@
+"""Unit tests for decrypt.py.
+
+Run with: python3 -m unittest test_decrypt
+
+Fixtures are written with PyNaCl's secretstream push, in the same layout the
+app's SecretFileHandler produces: 24-byte stream header, 8-byte block-size
+field (little-endian UInt32 in bytes 0-3), then one ciphertext block per
+plaintext block with TAG_FINAL on the last.
+"""
+
+import gc
+import hashlib
+import io
+import json
+import os
+import struct
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+import nacl.bindings
+from nacl.bindings.crypto_secretstream import (
+    crypto_secretstream_xchacha20poly1305_ABYTES,
+    crypto_secretstream_xchacha20poly1305_init_push,
+    crypto_secretstream_xchacha20poly1305_push,
+    crypto_secretstream_xchacha20poly1305_state,
+    crypto_secretstream_xchacha20poly1305_TAG_FINAL,
+    crypto_secretstream_xchacha20poly1305_TAG_MESSAGE,
+)
+
+import decrypt
+
+KEY = bytes(range(32))
+OTHER_KEY = bytes(range(32, 64))
+PLAINTEXT_BLOCK = 1024
+
+
+def encrypt_v1(plaintext, key=KEY, block=PLAINTEXT_BLOCK, stamp=b"\0" * 4):
+    state = crypto_secretstream_xchacha20poly1305_state()
+    header = crypto_secretstream_xchacha20poly1305_init_push(state, key)
+    cipher_block = block + crypto_secretstream_xchacha20poly1305_ABYTES
+    out = [header, struct.pack("<I", cipher_block), stamp]
+    chunks = [plaintext[i:i + block] for i in range(0, len(plaintext), block)] or [b""]
+    for i, chunk in enumerate(chunks):
+        tag = (crypto_secretstream_xchacha20poly1305_TAG_FINAL if i == len(chunks) - 1
+               else crypto_secretstream_xchacha20poly1305_TAG_MESSAGE)
+        out.append(crypto_secretstream_xchacha20poly1305_push(state, chunk, tag=tag))
+    return b"".join(out)
+
+
+def encrypt_v2(plaintext, metadata, key=KEY, block=PLAINTEXT_BLOCK, stamp=b"\0" * 4):
+    """ENC2 prefix + encrypted JSON metadata + the v1-compatible content."""
+    state = crypto_secretstream_xchacha20poly1305_state()
+    header = crypto_secretstream_xchacha20poly1305_init_push(state, key)
+    encrypted_metadata = header + crypto_secretstream_xchacha20poly1305_push(
+        state, json.dumps(metadata).encode(),
+        tag=crypto_secretstream_xchacha20poly1305_TAG_FINAL,
+    )
+    prefix = struct.pack("<4sHHI", b"ENC2", 2, 0, len(encrypted_metadata))
+    return prefix + encrypted_metadata + encrypt_v1(plaintext, key, block, stamp)
+
+
+class VaultTestCase(unittest.TestCase):
+    """A small vault of v1 and v2 files under ``self.src``."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.src = os.path.join(self._tmp.name, "vault")
+        self.out = os.path.join(self._tmp.name, "out")
+        os.makedirs(self.src)
+        self.plaintexts = {
+            "small.encimage": os.urandom(100),
+            "multi.encimage": os.urandom(PLAINTEXT_BLOCK * 3 + 17),
+            "big.encvideo": os.urandom(PLAINTEXT_BLOCK * 20),
+            "v2.encimage": os.urandom(PLAINTEXT_BLOCK * 2 + 5),
+        }
+        self.metadata = {"originalFilename": "IMG_0001.HEIC", "originalExtension": "heic"}
+        for name, data in self.plaintexts.items():
+            encrypted = (encrypt_v2(data, self.metadata) if name.startswith("v2")
+                         else encrypt_v1(data))
+            with open(os.path.join(self.src, name), "wb") as f:
+                f.write(encrypted)
+
+
+class DecryptDirectoryTests(VaultTestCase):
+    def assert_outputs_match(self):
+        for name, data in self.plaintexts.items():
+            with open(os.path.join(self.out, name), "rb") as f:
+                self.assertEqual(f.read(), data, name)
+
+    def test_sequential_round_trip(self):
+        decrypt.decrypt_directory(self.src, self.out, KEY)
+        self.assert_outputs_match()
+
+    def test_parallel_round_trip(self):
+        decrypt.decrypt_directory(self.src, self.out, KEY, jobs=2)
+        self.assert_outputs_match()
+
+    def test_small_buffer_spans_many_batches(self):
+        # Buffer smaller than one block still makes progress one block at a time,
+        # and a non-multiple size leaves a partial block at each batch edge.
+        decrypted = []
+        original = decrypt.StreamDecryptor.decrypt
+
+        def spy(self, *args):
+            written, finished = original(self, *args)
+            decrypted.append(written)
+            return written, finished
+
+        decrypt.StreamDecryptor.decrypt = spy
+        self.addCleanup(setattr, decrypt.StreamDecryptor, "decrypt", original)
+        for buffer_size in (100, PLAINTEXT_BLOCK * 3 + 50):
+            decrypted.clear()
+            # force: the manifest would otherwise skip every file the second time.
+            decrypt.decrypt_directory(self.src, self.out, KEY, buffer_size=buffer_size,
+                                      force=True)
+            self.assertEqual(sum(decrypted), sum(map(len, self.plaintexts.values())))
+            self.assert_outputs_match()
+
+    def test_tampered_block_fails(self):
+        path = os.path.join(self.src, "multi.encimage")
+        with open(path, "r+b") as f:
+            f.seek(-40, os.SEEK_END)
+            f.write(b"\xff")
+        with self.assertRaises(ValueError):
+            decrypt._decrypt_to_path(path, os.path.join(self._tmp.name, "x"), KEY)
+
+    def test_failed_decrypt_survives_garbage_collection(self):
+        path = os.path.join(self.src, "multi.encimage")
+        with open(path, "r+b") as f:
+            f.seek(-40, os.SEEK_END)
+            f.write(b"\xff")
+        decryptor = decrypt.StreamDecryptor(buffer_size=100)
+        for _ in range(3):
+            try:
+                decrypt._decrypt_to_path(path, os.path.join(self._tmp.name, "x"), KEY, decryptor)
+            except ValueError as e:
+                # Keep the failure (and its traceback) in a reference cycle,
+                # so only the garbage collector can free what it holds.
+                cycle = [e]
+                cycle.append(cycle)
+            del cycle
+            gc.collect()
+        output = os.path.join(self._tmp.name, "small.jpg")
+        decrypt._decrypt_to_path(os.path.join(self.src, "small.encimage"), output, KEY, decryptor)
+        with open(output, "rb") as f:
+            self.assertEqual(f.read(), self.plaintexts["small.encimage"])
+
+    def test_truncated_stream_fails(self):
+        path = os.path.join(self.src, "multi.encimage")
+        with open(path, "wb") as f:
+            # Two whole MESSAGE blocks: each authenticates, but no FINAL follows.
+            f.write(encrypt_v1(self.plaintexts["multi.encimage"])[:-(
+                17 + crypto_secretstream_xchacha20poly1305_ABYTES
+                + PLAINTEXT_BLOCK + crypto_secretstream_xchacha20poly1305_ABYTES
+            )])
+        output = os.path.join(self._tmp.name, "out.jpg")
+        with self.assertRaisesRegex(ValueError, "FINAL"):
+            decrypt._decrypt_to_path(path, output, KEY)
+        self.assertFalse(os.path.exists(output))
+        self.assertFalse(os.path.exists(output + ".part"))
+
+    def test_rerun_skips_unchanged_files(self):
+        decrypt.decrypt_directory(self.src, self.out, KEY)
+        small_out = os.path.join(self.out, "small.encimage")
+        os.remove(small_out)
+        calls = []
+        original = decrypt._decrypt_to_path
+
+        def spy(file_path, *args):
+            calls.append(os.path.basename(file_path))
+            return original(file_path, *args)
+
+        decrypt._decrypt_to_path = spy
+        self.addCleanup(setattr, decrypt, "_decrypt_to_path", original)
+        decrypt.decrypt_directory(self.src, self.out, KEY)
+        # Only the file whose output went missing is redone.
+        self.assertEqual(calls, ["small.encimage"])
+        self.assert_outputs_match()
+
+        calls.clear()
+        decrypt.decrypt_directory(self.src, self.out, KEY, force=True)
+        self.assertEqual(len(calls), len(self.plaintexts))
+
+    def test_truncated_file_is_not_recorded(self):
+        multi = os.path.join(self.src, "multi.encimage")
+        with open(multi, "r+b") as f:
+            f.truncate(os.path.getsize(multi) - 17 - crypto_secretstream_xchacha20poly1305_ABYTES)
+        multi_out = os.path.join(self.out, "multi.encimage")
+        with self.assertRaises(ValueError):
+            decrypt.decrypt_directory(self.src, self.out, KEY)
+        decrypt.decrypt_directory(self.src, self.out, KEY, jobs=2)
+        self.assertFalse(os.path.exists(multi_out))
+        manifest = decrypt.Manifest(self.out, self.src)
+        self.assertFalse(manifest.is_current(multi, multi_out))
+        self.assertTrue(manifest.is_current(
+            os.path.join(self.src, "small.encimage"), os.path.join(self.out, "small.encimage")
+        ))
+
+    def test_files_are_scheduled_largest_first(self):
+        files = decrypt.collect_files(self.src, self.out)
+        sizes = [size for _, _, size in files]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertTrue(files[0][0].endswith("big.encvideo"))
+
+    def test_metadata_only_catalog(self):
+        decrypt.catalog_directory(self.src, self.out, KEY)
+        with open(os.path.join(self.out, "metadata.json")) as f:
+            entries = {e["path"]: e for e in json.load(f)}
+        self.assertEqual(entries["v2.encimage"]["format"], 2)
+        self.assertEqual(entries["v2.encimage"]["metadata"], self.metadata)
+        self.assertEqual(entries["small.encimage"]["format"], 1)
+        self.assertIsNone(entries["small.encimage"]["metadata"])
+        self.assertFalse(os.path.exists(os.path.join(self.out, "v2.encimage")))
+
+
+class OutputLayoutTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.src = os.path.join(self._tmp.name, "vault")
+        self.out = os.path.join(self._tmp.name, "out")
+        self.files = {
+            "Trip/A1.encimage": encrypt_v1(b"trip photo"),
+            "Trip/V1.encvideo": encrypt_v1(b"trip video"),
+            "Home/A1.encimage": encrypt_v1(b"home photo"),
+            "Home/B2.encimage": encrypt_v2(b"heic", {"originalFilename": "IMG_0001.HEIC"}),
+            "Home/C3.encimage": encrypt_v2(b"clash", {"originalFilename": "../IMG_0001.HEIC"}),
+            "Thumbnails/A1.encpreview": encrypt_v1(b"thumb"),
+        }
+        for name, data in self.files.items():
+            path = os.path.join(self.src, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+
+    def outputs(self):
+        found = {}
+        for root, _, files in os.walk(self.out):
+            for file in files:
+                if file == decrypt.MANIFEST_NAME:
+                    continue
+                path = os.path.join(root, file)
+                with open(path, "rb") as f:
+                    found[os.path.relpath(path, self.out)] = f.read()
+        return found
+
+    def test_mirror_layout_restores_names_without_collisions(self):
+        decrypt.decrypt_directory(self.src, self.out, KEY, layout=decrypt.LAYOUT_MIRROR)
+        self.assertEqual(self.outputs(), {
+            os.path.join("Trip", "A1.jpg"): b"trip photo",
+            os.path.join("Trip", "V1.mov"): b"trip video",
+            os.path.join("Home", "A1.jpg"): b"home photo",
+            os.path.join("Home", "IMG_0001.HEIC"): b"heic",
+            os.path.join("Home", "IMG_0001 (2).HEIC"): b"clash",
+            os.path.join("Thumbnails", "A1.jpg"): b"thumb",
+        })
+
+    def test_flat_layout_keeps_same_named_files_apart(self):
+        decrypt.decrypt_directory(self.src, self.out, KEY, skip_previews=True)
+        outputs = self.outputs()
+        self.assertEqual(len(outputs), len(self.files) - 1)
+        self.assertEqual({outputs["A1.encimage"], outputs["A1 (2).encimage"]},
+                         {b"trip photo", b"home photo"})
+
+    def test_layout_is_stable_across_runs(self):
+        first = decrypt.collect_files(self.src, self.out, decrypt.LAYOUT_MIRROR, KEY)
+        second = decrypt.collect_files(self.src, self.out, decrypt.LAYOUT_MIRROR, KEY)
+        self.assertEqual(first, second)
+
+
+class _Pipe(io.RawIOBase):
+    """Write-only, non-seekable sink, like stdout into a pipe."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def getvalue(self):
+        return b"".join(self.chunks)
+
+
+class ArchiveDirectoryTests(VaultTestCase):
+    def test_plaintext_size_from_header(self):
+        for name, data in self.plaintexts.items():
+            self.assertEqual(decrypt.plaintext_size(os.path.join(self.src, name)), len(data))
+
+    def test_tar_stream_round_trip(self):
+        pipe = _Pipe()
+        self.assertEqual(decrypt.archive_directory(self.src, pipe, KEY, buffer_size=100), [])
+        with tarfile.open(fileobj=io.BytesIO(pipe.getvalue())) as tar:
+            members = {m.name: tar.extractfile(m).read() for m in tar.getmembers()}
+        self.assertEqual(members, self.plaintexts)
+
+    def test_zip_to_pipe_round_trip(self):
+        pipe = _Pipe()
+        decrypt.archive_directory(self.src, pipe, KEY, archive_format="zip")
+        with zipfile.ZipFile(io.BytesIO(pipe.getvalue())) as archive:
+            self.assertIsNone(archive.testzip())
+            members = {name: archive.read(name) for name in archive.namelist()}
+        self.assertEqual(members, self.plaintexts)
+
+    def test_failed_member_keeps_tar_readable(self):
+        path = os.path.join(self.src, "big.encvideo")
+        with open(path, "r+b") as f:
+            f.seek(-40, os.SEEK_END)
+            f.write(b"\xff")
+        archive_path = os.path.join(self._tmp.name, "vault.tar")
+        self.assertEqual(decrypt.archive_directory(self.src, archive_path, KEY), [path])
+        with tarfile.open(archive_path) as tar:
+            names = tar.getnames()
+            self.assertEqual(tar.extractfile("small.encimage").read(),
+                             self.plaintexts["small.encimage"])
+        self.assertEqual(sorted(names), sorted(self.plaintexts))
+
+    def test_corrupt_member_survives_repeated_archiving(self):
+        path = os.path.join(self.src, "big.encvideo")
+        with open(path, "r+b") as f:
+            f.seek(-40, os.SEEK_END)
+            f.write(b"\xff")
+        for _ in range(2):
+            pipe = _Pipe()
+            self.assertEqual(decrypt.archive_directory(self.src, pipe, KEY, buffer_size=100),
+                             [path])
+            gc.collect()
+        with tarfile.open(fileobj=io.BytesIO(pipe.getvalue())) as tar:
+            self.assertEqual(tar.extractfile("multi.encimage").read(),
+                             self.plaintexts["multi.encimage"])
+
+    def test_zip_clamps_timestamps_before_1980(self):
+        os.utime(os.path.join(self.src, "small.encimage"), (0, 0))
+        pipe = _Pipe()
+        self.assertEqual(decrypt.archive_directory(self.src, pipe, KEY, archive_format="zip"), [])
+        with zipfile.ZipFile(io.BytesIO(pipe.getvalue())) as archive:
+            self.assertEqual(archive.getinfo("small.encimage").date_time, (1980, 1, 1, 0, 0, 0))
+            self.assertEqual(archive.read("small.encimage"), self.plaintexts["small.encimage"])
+
+    def test_unreadable_file_is_skipped(self):
+        unreadable = os.path.join(self.src, "multi.encimage")
+
+        def failing_open(file, *args, **kwargs):
+            if file == unreadable and kwargs.get("buffering") == 0:
+                raise PermissionError(13, "Permission denied", file)
+            return open(file, *args, **kwargs)
+
+        decrypt.open = failing_open
+        self.addCleanup(delattr, decrypt, "open")
+        pipe = _Pipe()
+        self.assertEqual(decrypt.archive_directory(self.src, pipe, KEY), [unreadable])
+        with tarfile.open(fileobj=io.BytesIO(pipe.getvalue())) as tar:
+            names = tar.getnames()
+        self.assertEqual(sorted(names), sorted(set(self.plaintexts) - {"multi.encimage"}))
+
+class VerifyDirectoryTests(VaultTestCase):
+    def test_clean_vault_verifies_without_writing(self):
+        report_path = os.path.join(self._tmp.name, "report.json")
+        report = decrypt.verify_directory(self.src, KEY, report_path=report_path)
+        self.assertEqual(report["summary"]["status_counts"], {"ok": len(self.plaintexts)})
+        by_path = {e["path"]: e for e in report["files"]}
+        self.assertEqual(by_path["multi.encimage"]["plaintext_bytes"],
+                         len(self.plaintexts["multi.encimage"]))
+        with open(report_path) as f:
+            self.assertEqual(json.load(f), report)
+        self.assertFalse(os.path.exists(self.out))
+
+    def test_truncated_and_corrupt_files_are_reported(self):
+        multi = os.path.join(self.src, "multi.encimage")
+        with open(multi, "r+b") as f:
+            # Drop the FINAL block: every remaining block still authenticates.
+            f.truncate(os.path.getsize(multi) - 17 - crypto_secretstream_xchacha20poly1305_ABYTES)
+        with open(os.path.join(self.src, "big.encvideo"), "r+b") as f:
+            f.seek(-40, os.SEEK_END)
+            f.write(b"\xff")
+        for jobs in (1, 2):
+            report = decrypt.verify_directory(self.src, KEY, jobs=jobs)
+            statuses = {e["path"]: e["status"] for e in report["files"]}
+            self.assertEqual(statuses, {
+                "small.encimage": "ok",
+                "multi.encimage": "truncated",
+                "big.encvideo": "corrupt",
+                "v2.encimage": "ok",
+            })
+
+
+class KeyRingTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def write(self, name, data):
+        path = os.path.join(self._tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_fingerprint_matches_app_derivation(self):
+        # KeyFingerprint.swift: BLAKE2b-128 keyed with "encamera.keyfp.1".
+        expected = hashlib.blake2b(KEY, key=b"encamera.keyfp.1", digest_size=16).digest()
+        self.assertEqual(decrypt.key_fingerprint(KEY), expected)
+
+    def test_stamped_file_routes_without_trial_decrypt(self):
+        stamp = decrypt.key_fingerprint(OTHER_KEY)[:4]
+        path = self.write("a", encrypt_v1(b"x" * 10, key=OTHER_KEY, stamp=stamp))
+        ring = decrypt.KeyRing([KEY, OTHER_KEY])
+        original = decrypt._first_block_authenticates
+        decrypt._first_block_authenticates = lambda *_: self.fail("trial decrypt")
+        self.addCleanup(setattr, decrypt, "_first_block_authenticates", original)
+        self.assertEqual(ring.key_for(path), OTHER_KEY)
+
+    def test_unstamped_file_falls_back_to_first_block_trial(self):
+        path = self.write("b", encrypt_v2(b"y" * 3000, {}, key=OTHER_KEY))
+        ring = decrypt.KeyRing([KEY, OTHER_KEY])
+        self.assertIsNone(decrypt.read_stamp(path))
+        self.assertEqual(ring.key_for(path), OTHER_KEY)
+        out = os.path.join(self._tmp.name, "out")
+        decrypt._decrypt_to_path(path, out, ring)
+        with open(out, "rb") as f:
+            self.assertEqual(f.read(), b"y" * 3000)
+
+    def test_stale_stamp_falls_back_to_trial_decrypt(self):
+        # Stamped for KEY, encrypted with OTHER_KEY: the stamp is only a hint.
+        stamp = decrypt.key_fingerprint(KEY)[:4]
+        path = self.write("d.encimage", encrypt_v2(b"w" * 3000, {"a": 1}, key=OTHER_KEY,
+                                                   stamp=stamp))
+        ring = decrypt.KeyRing([KEY, OTHER_KEY])
+        self.assertEqual(ring.key_for(path), KEY)
+        self.assertEqual(decrypt.read_metadata(path, ring), {"a": 1})
+        out = os.path.join(self._tmp.name, "out")
+        decrypt._decrypt_to_path(path, out, ring, decrypt.StreamDecryptor(buffer_size=100))
+        with open(out, "rb") as f:
+            self.assertEqual(f.read(), b"w" * 3000)
+        os.remove(out)
+        report = decrypt.verify_directory(self._tmp.name, ring)
+        self.assertEqual(report["summary"]["status_counts"], {"ok": 1})
+
+    def test_stamped_key_that_fails_later_is_not_replaced(self):
+        data = bytearray(encrypt_v1(b"v" * 3000, stamp=decrypt.key_fingerprint(KEY)[:4]))
+        data[-40] ^= 0xff
+        path = self.write("e", bytes(data))
+        ring = decrypt.KeyRing([KEY, OTHER_KEY])
+        with self.assertRaisesRegex(ValueError, "Decryption failed at byte 2048"):
+            decrypt._decrypt_to_path(path, os.path.join(self._tmp.name, "out"), ring)
+
+    def test_v1_metadata_read_does_no_trial_decrypt(self):
+        path = self.write("f", encrypt_v1(b"u" * 10, key=OTHER_KEY))
+        original = decrypt._first_block_authenticates
+        decrypt._first_block_authenticates = lambda *_: self.fail("trial decrypt")
+        self.addCleanup(setattr, decrypt, "_first_block_authenticates", original)
+        self.assertIsNone(decrypt.read_metadata(path, decrypt.KeyRing([KEY, OTHER_KEY])))
+
+    def test_no_matching_key_raises(self):
+        path = self.write("c", encrypt_v1(b"z", key=OTHER_KEY))
+        ring = decrypt.KeyRing([KEY, bytes(32)])
+        with self.assertRaises(ValueError):
+            ring.key_for(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,7 +28,7 @@ for _name, _attrs in {
         "set_build_for_version",
         "set_version_release_type",
     ],
-    "asc.testflight": ["list_builds_for_version", "list_builds_with_versions"],
+    "asc.testflight": ["BuildSnapshot"],
     "asc.xcode_cloud": [],
     "asc.xcode_cloud.build_runs": ["list_build_runs_for_workflow"],
 }.items():
@@ -38,7 +38,11 @@ for _name, _attrs in {
             setattr(_module, _attr, object())
         sys.modules[_name] = _module
 
-from release import preflight_cloudkit_schema_deployed
+from release import (
+    preflight_cloudkit_schema_deployed,
+    preflight_no_pending_builds,
+    preflight_target_version_matches,
+)
 
 
 class CloudKitSchemaPreflightTests(unittest.TestCase):
@@ -59,5 +63,49 @@ class CloudKitSchemaPreflightTests(unittest.TestCase):
         self.assertFalse(preflight_cloudkit_schema_deployed(input_fn=lambda _: "sure"))
 
 
+class FakeBuildSnapshot:
+    """Stands in for asc.testflight.BuildSnapshot; fails the test on refresh."""
+
+    def __init__(self, builds):
+        self.builds = builds
+
+    def for_version(self, version_string, processing_state=None):
+        return [
+            b for b in self.builds
+            if b["_app_version"] == version_string
+            and processing_state in (None, b["attributes"]["processingState"])
+        ]
+
+    def recent(self, count):
+        return self.builds[:count]
+
+    def refresh(self):
+        raise AssertionError("preflights must not re-list builds")
+
+
+def _build(version, state, uploaded="2026-01-01T00:00:00Z"):
+    return {
+        "_app_version": version,
+        "attributes": {"processingState": state, "version": "1", "uploadedDate": uploaded},
+    }
+
+
+class BuildPreflightTests(unittest.TestCase):
+    """The ASC preflights answer from the run's one build snapshot."""
+
+    def test_valid_build_for_version_passes(self):
+        builds = FakeBuildSnapshot([_build("2.1", "VALID"), _build("2.0", "VALID")])
+        self.assertTrue(preflight_target_version_matches(builds, "2.1", "2.1"))
+
+    def test_missing_valid_build_fails(self):
+        builds = FakeBuildSnapshot([_build("2.1", "PROCESSING"), _build("2.0", "VALID")])
+        self.assertFalse(preflight_target_version_matches(builds, "2.1", "2.1"))
+
+    def test_processing_build_blocks_release(self):
+        builds = FakeBuildSnapshot([_build("2.1", "PROCESSING"), _build("2.1", "VALID")])
+        self.assertFalse(preflight_no_pending_builds(builds, "2.1"))
+        self.assertTrue(preflight_no_pending_builds(builds, "2.0"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -28,12 +28,14 @@ Examples:
 """
 
 import argparse
+import itertools
 import sys
 
 try:
     from asc.auth import Credentials
     from asc.client import ASCClient
     from asc import testflight as tf
+    from asc.paging import DEFAULT_PAGE_SIZE
 except ImportError:
     print("Missing required package 'asc'. Install with: pip install -e scripts/asc")
     sys.exit(1)
@@ -107,7 +109,11 @@ def cmd_builds(client, app_id, args):
         print(f"  groups              {', '.join(g['attributes']['name'] for g in groups) or '(none)'}")
         return
 
-    builds = tf.list_builds_with_versions(client, app_id)[: args.limit]
+    # Only the first --limit builds are fetched, not the whole history.
+    builds = itertools.islice(
+        tf.iter_builds_with_versions(client, app_id, limit=min(args.limit, DEFAULT_PAGE_SIZE)),
+        args.limit,
+    )
     rows = [
         [
             b["attributes"].get("version"),